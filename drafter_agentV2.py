@@ -1,20 +1,57 @@
-from typing import Annotated, TypedDict, Sequence, Optional, Literal
+from typing import Annotated, Callable, TypedDict, Sequence, Optional, Literal
 from dataclasses import dataclass, field
-from datetime import datetime
 from pathlib import Path
+from uuid import uuid4
+from collections import OrderedDict
+import hashlib
+import json
+import sys
+import threading
+import weakref
 
 from dotenv import load_dotenv
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, ToolMessage
 from langchain_openai import ChatOpenAI
+from langchain_core.runnables import RunnableLambda
 from langchain_core.tools import tool
 from langgraph.graph.message import add_messages
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 import os
 
-from prompts import get_main_reply_prompt, get_resume_prompt, get_cover_letter_prompt
-from helper.document_helper import DocumentStore, DocumentType
+from prompts import (
+    get_main_reply_prompt, get_resume_prompt, get_cover_letter_prompt, get_tailor_prompt, get_repair_prompt,
+    get_summary_section_prompt, get_experience_entry_prompt, get_skills_section_prompt, get_structured_format_prompt
+)
+from helper.document_helper import DocumentMetadata, DocumentStore, DocumentType
+from helper.bundle_export import bundle_items, save_bundle
+from helper.export_cache import ExportCache, RetentionPolicy, start_retention
+from helper.ats_scorer import posting_terms, rank_postings_for_store
+from helper.intent_router import IntentRouter
+from helper.job_index import JobIndex, load_embedding_encoder
+from helper.job_description import (
+    compact_job_description, looks_like_job_description, preprocess_job_description, tokenize
+)
 from helper.logger_config import get_logger
+from helper.response_cache import SemanticResponseCache, is_cacheable_message, is_cacheable_reply
+from helper.speculative import (
+    COVER_LETTER_REQUIRED, RESUME_OPTIONAL, RESUME_REQUIRED,
+    SpeculativeDrafter, answer_fields, extract_contact_fields, missing_fields
+)
+from helper.tool_phases import Phase, detect_phase, render_tool_docs, tools_for_phase
+from helper.tracing import NULL_TRACER, Tracer, profile_session
+from helper.quality_check import cover_letter_issues, resume_issues, tailoring_issues
+from helper.resume_import import import_resume_file, parse_resume_lines
+from helper.resume_skeleton import (
+    assemble_resume, render_certifications, render_education, render_header, split_experience_entries, strip_heading
+)
+from helper.fact_check import FactReport, check_facts
+from helper.file_io import atomic_write_bytes, safe_filename
+from helper.version_diff import DiffCache, previous_version, render_redline_docx, summarize
+from helper.structured_document import (
+    StructuredDocument, normalize_document, structure_for, to_text, validate_document
+)
+from helper.resume_sections import HEADER, get_section, parse_sections_reply, reorder_bullets, replace_sections, split_sections
 
 logger = get_logger(__name__)
 
@@ -22,68 +59,552 @@ logger = get_logger(__name__)
 class AgentConfig:
     """Centralized configuration - easier to test and modify"""
     model_name: str = field(default_factory=lambda: os.getenv("OPENAI_MODEL", "gpt-4o-mini"))
+    # Per-role overrides; unset roles use model_name
+    chat_model_name: Optional[str] = field(default_factory=lambda: os.getenv("DRAFTER_CHAT_MODEL"))
+    resume_model_name: Optional[str] = field(default_factory=lambda: os.getenv("DRAFTER_RESUME_MODEL"))
+    cover_letter_model_name: Optional[str] = field(default_factory=lambda: os.getenv("DRAFTER_COVER_LETTER_MODEL"))
+    # Cascade: draft documents on this cheaper model first, escalate to the role model if the local check fails
+    draft_model_name: Optional[str] = field(default_factory=lambda: os.getenv("DRAFTER_DRAFT_MODEL"))
     temperature: float = 0.5
-    max_tokens: int = 500
+    max_tokens: int = 500  # Conversational replies
+    resume_max_tokens: int = field(default_factory=lambda: int(os.getenv("DRAFTER_RESUME_MAX_TOKENS", "2000")))
+    cover_letter_max_tokens: int = field(default_factory=lambda: int(os.getenv("DRAFTER_COVER_LETTER_MAX_TOKENS", "900")))
+    tailor_max_tokens: int = 600
+    max_continuations: int = 2  # Follow-up requests when a document stops at max_tokens
     output_dir: Path = field(default_factory=lambda: Path("./outputs"))
+    # Exports older than this many days are pruned in the background, keeping the newest retention_keep
+    retention_days: Optional[float] = field(
+        default_factory=lambda: float(os.environ["DRAFTER_RETENTION_DAYS"]) if os.getenv("DRAFTER_RETENTION_DAYS") else None
+    )
+    retention_keep: int = 3  # Per session and document type
+    fast_path_enabled: bool = True  # Route simple commands to tools without the LLM
+    phase_tools: bool = True  # Bind only the tools for the current conversation phase, with compact schemas
+    # Generate one general base resume per profile, then tailor it per job: two calls for the first resume,
+    # one short call for every later job. An imported resume is always used as the base.
+    tailor_from_base: bool = field(default_factory=lambda: os.getenv("DRAFTER_TAILOR_FROM_BASE") == "1")
+    # Render header/education locally and generate summary, each experience entry and skills concurrently
+    section_parallel: bool = field(default_factory=lambda: os.getenv("DRAFTER_SECTION_PARALLEL") == "1")
+    fact_check: bool = True  # Fix or repair details the candidate never provided (employers, dates, skills, URLs)
+    fact_repair: bool = True  # Regenerate only the affected sections when a fact can't be fixed locally
+    speculative_drafts: bool = field(default_factory=lambda: os.getenv("DRAFTER_SPECULATIVE") == "1")
+    # Ask for schema-constrained documents (sections, entries, bullets) and render exports from that structure
+    structured_output: bool = field(default_factory=lambda: os.getenv("DRAFTER_STRUCTURED_OUTPUT") == "1")
+    # Reuse replies to generic chat turns ("what do you need from me?") asked in the same conversation state
+    response_cache: bool = field(default_factory=lambda: os.getenv("DRAFTER_RESPONSE_CACHE") == "1")
+    response_cache_threshold: float = 0.9  # Minimum cosine similarity between the user's messages
+    trace_path: Optional[Path] = field(  # *.json → Chrome trace events, otherwise collapsed stacks
+        default_factory=lambda: Path(os.environ["DRAFTER_TRACE"]) if os.getenv("DRAFTER_TRACE") else None
+    )
+    profile_path: Optional[Path] = field(  # cProfile stats for the whole session
+        default_factory=lambda: Path(os.environ["DRAFTER_PROFILE"]) if os.getenv("DRAFTER_PROFILE") else None
+    )
+    job_index_path: Optional[Path] = field(
+        default_factory=lambda: Path(os.environ["DRAFTER_JOB_INDEX"]) if os.getenv("DRAFTER_JOB_INDEX") else None
+    )
+    # Local sentence-transformers model that reranks lexical job matches; lexical ranking only when unset or unavailable
+    embedding_model: Optional[str] = field(default_factory=lambda: os.getenv("DRAFTER_EMBEDDING_MODEL") or None)
     
-    def __post_init__(self):
-        self.output_dir.mkdir(exist_ok=True)
+    def model_for(self, role: Literal["chat", "resume", "cover_letter"]) -> str:
+        """Model name for one role, falling back to model_name"""
+        return getattr(self, f"{role}_model_name") or self.model_name
+    
+    def retention_policy(self) -> Optional[RetentionPolicy]:
+        return RetentionPolicy(self.retention_days, self.retention_keep) if self.retention_days is not None else None
 
 
 class AgentState(TypedDict):
-    """Enhanced state with metadata"""
+    """Per-session state; the document store and config are shared by the graph, not copied per state"""
     messages: Annotated[Sequence[BaseMessage], add_messages]
-    document_store: DocumentStore
-    config: AgentConfig
     user_context: dict  # Store user info to avoid re-asking
+    _exit_requested: bool  # Set by the agent node when the user quits
+
+CHARS_PER_TOKEN = 4  # Rough average for English text
+MIN_DOCUMENT_TOKENS = 400
+SECTION_MAX_TOKENS = {"summary": 250, "experience": 350, "skills": 250}
+CONTINUE_PROMPT = "Continue exactly where you stopped. Do not repeat anything you already wrote and add no commentary."
+
+GENERAL_PURPOSE_TARGET = "None - write a general-purpose resume that presents all provided information evenly"
+
+
+def profile_key(**fields: Optional[str]) -> str:
+    """Stable hash of the profile fields a base resume is generated from (whitespace and case insensitive)"""
+    normalized = {name: " ".join(value.split()).casefold() if value else None for name, value in fields.items()}
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+BASE_PROFILE_FIELDS = tuple(name for name in RESUME_REQUIRED + RESUME_OPTIONAL if name != "job_description")
+
 
 class DocumentGenerator:
-    def __init__(self, config: AgentConfig):
+    TRACED_METHODS = (
+        "generate_resume", "generate_resume_sections", "generate_base_resume", "tailor_resume", "tailor_resumes_batch",
+        "generate_cover_letter", "generate_cover_letter_variants"
+    )
+    
+    def __init__(self, config: AgentConfig, tracer: Tracer = NULL_TRACER):
         self.config = config
+        self.tracer = tracer
+        for name in self.TRACED_METHODS:
+            setattr(self, name, tracer.wrap(f"generator.{name}", getattr(self, name)))
         self.model = ChatOpenAI(
-            model_name=config.model_name,
+            model_name=config.model_for("resume"),
             temperature=config.temperature,
-            max_tokens=config.max_tokens
+            max_tokens=config.resume_max_tokens
         )
+        # Higher temperature for more creative cover letters
+        self.creative_model = ChatOpenAI(
+            model_name=config.model_for("cover_letter"),
+            temperature=0.7,
+            max_tokens=config.cover_letter_max_tokens
+        )
+        # Cheaper drafting counterparts of each role model, keyed by the model they stand in for
+        self.draft_models: dict[int, ChatOpenAI] = {}
+        if config.draft_model_name:
+            for model in (self.model, self.creative_model):
+                self.draft_models[id(model)] = ChatOpenAI(
+                    model_name=config.draft_model_name,
+                    temperature=model.temperature,
+                    max_tokens=model.max_tokens
+                )
+        self.cascade_stats = {"accepted": 0, "escalated": 0}
+        self.fact_stats = {"checked": 0, "clean": 0, "auto_fixed": 0, "sections_repaired": 0, "unresolved": 0}
+        self.structured_stats = {"valid": 0, "retried": 0, "fallback": 0}
+        # Schema output behind recently generated text, kept until the caller stores the document
+        self._structures: "OrderedDict[str, StructuredDocument]" = OrderedDict()
+        self._structures_lock = threading.Lock()
+    
+    def estimate_budget(self, doc_type: DocumentType, *inputs: Optional[str]) -> int:
+        """Output token budget for a document, scaled by how much profile text it has to cover"""
+        input_tokens = sum(len(text or "") for text in inputs) // CHARS_PER_TOKEN
+        if doc_type == DocumentType.RESUME:
+            estimate, cap = 350 + int(input_tokens * 1.5), self.config.resume_max_tokens
+        else:
+            estimate, cap = 450 + input_tokens // 4, self.config.cover_letter_max_tokens
+        return max(min(estimate, cap), min(MIN_DOCUMENT_TOKENS, cap))
+    
+    def _continue(self, model: ChatOpenAI, messages: list[BaseMessage], content: str,
+                  finish_reason: Optional[str], max_tokens: int) -> str:
+        """Keep asking the model to pick up where it stopped while it reports finish_reason == 'length'"""
+        continuations = 0
+        while finish_reason == "length" and continuations < self.config.max_continuations:
+            continuations += 1
+            logger.info(f"Output hit max_tokens ({max_tokens}); continuing ({continuations}/{self.config.max_continuations})")
+            with self.tracer.span("llm.continue", model=model.model_name, max_tokens=max_tokens):
+                response = model.invoke(
+                    messages + [AIMessage(content=content), HumanMessage(content=CONTINUE_PROMPT)],
+                    max_tokens=max_tokens
+                )
+            content += response.content
+            finish_reason = response.response_metadata.get("finish_reason")
+        if finish_reason == "length":
+            logger.warning(f"Output still truncated after {continuations} continuations")
+        return content
+    
+    def _generate_text(self, model: ChatOpenAI, messages: list[BaseMessage], max_tokens: int) -> str:
+        """Single completion with automatic continuation on truncation"""
+        with self.tracer.span("llm.invoke", model=model.model_name, max_tokens=max_tokens):
+            response = model.invoke(messages, max_tokens=max_tokens)
+        return self._continue(
+            model, messages, response.content, response.response_metadata.get("finish_reason"), max_tokens
+        )
+    
+    def _generate_checked(self, model: ChatOpenAI, messages: list[BaseMessage], max_tokens: int,
+                          check: Callable[[str], list[str]]) -> str:
+        """Draft on the cheap model when a cascade is configured; escalate to model if check finds issues"""
+        draft_model = self.draft_models.get(id(model))
+        if draft_model is None:
+            return self._generate_text(model, messages, max_tokens)
+        
+        draft = self._generate_text(draft_model, messages, max_tokens)
+        issues = check(draft)
+        if not issues:
+            self.cascade_stats["accepted"] += 1
+            logger.info(f"Draft from {draft_model.model_name} passed local checks")
+            return draft
+        self.cascade_stats["escalated"] += 1
+        logger.info(f"Draft from {draft_model.model_name} rejected ({'; '.join(issues)}); escalating to {model.model_name}")
+        with self.tracer.span("llm.escalate", model=model.model_name):
+            return self._generate_text(model, messages, max_tokens)
+    
+    def _generate_structured(self, model: ChatOpenAI, messages: list[BaseMessage], doc_type: DocumentType,
+                             max_tokens: int, check: Callable[[str], list[str]]) -> tuple[str, Optional[StructuredDocument]]:
+        """
+        Schema-constrained document as (text layout, structure); one corrective retry, then
+        plain-text generation with no structure
+        """
+        structured_model = model.with_structured_output(StructuredDocument)
+        attempt = messages + [SystemMessage(content=get_structured_format_prompt(doc_type.value.replace("_", " ")))]
+        for retry in (False, True):
+            try:
+                with self.tracer.span("llm.structured", model=model.model_name):
+                    document = normalize_document(structured_model.invoke(attempt))
+                content = to_text(document)
+                problems = validate_document(document, doc_type) + check(content)
+            except Exception as e:
+                problems = [f"output did not match the schema ({e})"]
+            if not problems:
+                self.structured_stats["valid"] += 1
+                return content, document
+            logger.info(f"Structured {doc_type.value} rejected: {'; '.join(problems)}")
+            if not retry:
+                self.structured_stats["retried"] += 1
+                attempt = attempt + [HumanMessage(
+                    content="Fix these problems and return the whole document again:\n" + "\n".join(f"- {p}" for p in problems)
+                )]
+        self.structured_stats["fallback"] += 1
+        logger.warning(f"Falling back to plain-text {doc_type.value} generation")
+        return self._generate_checked(model, messages, max_tokens, check), None
+    
+    def _keep_structure(self, content: str, document: Optional[StructuredDocument], doc_type: DocumentType):
+        """Remember the structure behind final content; text changed by fact fixes is read back into one"""
+        if document is not None and to_text(document) != content:
+            document = structure_for(content, doc_type)
+        if document is None:
+            return
+        with self._structures_lock:
+            self._structures[content] = document
+            while len(self._structures) > 64:  # Drafts that were never stored
+                self._structures.popitem(last=False)
+    
+    def structure(self, content: str, doc_type: DocumentType) -> Optional[StructuredDocument]:
+        """Structure the model returned for content this generator produced (None for plain-text output)"""
+        with self._structures_lock:
+            return self._structures.get(content)
+    
+    def _repair_sections(self, content: str, report: FactReport, sources: dict, sectioned: bool) -> str:
+        """One small concurrent call per section that still states unsupported facts"""
+        grouped = {heading: issues for heading, issues in report.by_section().items() if heading or not sectioned}
+        if not grouped:
+            return content
+        candidate_info = "\n".join(f"- {name}: {value}" for name, value in sources.items() if value)
+        bodies = dict(split_sections(content)) if sectioned else {HEADER: content}
+        requests = [
+            get_repair_prompt(
+                f"{heading} section" if heading else "document", bodies.get(heading, ""),
+                "\n".join(f"- {issue.kind}: {issue.value}" for issue in issues), candidate_info
+            )
+            for heading, issues in grouped.items()
+        ]
+        replies = RunnableLambda(
+            lambda prompt: self._generate_text(self.model, [SystemMessage(content=prompt)], self.config.tailor_max_tokens)
+        ).batch(requests)
+        self.fact_stats["sections_repaired"] += len(replies)
+        if not sectioned:
+            return replies[0].strip()
+        return replace_sections(content, {
+            heading: strip_heading(reply, heading) for heading, reply in zip(grouped, replies)
+        })
+    
+    def enforce_facts(self, content: str, sources: dict, job_description: str = "",
+                      sectioned: bool = True, repair: bool = True) -> str:
+        """Fix unsupported contact details and skills locally; repair sections with other invented facts"""
+        if not self.config.fact_check:
+            return content
+        with self.tracer.span("fact_check"):
+            check = lambda text: check_facts(text, sources, job_description, sectioned, allow_job_skills=not sectioned)
+            report = check(content)
+        self.fact_stats["checked"] += 1
+        if not report.issues:
+            self.fact_stats["clean"] += 1
+            return content
+        if len(report.unresolved) < len(report.issues):
+            self.fact_stats["auto_fixed"] += 1
+        content = report.text
+        
+        if report.unresolved and repair and self.config.fact_repair:
+            logger.info(f"Repairing unsupported facts: {[(i.section, i.kind, i.value) for i in report.unresolved]}")
+            content = self._repair_sections(content, report, sources, sectioned)
+            report = check(content)
+            content = report.text
+        if report.unresolved:
+            self.fact_stats["unresolved"] += 1
+            logger.warning(f"Unsupported facts remain: {[(i.kind, i.value) for i in report.unresolved]}")
+        return content
     
     def generate_resume(self, name: str, title: str, summary: str, experience: str, education: str, skills: str,
                        job_description: str, phone: str, linkedin_url: str, portfolio:Optional[str] = None, certifications:Optional[str] = None) -> str:
         """Generate resume with error handling"""
+        if self.config.section_parallel:
+            return self.generate_resume_sections(
+                name, title, summary, experience, education, skills, job_description,
+                phone, linkedin_url, portfolio=portfolio, certifications=certifications
+            )
         try:
-            prompt = get_resume_prompt(name, title, summary, experience, education, skills, certifications, portfolio, job_description, phone, linkedin_url)
-            response = self.model.invoke([SystemMessage(content=prompt)])
+            with self.tracer.span("prompt.resume"):
+                prompt = get_resume_prompt(
+                    name, title, summary, experience, education, skills,
+                    compact_job_description(job_description), phone, linkedin_url,
+                    portfolio_url=portfolio, certifications=certifications
+                )
+            budget = self.estimate_budget(DocumentType.RESUME, summary, experience, education, skills, certifications)
+            messages = [SystemMessage(content=prompt)]
+            check = lambda draft: resume_issues(draft, name, phone)
+            document = None
+            if self.config.structured_output:
+                content, document = self._generate_structured(self.model, messages, DocumentType.RESUME, budget, check)
+            else:
+                content = self._generate_checked(self.model, messages, budget, check)
+            content = self.enforce_facts(content, dict(
+                name=name, title=title, summary=summary, experience=experience, education=education, skills=skills,
+                phone=phone, linkedin_url=linkedin_url, portfolio=portfolio, certifications=certifications
+            ), job_description)
+            self._keep_structure(content, document, DocumentType.RESUME)
             logger.info(f"Generated resume for {name}")
-            return response.content
+            return content
         except Exception as e:
             logger.error(f"Resume generation failed: {e}")
             raise ValueError(f"Failed to generate resume: {str(e)}")
     
+    def generate_resume_sections(self, name: str, title: str, summary: str, experience: str, education: str,
+                                 skills: str, job_description: str, phone: str, linkedin_url: str,
+                                 portfolio: Optional[str] = None, certifications: Optional[str] = None) -> str:
+        """Resume from a local skeleton plus concurrently generated prose sections"""
+        try:
+            with self.tracer.span("prompt.resume_sections"):
+                target = compact_job_description(job_description)
+                entries = split_experience_entries(experience) or [experience]
+                requests = (
+                    [(get_summary_section_prompt(name, title, summary, experience, target), SECTION_MAX_TOKENS["summary"])]
+                    + [(get_experience_entry_prompt(entry, title, target), SECTION_MAX_TOKENS["experience"]) for entry in entries]
+                    + [(get_skills_section_prompt(skills, target), SECTION_MAX_TOKENS["skills"])]
+                )
+            # Each section is a small independent call; wall-clock time is the slowest one
+            replies = RunnableLambda(
+                lambda request: self._generate_text(self.model, [SystemMessage(content=request[0])], request[1])
+            ).batch(requests, config={"max_concurrency": len(requests)})
+            
+            content = assemble_resume(
+                render_header(name, title, phone, linkedin_url, portfolio),
+                strip_heading(replies[0], "SUMMARY"),
+                [strip_heading(reply, "EXPERIENCE") for reply in replies[1:-1]],
+                render_education(education),
+                strip_heading(replies[-1], "SKILLS"),
+                render_certifications(certifications),
+            )
+            content = self.enforce_facts(content, dict(
+                name=name, title=title, summary=summary, experience=experience, education=education, skills=skills,
+                phone=phone, linkedin_url=linkedin_url, portfolio=portfolio, certifications=certifications
+            ), job_description)
+            logger.info(f"Generated resume for {name} from {len(requests)} parallel sections")
+            return content
+        except Exception as e:
+            logger.error(f"Section-parallel resume generation failed: {e}")
+            raise ValueError(f"Failed to generate resume: {str(e)}")
+    
+    def generate_base_resume(self, name: str, title: str, summary: str, experience: str, education: str, skills: str,
+                             phone: str, linkedin_url: str, portfolio: Optional[str] = None,
+                             certifications: Optional[str] = None) -> str:
+        """Generate the job-agnostic base resume that tailored versions are derived from"""
+        return self.generate_resume(
+            name, title, summary, experience, education, skills,
+            GENERAL_PURPOSE_TARGET, phone, linkedin_url,
+            portfolio=portfolio, certifications=certifications
+        )
+    
+    def _tailor_prompt(self, base_content: str, job_description: str) -> str:
+        sections = split_sections(base_content)
+        return get_tailor_prompt(
+            get_section(sections, "SUMMARY"),
+            get_section(sections, "SKILLS"),
+            compact_job_description(job_description)
+        )
+    
+    @staticmethod
+    def _apply_tailoring(base_content: str, reply: str, job_description: str) -> str:
+        """Splice rewritten sections into the base and reorder experience bullets locally"""
+        tailored = replace_sections(base_content, parse_sections_reply(reply, ["SUMMARY", "SKILLS"]))
+        experience = get_section(split_sections(tailored), "EXPERIENCE")
+        if experience:
+            keywords = posting_terms(job_description)
+            tailored = replace_sections(tailored, {"EXPERIENCE": reorder_bullets(experience, keywords, tokenize)})
+        return tailored
+    
+    @staticmethod
+    def _base_sources(base_content: str) -> dict:
+        """Fact-check sources for a tailored resume: the base, with its EDUCATION section as the degree source"""
+        return {"base": base_content, "education": get_section(split_sections(base_content), "EDUCATION")}
+    
+    def tailor_resume(self, base_content: str, job_description: str) -> str:
+        """Adapt a base resume to one job with a small summary/skills rewrite"""
+        try:
+            reply = self._generate_checked(
+                self.model, [SystemMessage(content=self._tailor_prompt(base_content, job_description))],
+                self.config.tailor_max_tokens, tailoring_issues
+            )
+            logger.info("Tailored resume from base")
+            # The base resume is the candidate's verified facts; tailoring must not add to them
+            return self.enforce_facts(
+                self._apply_tailoring(base_content, reply, job_description), self._base_sources(base_content),
+                job_description
+            )
+        except Exception as e:
+            logger.error(f"Resume tailoring failed: {e}")
+            raise ValueError(f"Failed to tailor resume: {str(e)}")
+    
+    def tailor_resumes_batch(self, base_content: str, job_descriptions: list[str]) -> list[str]:
+        """Tailor one base resume to many jobs in a single batched call"""
+        try:
+            replies = RunnableLambda(
+                lambda messages: self._generate_checked(
+                    self.model, messages, self.config.tailor_max_tokens, tailoring_issues
+                )
+            ).batch([
+                [SystemMessage(content=self._tailor_prompt(base_content, job_description))]
+                for job_description in job_descriptions
+            ])
+            logger.info(f"Tailored {len(replies)} resumes from base in one batch")
+            return [
+                self.enforce_facts(
+                    self._apply_tailoring(base_content, reply, job_description), self._base_sources(base_content),
+                    job_description, repair=False
+                )
+                for reply, job_description in zip(replies, job_descriptions)
+            ]
+        except Exception as e:
+            logger.error(f"Batch resume tailoring failed: {e}")
+            raise ValueError(f"Failed to tailor resumes: {str(e)}")
+    
     def generate_cover_letter(self, name: str, title: str, summary: str,
                              experience: str, education: str, skills: str,
                              job_title: str, company: str, tone: str) -> str:
         """Generate cover letter with error handling"""
         try:
-            # Use higher temperature for more creative cover letters
-            creative_model = ChatOpenAI(
-                model_name=self.config.model_name,
-                temperature=0.7,
-                max_tokens=self.config.max_tokens
-            )
-            prompt = get_cover_letter_prompt(
-                name, title, summary, experience, education, skills,
-                job_title, company, tone
-            )
-            response = creative_model.invoke([SystemMessage(content=prompt)])
+            with self.tracer.span("prompt.cover_letter"):
+                prompt = get_cover_letter_prompt(
+                    name, title, summary, experience, education, skills,
+                    job_title, company, tone
+                )
+            budget = self.estimate_budget(DocumentType.COVER_LETTER, summary, experience, skills)
+            messages = [SystemMessage(content=prompt)]
+            check = lambda draft: cover_letter_issues(draft, name, company)
+            document = None
+            if self.config.structured_output:
+                content, document = self._generate_structured(
+                    self.creative_model, messages, DocumentType.COVER_LETTER, budget, check
+                )
+            else:
+                content = self._generate_checked(self.creative_model, messages, budget, check)
+            content = self.enforce_facts(content, dict(
+                name=name, title=title, summary=summary, experience=experience, education=education, skills=skills,
+                company=company, job_title=job_title
+            ), sectioned=False)
+            self._keep_structure(content, document, DocumentType.COVER_LETTER)
             logger.info(f"Generated cover letter for {company}")
-            return response.content
+            return content
         except Exception as e:
             logger.error(f"Cover letter generation failed: {e}")
             raise ValueError(f"Failed to generate cover letter: {str(e)}")
+    
+    def _complete(self, messages: list[BaseMessage], n: int, max_tokens: int) -> list[str]:
+        """n non-empty completions of one prompt from the creative model, in one request when possible"""
+        contents: list[str] = []
+        for attempt in range(self.config.max_continuations + 1):  # Empty choices are asked for again
+            if attempt:
+                logger.warning(f"Got {len(contents)} of {n} non-empty completions; requesting the rest")
+            result = self.creative_model.generate([messages], n=n - len(contents), max_tokens=max_tokens)
+            for generation in result.generations[0]:
+                content = self._continue(
+                    self.creative_model, messages, generation.message.content,
+                    (generation.generation_info or {}).get("finish_reason")
+                    or generation.message.response_metadata.get("finish_reason"),
+                    max_tokens
+                )
+                if content.strip():
+                    contents.append(content)
+            if len(contents) >= n:
+                return contents[:n]
+        raise ValueError(f"Model returned {len(contents)} of {n} requested completions")
+    
+    def generate_cover_letter_variants(self, name: str, title: str, summary: str,
+                                       experience: str, education: str, skills: str,
+                                       variants: list[tuple[str, str, str]]) -> list[str]:
+        """Generate one letter per (job_title, company, tone) variant with as few requests as possible.
+        
+        Identical variants share one request with n completions; distinct ones run as a
+        single batch whose prompts share the profile prefix."""
+        try:
+            groups: dict[tuple[str, str, str], list[int]] = {}
+            for index, variant in enumerate(variants):
+                groups.setdefault(variant, []).append(index)
+            
+            budget = self.estimate_budget(DocumentType.COVER_LETTER, summary, experience, skills)
+            requests = [
+                ([SystemMessage(content=get_cover_letter_prompt(
+                    name, title, summary, experience, education, skills, job_title, company, tone
+                ))], len(indices), budget)
+                for (job_title, company, tone), indices in groups.items()
+            ]
+            completions = RunnableLambda(lambda request: self._complete(*request)).batch(requests)
+            
+            contents = [""] * len(variants)
+            for (job_title, company, _), indices, group_contents in zip(groups, groups.values(), completions):
+                sources = dict(
+                    name=name, title=title, summary=summary, experience=experience, education=education,
+                    skills=skills, company=company, job_title=job_title
+                )
+                for index, content in zip(indices, group_contents):
+                    # Local fixes only; a repair call per variant would undo the batching
+                    contents[index] = self.enforce_facts(content, sources, sectioned=False, repair=False)
+            logger.info(f"Generated {len(variants)} cover letter variants in {len(requests)} requests")
+            return contents
+        except Exception as e:
+            logger.error(f"Cover letter variant generation failed: {e}")
+            raise ValueError(f"Failed to generate cover letter variants: {str(e)}")
+    
+    def generate_cover_letters_batch(self, name: str, title: str, summary: str,
+                                     experience: str, education: str, skills: str,
+                                     targets: list[tuple[str, str]], tone: str) -> list[str]:
+        """Generate one cover letter per (job_title, company) target in a single batched call"""
+        return self.generate_cover_letter_variants(
+            name, title, summary, experience, education, skills,
+            [(job_title, company, tone) for job_title, company in targets]
+        )
+
+
+@dataclass
+class ResumeDraft:
+    """Resume content and the base it was tailored from; nothing is stored until commit"""
+    content: str
+    base_key: Optional[str] = None
+    base_text: Optional[str] = None  # Base content, stored on commit if the store doesn't have it yet
+    
+    def commit(self, document_store: DocumentStore, structure: Optional[StructuredDocument] = None) -> DocumentMetadata:
+        base = None
+        if self.base_key is not None:
+            base = document_store.get_base(self.base_key) or document_store.set_base(self.base_key, self.base_text)
+        return document_store.create(DocumentType.RESUME, self.content, base=base, structure=structure)
+
+
+def draft_resume(generator: DocumentGenerator, document_store: DocumentStore, config: AgentConfig,
+                 inputs: dict) -> ResumeDraft:
+    """Produce resume content without writing to the store (safe from speculative worker threads)"""
+    profile = {name: value for name, value in inputs.items() if name != "job_description"}
+    key = profile_key(**profile)
+    base = document_store.get_base(key)
+    base_text = base.content if base is not None else None
+    if base_text is None and config.tailor_from_base:
+        base_text = generator.generate_base_resume(**profile)
+    if base_text is None:
+        return ResumeDraft(generator.generate_resume(**inputs))
+    
+    job_description = (inputs.get("job_description") or "").strip()
+    if not job_description:  # Nothing to tailor to; the base is the resume
+        return ResumeDraft(base_text, key, base_text)
+    return ResumeDraft(generator.tailor_resume(base_text, job_description), key, base_text)
+
+
+def draft_cover_letter(generator: DocumentGenerator, inputs: dict) -> str:
+    """Produce cover letter content without recording a version"""
+    return generator.generate_cover_letter(**inputs)
 
 
 # Tools with dependency injection
-def create_tools(document_store: DocumentStore, generator: DocumentGenerator, config: AgentConfig):
+def create_tools(document_store: DocumentStore, generator: DocumentGenerator, config: AgentConfig,
+                 job_index: Optional[JobIndex] = None, speculative: Optional[SpeculativeDrafter] = None,
+                 tracer: Tracer = NULL_TRACER, session_id: Optional[str] = None):
     """Factory function for tools - enables testing with mock dependencies"""
+    export_cache = ExportCache(config.output_dir)
+    diff_cache = DiffCache()
     
     @tool(description="""
         Generate a professional resume draft based on the user's background.
@@ -111,11 +632,15 @@ def create_tools(document_store: DocumentStore, generator: DocumentGenerator, co
                      portfolio: Optional[str] = None, 
                      certifications: Optional[str] = None) -> str:
         try:
-            content = generator.generate_resume(
-                name, title, summary, experience, education, skills, 
-                certifications, portfolio, job_description, phone, linkedin_url
+            inputs = dict(
+                name=name, title=title, summary=summary, experience=experience, education=education,
+                skills=skills, job_description=job_description, phone=phone, linkedin_url=linkedin_url,
+                portfolio=portfolio, certifications=certifications
             )
-            metadata = document_store.create(DocumentType.RESUME, content)
+            drafted = speculative.claim("resume", inputs) if speculative else None
+            draft = drafted or draft_resume(generator, document_store, config, inputs)
+            content = draft.content
+            metadata = draft.commit(document_store, generator.structure(content, DocumentType.RESUME))
             
             return (
                 f"✓ Resume Created Successfully\n\n"
@@ -128,6 +653,48 @@ def create_tools(document_store: DocumentStore, generator: DocumentGenerator, co
             logger.error(f"create_resume failed: {e}")
             return f"✗ Error creating resume: {str(e)}"
     
+    @tool(description="""
+        Import the user's existing resume file so the information-gathering interview can be skipped.
+        
+        Parameters:
+        - file_path: Path to a .docx, .txt, .md or .pdf resume
+        - save_as_base: Keep the imported resume as the base that create_resume tailors (default: True)
+        
+        Returns: The extracted profile fields and any that are still missing.
+    """)
+    def import_resume(file_path: str, save_as_base: bool = True) -> str:
+        try:
+            imported = import_resume_file(Path(file_path.strip().strip('"\'')))
+            profile = imported.as_profile()
+            if not profile:
+                return f"✗ No resume content found in {file_path}"
+            
+            stored_base = False
+            if save_as_base and not imported.missing():
+                # create_resume with these values then only tailors the import (one short call)
+                key = profile_key(**{name: profile.get(name) for name in BASE_PROFILE_FIELDS})
+                document_store.set_base(key, imported.to_resume_text())
+                stored_base = True
+            
+            fields = json.dumps(profile, indent=2, ensure_ascii=False)
+            missing = imported.missing()
+            next_step = (
+                f"Still missing: {', '.join(missing)}. Ask only for these."
+                if missing else
+                "All profile fields found. Ask for the target job description, then call create_resume "
+                "with these values unchanged."
+            )
+            return (
+                f"✓ Resume Imported ({Path(file_path).name})\n\n"
+                f"{fields}\n\n"
+                f"{'Stored as base resume. ' if stored_base else ''}{next_step}"
+            )
+        except ValueError as e:
+            return f"✗ {str(e)}"
+        except Exception as e:
+            logger.error(f"import_resume failed: {e}")
+            return f"✗ Error importing resume: {str(e)}"
+    
     @tool(description="""
         Write a personalized cover letter tailored to a specific job.
         
@@ -150,11 +717,15 @@ def create_tools(document_store: DocumentStore, generator: DocumentGenerator, co
                            education: str, skills: str, job_title: str, 
                            company: str, tone: str = "professional") -> str:
         try:
-            content = generator.generate_cover_letter(
-                name, title, summary, experience, education, skills,
-                job_title, company, tone
+            inputs = dict(
+                name=name, title=title, summary=summary, experience=experience, education=education,
+                skills=skills, job_title=job_title, company=company, tone=tone
+            )
+            content = (speculative.claim("cover_letter", inputs) if speculative else None) \
+                or draft_cover_letter(generator, inputs)
+            metadata = document_store.create(
+                DocumentType.COVER_LETTER, content, structure=generator.structure(content, DocumentType.COVER_LETTER)
             )
-            metadata = document_store.create(DocumentType.COVER_LETTER, content)
             
             return (
                 f"✓ Cover Letter Created Successfully\n\n"
@@ -168,6 +739,82 @@ def create_tools(document_store: DocumentStore, generator: DocumentGenerator, co
             logger.error(f"create_cover_letter failed: {e}")
             return f"✗ Error creating cover letter: {str(e)}"
     
+    @tool(description="""
+        Write several cover letter variants at once so the user can pick one.
+        
+        Required parameters:
+        - name, title, summary, experience, education, skills: Candidate background
+        - job_title: Target position title
+        - companies: One or more target company names
+        - tones: One or more tones (professional, enthusiastic, formal, creative)
+        - drafts_per_variant: Alternative drafts for each company/tone to choose from (default: 1)
+        
+        One variant is written for every company/tone combination.
+        
+        Returns: Version number and preview of each variant.
+    """)
+    def create_cover_letter_variants(name: str, title: str, summary: str, experience: str,
+                                     education: str, skills: str, job_title: str,
+                                     companies: list[str], tones: list[str], drafts_per_variant: int = 1) -> str:
+        try:
+            drafts = max(1, min(drafts_per_variant, 5))
+            # Repeated (company, tone) pairs share one request with n completions
+            variants = [(job_title, company, tone) for company in companies for tone in tones for _ in range(drafts)]
+            if not variants:
+                return "✗ Provide at least one company and one tone."
+            
+            contents = generator.generate_cover_letter_variants(
+                name, title, summary, experience, education, skills, variants
+            )
+            created = document_store.create_variants(
+                DocumentType.COVER_LETTER, contents,
+                [
+                    f"{company} - {tone}" + (f" #{index % drafts + 1}" if drafts > 1 else "")
+                    for index, (_, company, tone) in enumerate(variants)
+                ],
+                [generator.structure(content, DocumentType.COVER_LETTER) for content in contents]
+            )
+            
+            previews = [
+                f"v{metadata.version} | {metadata.label} | {metadata.word_count} words\n"
+                f"    {' '.join(metadata.content[:150].split())}..."
+                for metadata in created
+            ]
+            return (
+                f"✓ {len(created)} Cover Letter Variants Created\n\n" + "\n".join(previews) +
+                f"\n\nCurrent: v{created[0].version}. Use select_version to pick another."
+            )
+        except Exception as e:
+            logger.error(f"create_cover_letter_variants failed: {e}")
+            return f"✗ Error creating cover letter variants: {str(e)}"
+    
+    @tool(description="""
+        Make a specific stored version the current one (e.g. pick a cover letter variant).
+        
+        Parameters:
+        - document_type: Type of document ('resume' or 'cover_letter')
+        - version: Version number to select
+        
+        Returns: Confirmation with the selected version.
+    """)
+    def select_version(document_type: str, version: int) -> str:
+        try:
+            doc_type = DocumentType(document_type)
+            metadata = document_store.select_version(doc_type, version)
+            
+            if not metadata:
+                return f"✗ {doc_type.value.title()} v{version} not found."
+            
+            return (
+                f"✓ Selected {doc_type.value.title()} v{metadata.version}"
+                f"{f' ({metadata.label})' if metadata.label else ''}\n"
+                f"Word Count: {metadata.word_count}"
+            )
+        except ValueError:
+            return f"✗ Invalid document type: {document_type}"
+        except Exception as e:
+            return f"✗ Error selecting version: {str(e)}"
+    
     @tool(description="""
         Save documents to DOCX files with automatic naming and versioning.
         
@@ -188,7 +835,6 @@ def create_tools(document_store: DocumentStore, generator: DocumentGenerator, co
                 return "✗ No documents to save. Create a resume or cover letter first."
             
             saved = []
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
             for doc_type_str in document_types:
                 try:
@@ -198,13 +844,15 @@ def create_tools(document_store: DocumentStore, generator: DocumentGenerator, co
                     if not metadata:
                         continue
                     
-                    filename = f"{doc_type.value}_{timestamp}_v{metadata.version}.docx"
-                    filepath = config.output_dir / filename
-                    
-                    DocumentStore.save_to_docx(metadata.content, filepath, doc_type)
+                    # Unchanged content is not rendered again; the earlier file is returned
+                    with tracer.span("save_to_docx", doc_type=doc_type.value):
+                        filepath, reused = export_cache.export(
+                            metadata.content, doc_type, metadata.version, session_id, structure=metadata.structure
+                        )
                     
-                    saved.append(f"{doc_type.value.title()} → {filepath}")
-                    logger.info(f"Saved {doc_type.value} to {filepath}")
+                    note = " (unchanged, already saved)" if reused else ""
+                    saved.append(f"{doc_type.value.title()} → {filepath}{note}")
+                    logger.info(f"Saved {doc_type.value} to {filepath}{note}")
                     
                 except ValueError:
                     logger.warning(f"Invalid document type: {doc_type_str}")
@@ -218,6 +866,32 @@ def create_tools(document_store: DocumentStore, generator: DocumentGenerator, co
             logger.error(f"save_documents failed: {e}")
             return f"✗ Error saving documents: {str(e)}"
     
+    @tool(description="""
+        Save every document, or every version of each, into a single ZIP file.
+        
+        Parameters:
+        - document_types: Optional list of document types to include ['resume', 'cover_letter']
+                         If None, includes all existing documents
+        - all_versions: Include every stored version (e.g. all cover letter variants), not just the current one
+        
+        Returns: Path of the ZIP file and how many documents it holds.
+    """)
+    def export_bundle(document_types: Optional[list[str]] = None, all_versions: bool = False) -> str:
+        try:
+            doc_types = [DocumentType(value) for value in document_types] if document_types else list(DocumentType)
+            path = config.output_dir / "bundles" / f"{safe_filename(session_id or '')}_{uuid4().hex[:8]}.zip"
+            with tracer.span("export_bundle", all_versions=all_versions):
+                stats = save_bundle(path, bundle_items([("", document_store)], doc_types, all_versions), export_cache)
+            if not stats["documents"]:
+                path.unlink(missing_ok=True)
+                return "✗ No documents to bundle. Create a resume or cover letter first."
+            return f"✓ Bundled {stats['documents']} documents → {path}"
+        except ValueError:
+            return f"✗ Invalid document type in {document_types}. Use 'resume' or 'cover_letter'."
+        except Exception as e:
+            logger.error(f"export_bundle failed: {e}")
+            return f"✗ Error bundling documents: {str(e)}"
+    
     @tool(description="""
         Update an existing document with new content.
         
@@ -279,32 +953,359 @@ def create_tools(document_store: DocumentStore, generator: DocumentGenerator, co
         except Exception as e:
             return f"✗ Error previewing: {str(e)}"
     
-    return [create_resume, create_cover_letter, save_documents, update_document, preview_document]
+    @tool(description="""
+        List the stored versions of a document.
+        
+        Parameters:
+        - document_type: Type of document ('resume' or 'cover_letter')
+        
+        Returns: One line per version with word count and timestamp.
+    """)
+    def show_version_history(document_type: str) -> str:
+        try:
+            doc_type = DocumentType(document_type)
+            versions = document_store.get_versions(doc_type)
+            
+            if not versions:
+                return f"✗ No {doc_type.value} exists yet."
+            
+            current = document_store.get(doc_type)
+            lines = [
+                f"{'→' if metadata is current else ' '} v{metadata.version} | "
+                f"{metadata.word_count} words | {metadata.last_modified.strftime('%Y-%m-%d %H:%M')}"
+                f"{f' | {metadata.label}' if metadata.label else ''}"
+                for metadata in versions
+            ]
+            return f"🕘 {doc_type.value.title()} Version History\n" + "\n".join(lines)
+        except ValueError:
+            return f"✗ Invalid document type: {document_type}"
+        except Exception as e:
+            return f"✗ Error reading history: {str(e)}"
+    
+    @tool(description="""
+        Show what changed between two versions of a document, computed locally.
+        
+        Parameters:
+        - document_type: Type of document ('resume' or 'cover_letter')
+        - old_version: Version to compare from (default: the version before new_version)
+        - new_version: Version to compare to (default: the current version)
+        - redline: Also save a DOCX with deletions struck through and insertions underlined
+        
+        Returns: Word counts and changed phrases per section.
+    """)
+    def compare_versions(document_type: str, old_version: Optional[int] = None,
+                         new_version: Optional[int] = None, redline: bool = False) -> str:
+        try:
+            doc_type = DocumentType(document_type)
+            versions = document_store.get_versions(doc_type)
+            by_number = {metadata.version: metadata for metadata in versions}
+            
+            new = by_number.get(new_version) if new_version is not None else document_store.get(doc_type)
+            if new is None:
+                return f"✗ {doc_type.value.title()} v{new_version} not found." if new_version else f"✗ No {doc_type.value} exists yet."
+            old = by_number.get(old_version) if old_version is not None else previous_version(versions, new)
+            if old is None:
+                return f"✗ {doc_type.value.title()} v{old_version} not found." if old_version else f"✗ v{new.version} has no earlier version to compare with."
+            
+            with tracer.span("compare_versions", doc_type=doc_type.value):
+                diff = diff_cache.compare(old, new, doc_type)
+            summary = summarize(diff)
+            if redline:
+                name = f"{safe_filename(session_id or '')}_{doc_type.value}_v{old.version}_v{new.version}.docx"
+                path = config.output_dir / "redlines" / name
+                atomic_write_bytes(path, render_redline_docx(diff))
+                summary += f"\n\nRedline → {path}"
+            return f"🔀 {summary}"
+        except ValueError:
+            return f"✗ Invalid document type: {document_type}"
+        except Exception as e:
+            logger.error(f"compare_versions failed: {e}")
+            return f"✗ Error comparing versions: {str(e)}"
+    
+    @tool(description="""
+        Undo the last change to a document, restoring its previous version.
+        
+        Parameters:
+        - document_type: Type of document ('resume' or 'cover_letter')
+        
+        Returns: Confirmation with the restored version.
+    """)
+    def undo_last_change(document_type: str) -> str:
+        try:
+            doc_type = DocumentType(document_type)
+            
+            if not document_store.exists(doc_type):
+                return f"✗ No {doc_type.value} exists yet."
+            
+            restored = document_store.undo(doc_type)
+            if not restored:
+                return f"✗ Nothing to undo - no earlier {doc_type.value} version to restore."
+            
+            return (
+                f"↩ {doc_type.value.title()} Restored\n\n"
+                f"Current Version: {restored.version}\n"
+                f"Word Count: {restored.word_count}"
+            )
+        except ValueError:
+            return f"✗ Invalid document type: {document_type}"
+        except Exception as e:
+            logger.error(f"undo_last_change failed: {e}")
+            return f"✗ Error undoing change: {str(e)}"
+    
+    @tool(description="""
+        Score the current resume's ATS keyword coverage against one or more job postings.
+        Runs locally and costs no tokens - use it to pick which postings deserve tailored documents.
+        
+        Parameters:
+        - job_descriptions: List of job posting texts to score against
+        - top_k: Number of best-matching postings to report (default: 5)
+        
+        Returns: Ranked postings with coverage score, matched and missing keywords.
+    """)
+    def score_resume_ats(job_descriptions: list[str], top_k: int = 5) -> str:
+        try:
+            if not document_store.exists(DocumentType.RESUME):
+                return "✗ No resume exists yet. Create one first."
+            
+            ranked = rank_postings_for_store(document_store, job_descriptions, top_k=top_k)
+            if not ranked:
+                return "✗ No job descriptions provided."
+            
+            lines = [
+                f"#{result.posting_index + 1} | {result.score:.0%} match\n"
+                f"    Matched: {', '.join(result.matched) or 'none'}\n"
+                f"    Missing: {', '.join(result.missing) or 'none'}"
+                for result in ranked
+            ]
+            return f"📊 ATS Keyword Match ({len(job_descriptions)} postings)\n" + "\n".join(lines)
+        except Exception as e:
+            logger.error(f"score_resume_ats failed: {e}")
+            return f"✗ Error scoring resume: {str(e)}"
+    
+    @tool(description="""
+        Find the job postings in the local job index that best match the candidate.
+        
+        Parameters:
+        - title: Candidate's job title/role
+        - skills: Candidate's skills
+        - summary: Professional summary (optional)
+        - top_k: Number of postings to return (default: 5)
+        
+        Returns: Ranked postings with their posting_id, title and company.
+    """)
+    def find_matching_jobs(title: str, skills: str, summary: str = "", top_k: int = 5) -> str:
+        try:
+            if job_index is None or not len(job_index):
+                return "✗ No job postings indexed. Set DRAFTER_JOB_INDEX to a postings file."
+            
+            matches = job_index.search_profile(
+                {"title": title, "skills": skills, "summary": summary}, top_k=top_k, rerank=job_index.encoder is not None
+            )
+            if not matches:
+                return "✗ No matching postings found."
+            
+            lines = [
+                f"{rank}. [{posting.posting_id}] {posting.title} - {posting.company} (score {score:.2f})"
+                for rank, (posting, score) in enumerate(matches, 1)
+            ]
+            return f"🔎 Top {len(matches)} Matching Jobs\n" + "\n".join(lines)
+        except Exception as e:
+            logger.error(f"find_matching_jobs failed: {e}")
+            return f"✗ Error searching jobs: {str(e)}"
+    
+    @tool(description="""
+        Write cover letters for several indexed job postings in one batch.
+        
+        Required parameters:
+        - name, title, summary, experience, education, skills: Candidate background
+        - posting_ids: posting_id values returned by find_matching_jobs
+        - tone: Writing style (default: "professional")
+        
+        Returns: One line per generated letter with its version.
+    """)
+    def create_cover_letters_for_jobs(name: str, title: str, summary: str, experience: str,
+                                      education: str, skills: str, posting_ids: list[str],
+                                      tone: str = "professional") -> str:
+        try:
+            if job_index is None:
+                return "✗ No job postings indexed. Set DRAFTER_JOB_INDEX to a postings file."
+            
+            postings = [job_index.get(posting_id) for posting_id in posting_ids]
+            unknown = [pid for pid, posting in zip(posting_ids, postings) if posting is None]
+            if unknown:
+                return f"✗ Unknown posting ids: {', '.join(unknown)}"
+            
+            contents = generator.generate_cover_letters_batch(
+                name, title, summary, experience, education, skills,
+                [(posting.title, posting.company) for posting in postings], tone
+            )
+            created = [
+                document_store.create(
+                    DocumentType.COVER_LETTER, content, label=f"{posting.company} - {posting.title}",
+                    structure=generator.structure(content, DocumentType.COVER_LETTER)
+                )
+                for posting, content in zip(postings, contents)
+            ]
+            
+            lines = [f"v{metadata.version} | {metadata.label} | {metadata.word_count} words" for metadata in created]
+            return f"✓ {len(created)} Cover Letters Created\n" + "\n".join(lines)
+        except Exception as e:
+            logger.error(f"create_cover_letters_for_jobs failed: {e}")
+            return f"✗ Error creating cover letters: {str(e)}"
+    
+    return [
+        import_resume, create_resume, create_cover_letter, create_cover_letter_variants, select_version, save_documents, export_bundle, update_document, preview_document,
+        show_version_history, compare_versions, undo_last_change, score_resume_ats, find_matching_jobs,
+        create_cover_letters_for_jobs
+    ]
+
+
+def _fast_path_results(messages: Sequence[BaseMessage]) -> Optional[list[str]]:
+    """Tool outputs of the trailing tool round if it was dispatched by the intent router"""
+    results = []
+    for message in reversed(messages):
+        if isinstance(message, ToolMessage):
+            results.append(message.content)
+            continue
+        if isinstance(message, AIMessage) and message.response_metadata.get("fast_path"):
+            return list(reversed(results))
+        return None
+    return None
 
 
-def build_agent_graph(config: AgentConfig) -> StateGraph:
-    """Build the LangGraph workflow with enhanced routing"""
+def _compact_history(messages: Sequence[BaseMessage]) -> list[BaseMessage]:
+    """Replace job descriptions in earlier user messages and tool-call args with their compact digest"""
+    compacted = []
+    for message in messages:
+        if isinstance(message, HumanMessage) and isinstance(message.content, str) \
+                and looks_like_job_description(message.content):
+            compact = compact_job_description(message.content)
+            if compact != message.content:
+                message = message.model_copy(update={"content": f"(Job description, compacted)\n{compact}"})
+        tool_calls = getattr(message, "tool_calls", None)
+        if isinstance(message, AIMessage) and tool_calls and any(
+            tc["args"].get("job_description") for tc in tool_calls
+        ):
+            tool_calls = [
+                {**tc, "args": {**tc["args"], "job_description": compact_job_description(tc["args"]["job_description"])}}
+                if tc["args"].get("job_description") else tc
+                for tc in tool_calls
+            ]
+            message = message.model_copy(update={"tool_calls": tool_calls})
+        compacted.append(message)
+    return compacted
+
+
+# Every chat turn is one or more graph steps; LangGraph's default limit of 25 ends long sessions
+RECURSION_LIMIT = 10_000
+EXIT_COMMANDS = ('quit', 'exit', 'bye', 'end')
+
+
+def _prompt_user() -> str:
+    """Read one line from the terminal; a closed stdin (pipes, cron) ends the session"""
+    try:
+        return input("\n💬 You: ")
+    except EOFError:
+        return "quit"
+
+
+def build_agent_graph(config: AgentConfig, tracer: Optional[Tracer] = None,
+                      document_store: Optional[DocumentStore] = None,
+                      read_input: Callable[[], str] = _prompt_user,
+                      write_output: Callable[[str], None] = print, session_id: Optional[str] = None) -> StateGraph:
+    """Build the LangGraph workflow; read_input/write_output replace the terminal for headless runs"""
     
-    document_store = DocumentStore()
-    generator = DocumentGenerator(config)
-    tools = create_tools(document_store, generator, config)
+    tracer = tracer or Tracer.from_config(config)
+    document_store = document_store if document_store is not None else DocumentStore()
+    generator = DocumentGenerator(config, tracer)
+    job_index = None
+    if config.job_index_path and config.job_index_path.exists():
+        encoder = load_embedding_encoder(config.embedding_model) if config.embedding_model else None
+        job_index = JobIndex.load(config.job_index_path, encoder=encoder)
+    speculative = SpeculativeDrafter() if config.speculative_drafts else None
+    tools = [
+        tracer.wrap_tool(t)
+        for t in create_tools(document_store, generator, config, job_index, speculative, tracer, session_id)
+    ]
+    router = IntentRouter(document_store) if config.fast_path_enabled else None
+    response_cache = SemanticResponseCache(config.response_cache_threshold) if config.response_cache else None
     
-    model = ChatOpenAI(
-        model_name=config.model_name,
+    def speculate(user_context: dict):
+        """Start background drafts for any document whose required inputs are already known"""
+        if not missing_fields(user_context, RESUME_REQUIRED):
+            resume_inputs = {name: user_context.get(name) for name in RESUME_REQUIRED + RESUME_OPTIONAL}
+            speculative.start(
+                "resume", resume_inputs,
+                lambda: draft_resume(generator, document_store, config, resume_inputs)
+            )
+        
+        # Most users ask for a cover letter right after the resume; target the same posting
+        letter_context = dict(user_context)
+        if user_context.get("job_description"):
+            digest = preprocess_job_description(user_context["job_description"])
+            letter_context.setdefault("job_title", digest.title)
+            letter_context.setdefault("company", digest.company)
+        if not missing_fields(letter_context, COVER_LETTER_REQUIRED):
+            letter_inputs = {name: letter_context[name] for name in COVER_LETTER_REQUIRED}
+            letter_inputs["tone"] = letter_context.get("tone") or "professional"
+            speculative.start("cover_letter", letter_inputs, lambda: draft_cover_letter(generator, letter_inputs))
+    
+    def track_profile(user_context: dict, user_input: str, response: Optional[AIMessage] = None,
+                      question: str = ""):
+        """Collect profile fields from the user's answer to question and from the model's tool calls"""
+        if looks_like_job_description(user_input):
+            user_context["job_description"] = user_input
+        elif user_input:
+            pasted = parse_resume_lines(user_input.splitlines())
+            # A pasted resume fills several sections at once; its first lines are too unreliable for name/title
+            sections = {name: getattr(pasted, name) for name in ("summary", "experience", "education", "skills", "certifications")}
+            if sum(bool(value) for value in sections.values()) >= 2:
+                user_context.update({name: value for name, value in sections.items() if value})
+                user_context.update(extract_contact_fields(user_input))
+            else:
+                user_context.update(answer_fields(question, user_input))
+        for tool_call in (response.tool_calls if response is not None else []):
+            if tool_call["name"] in ("create_resume", "create_cover_letter"):
+                user_context.update({name: value for name, value in tool_call["args"].items() if value})
+        if speculative:
+            speculate(user_context)
+    
+    chat_model = ChatOpenAI(
+        model_name=config.model_for("chat"),
         temperature=config.temperature,
         max_tokens=config.max_tokens
-    ).bind_tools(tools)
+    )
+    # One bound model and system prompt per phase, built once; None means every tool
+    phases = list(Phase) if config.phase_tools else [None]
+    phase_tools = {phase: tools_for_phase(tools, phase) if phase else tools for phase in phases}
+    phase_models = {phase: chat_model.bind_tools(bound) for phase, bound in phase_tools.items()}
+    phase_prompts = {phase: get_main_reply_prompt(render_tool_docs(bound)) for phase, bound in phase_tools.items()}
+    
+    def select_model(messages: Sequence[BaseMessage], user_input: str = ""):
+        """Phase, the model bound to its tools, and the matching system prompt"""
+        phase = detect_phase(messages, document_store, user_input) if config.phase_tools else None
+        logger.info(f"Phase: {phase.value if phase else 'all tools'} ({len(phase_tools[phase])} tools bound)")
+        return phase, phase_models[phase], phase_prompts[phase]
+    
+    def cache_state(messages: Sequence[BaseMessage], phase: Optional[Phase], user_context: dict) -> Optional[tuple]:
+        """
+        Fingerprint of everything besides the user's message that shapes a generic reply.
+        None once the user has said anything specific, since the model may refer back to it.
+        """
+        user_turns = sum(isinstance(msg, HumanMessage) for msg in messages)
+        generic_turns = sum(isinstance(msg, AIMessage) and msg.response_metadata.get("cacheable", False) for msg in messages)
+        if user_turns != generic_turns or any(isinstance(msg, ToolMessage) for msg in messages):
+            return None
+        documents = tuple(doc_type.value for doc_type in DocumentType if document_store.exists(doc_type))
+        return phase.value if phase else None, documents, tuple(missing_fields(user_context, RESUME_REQUIRED))
     
     def agent_node(state: AgentState) -> AgentState:
         """Main agent logic with context awareness"""
-        system_prompt = get_main_reply_prompt()
-        
         # Initialize state
         state.setdefault("messages", [])
-        state.setdefault("document_store", document_store)
-        state.setdefault("config", config)
         
         messages = state["messages"]
+        user_context = dict(state.get("user_context") or {})
         
         # DEBUG: Log current message state
         logger.info(f"=== AGENT NODE - Current messages count: {len(messages)} ===")
@@ -313,16 +1314,27 @@ def build_agent_graph(config: AgentConfig) -> StateGraph:
             has_tools = hasattr(msg, 'tool_calls') and msg.tool_calls
             logger.info(f"  [{i}] {msg_type} - has_tool_calls: {has_tools}")
         
+        # Fast-path tool results are shown as-is; no need to ask the model to summarize
+        if messages and isinstance(messages[-1], ToolMessage):
+            results = _fast_path_results(messages)
+            if results is not None:
+                content = "\n\n".join(results)
+                write_output(f"\nAssistant: {content}")
+                return {"messages": [AIMessage(content=content, response_metadata={"fast_path": True})]}
+        
         # If last message is a ToolMessage, AI responds without asking for input
         if messages and isinstance(messages[-1], ToolMessage):
-            all_messages = [SystemMessage(content=system_prompt)] + messages
+            _, model, system_prompt = select_model(messages)
+            with tracer.span("prompt.chat"):
+                all_messages = [SystemMessage(content=system_prompt)] + _compact_history(messages)
             
             try:
-                response = model.invoke(all_messages)
+                with tracer.span("llm.chat"):
+                    response = model.invoke(all_messages)
                 
                 # Only print if there's actual content
                 if response.content and response.content.strip():
-                    print(f"\nAssistant: {response.content}")
+                    write_output(f"\nAssistant: {response.content}")
                 
                 # Important: Only append AIMessage, not ToolMessages again
                 return {"messages": [response]}
@@ -330,27 +1342,64 @@ def build_agent_graph(config: AgentConfig) -> StateGraph:
             except Exception as e:
                 logger.error(f"Agent node error after tool: {e}")
                 error_msg = AIMessage(content=f"I encountered an error: {str(e)}. Please try again.")
-                print(f"\nError: {str(e)}")
+                write_output(f"\nError: {str(e)}")
                 return {"messages": [error_msg]}
         
         # Get user input
-        user_input = input("\n💬 You: ").strip()
+        user_input = read_input().strip()
         
         # Handle empty input
         if not user_input:
             return state
         
-        if user_input.lower() in ['quit', 'exit', 'bye', 'end']:
+        if user_input.lower() in EXIT_COMMANDS:
             logger.info("User requested exit")
-            print("\n👋 Goodbye! Thanks for using Drafter.")
-            state["_exit_requested"] = True
-            return state
+            write_output("\n👋 Goodbye! Thanks for using Drafter.")
+            if speculative:
+                speculative.shutdown()
+            return {"_exit_requested": True}
         
         user_message = HumanMessage(content=user_input)
-        all_messages = [SystemMessage(content=system_prompt)] + messages + [user_message]
+        
+        # Deterministic commands skip the model entirely
+        routed = router.route(user_input) if router else None
+        if routed:
+            response = AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": intent.tool_name, "args": intent.args, "id": f"call_fastpath_{uuid4().hex[:12]}"}
+                    for intent in routed
+                ],
+                response_metadata={"fast_path": True}
+            )
+            logger.info(f"Fast path tools invoked: {[intent.tool_name for intent in routed]}")
+            return {"messages": [user_message, response]}
+        
+        last_reply = next((m.content for m in reversed(messages) if isinstance(m, AIMessage) and m.content), "")
+        track_profile(user_context, user_input, question=last_reply if isinstance(last_reply, str) else "")
+        
+        phase, model, system_prompt = select_model(messages, user_input)
+        state_key = None
+        if response_cache is not None and is_cacheable_message(user_input):
+            state_key = cache_state(messages, phase, user_context)
+        if state_key is not None:
+            cached = response_cache.lookup(state_key, user_input)
+            if cached is not None:
+                write_output(f"\nAssistant: {cached}")
+                response = AIMessage(content=cached, response_metadata={"response_cache": True, "cacheable": True})
+                return {"messages": [user_message, response], "user_context": user_context}
+        
+        with tracer.span("prompt.chat"):
+            all_messages = [SystemMessage(content=system_prompt)] + _compact_history(messages) + [user_message]
         
         try:
-            response = model.invoke(all_messages)
+            with tracer.span("llm.chat"):
+                response = model.invoke(all_messages)
+            
+            # Only plain answers are reusable; tool calls act on this session's data
+            if state_key is not None and not response.tool_calls and is_cacheable_reply(response.content, user_context):
+                response_cache.store(state_key, user_input, response.content)
+                response.response_metadata["cacheable"] = True
             
             # DEBUG: What did the model return?
             logger.info(f"=== MODEL RESPONSE DEBUG ===")
@@ -364,21 +1413,23 @@ def build_agent_graph(config: AgentConfig) -> StateGraph:
             
             # Only print if there's actual content
             if response.content and response.content.strip():
-                print(f"\nAssistant: {response.content}")
+                write_output(f"\nAssistant: {response.content}")
             
             if hasattr(response, "tool_calls") and response.tool_calls:
                 tool_names = [tc['name'] for tc in response.tool_calls]
-                print(f"\n🔧 Calling tools: {', '.join(tool_names)}")
+                write_output(f"\n🔧 Calling tools: {', '.join(tool_names)}")
                 logger.info(f"Tools invoked: {tool_names}")
             
+            track_profile(user_context, "", response)
+            
             # Return both messages to be added
-            return {"messages": [user_message, response]}
+            return {"messages": [user_message, response], "user_context": user_context}
             
         except Exception as e:
             logger.error(f"Agent node error: {e}")
             error_msg = AIMessage(content=f"I encountered an error: {str(e)}. Please try again.")
-            print(f"\nError: {str(e)}")
-            return {"messages": [user_message, error_msg]}
+            write_output(f"\nError: {str(e)}")
+            return {"messages": [user_message, error_msg], "user_context": user_context}
     
     def route_agent(state: AgentState) -> Literal["use_tools", "continue_chat", "end"]:
         """Intelligent routing based on message history"""
@@ -420,14 +1471,14 @@ def build_agent_graph(config: AgentConfig) -> StateGraph:
     # Build graph
     graph = StateGraph(AgentState)
     
-    graph.add_node("agent", agent_node)
-    graph.add_node("tools", ToolNode(tools=tools))
+    graph.add_node("agent", tracer.wrap("node:agent", agent_node))
+    graph.add_node("tools", ToolNode(tools=tools))  # Each tool is traced individually
     
     graph.set_entry_point("agent")
     
     graph.add_conditional_edges(
         "agent",
-        route_agent,
+        tracer.wrap("route_agent", route_agent),
         {
             "use_tools": "tools",
             "continue_chat": "agent",
@@ -438,7 +1489,11 @@ def build_agent_graph(config: AgentConfig) -> StateGraph:
     # After tools execute, ALWAYS go back to agent
     graph.add_edge("tools", "agent")
     
-    return graph.compile()
+    app = graph.compile()
+    if speculative:
+        # Sessions that end without 'quit' (errors, Ctrl+C, a dropped graph) still stop their drafts
+        weakref.finalize(app, speculative.shutdown)
+    return app
 
 
 def run_document_agent():
@@ -455,17 +1510,21 @@ def run_document_agent():
     
     logger.info("Starting Drafter session")
     
-    app = build_agent_graph(config)
+    tracer = Tracer.from_config(config)
+    app = build_agent_graph(config, tracer)
+    policy = config.retention_policy()
+    stop_retention = start_retention(config.output_dir, policy) if policy else None
     state = {
         "messages": [],
-        "document_store": DocumentStore(),
-        "config": config
+        "user_context": {},
+        "_exit_requested": False
     }
     
     try:
-        for step in app.stream(state, stream_mode="values"):
-            # Stream handles display, just track state
-            state = step
+        with profile_session(config.profile_path):
+            for step in app.stream(state, {"recursion_limit": RECURSION_LIMIT}, stream_mode="values"):
+                # Stream handles display, just track state
+                state = step
             
     except KeyboardInterrupt:
         print("\n\n" + "=" * 70)
@@ -476,6 +1535,10 @@ def run_document_agent():
         print(f"\n❌ Unexpected error: {e}")
         logger.error(f"Runtime error: {e}", exc_info=True)
     finally:
+        if stop_retention:
+            stop_retention.set()
+        if tracer.enabled:
+            tracer.export(config.trace_path)
         print("\n" + "=" * 70)
         print("         ✓ DRAFTER SESSION ENDED")
         print(f"         Output saved to: {config.output_dir}")
@@ -483,5 +1546,8 @@ def run_document_agent():
         logger.info("Session ended")
 
 
+
 if __name__ == "__main__":
-    run_document_agent()
\ No newline at end of file
+    # The headless commands live in drafter_cli; `python drafter_agentV2.py <command>` keeps working
+    from drafter_cli import main
+    sys.exit(main())
\ No newline at end of file
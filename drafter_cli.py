@@ -0,0 +1,529 @@
+"""Headless command line for the document drafter.
+
+Every subcommand prints one JSON object to stdout, so the same engine that backs
+the interactive agent can be driven from scripts, queues and benchmarks.
+"""
+
+from pathlib import Path
+from typing import Callable, Optional
+from uuid import uuid4
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+
+from dotenv import load_dotenv
+
+from drafter_agentV2 import (
+    BASE_PROFILE_FIELDS, EXIT_COMMANDS, RECURSION_LIMIT, AgentConfig, DocumentGenerator,
+    build_agent_graph, create_tools, draft_cover_letter, draft_resume, profile_key, run_document_agent
+)
+from prompts import get_main_reply_prompt
+from helper.document_helper import DocumentMetadata, DocumentStore, DocumentType
+from helper.bundle_export import bundle_items, save_bundle
+from helper.export_cache import ExportCache, RetentionPolicy, start_retention
+from helper.ats_scorer import PostingMatrix, score_resume
+from helper.job_index import JobIndex, JobPosting
+from helper.job_description import KNOWN_SKILLS, preprocess_job_description
+from helper.logger_config import get_logger
+from helper.session_store import Session, SessionStore, benchmark_idle_sessions
+from helper.response_cache import SemanticResponseCache
+from helper.speculative import COVER_LETTER_REQUIRED, RESUME_OPTIONAL, RESUME_REQUIRED, missing_fields
+from helper.tool_phases import Phase, measure_phase_overhead
+from helper.work_queue import WorkQueue, run_worker
+from helper.tracing import Tracer, profile_session
+from helper.resume_import import ImportedProfile, import_resume_file
+from helper.fact_check import check_facts
+from helper.version_diff import DiffCache
+from helper.structured_document import from_text
+
+logger = get_logger(__name__)
+
+# --- Headless CLI: every subcommand prints one JSON object to stdout ---
+
+DEFAULT_QUEUE_PATH = Path("./queue/jobs.sqlite3")
+
+def _document_summary(doc_type: DocumentType, metadata: DocumentMetadata,
+                      path: Optional[Path] = None, reused: bool = False) -> dict:
+    summary = {"type": doc_type.value, "version": metadata.version, "words": metadata.word_count, "label": metadata.label}
+    if path is not None:
+        summary.update(path=str(path), reused=reused)
+    return summary
+
+
+def _open_session(args) -> tuple[Optional[SessionStore], Optional[Session]]:
+    """Persisted session named by --session, if one was requested"""
+    if not args.session:
+        return None, None
+    sessions = SessionStore(args.sessions_dir)
+    return sessions, sessions.get(args.session)
+
+
+def _current_documents(document_store: DocumentStore,
+                       doc_types: list[DocumentType]) -> list[tuple[DocumentType, DocumentMetadata]]:
+    """Current version of each requested document that exists"""
+    return [(doc_type, metadata) for doc_type in doc_types if (metadata := document_store.get(doc_type)) is not None]
+
+
+async def _aexport_documents(documents: list[tuple[DocumentType, DocumentMetadata]], config: AgentConfig,
+                             session_id: Optional[str] = None) -> list[dict]:
+    """Save each document version (deduplicated, rendered concurrently) and describe what was written"""
+    export_cache = ExportCache(config.output_dir)
+    try:
+        results = await asyncio.gather(*(
+            export_cache.aexport(metadata.content, doc_type, metadata.version, session_id, structure=metadata.structure)
+            for doc_type, metadata in documents
+        ))
+    finally:
+        export_cache.close()
+    return [
+        _document_summary(doc_type, metadata, path, reused)
+        for (doc_type, metadata), (path, reused) in zip(documents, results)
+    ]
+
+
+def _export_documents(documents: list[tuple[DocumentType, DocumentMetadata]], config: AgentConfig,
+                      session_id: Optional[str] = None) -> list[dict]:
+    """_aexport_documents for the blocking headless commands"""
+    return asyncio.run(_aexport_documents(documents, config, session_id))
+
+
+def _load_transcript(path: Path) -> list[str]:
+    """User turns from a .json list, .jsonl lines (strings or {"role", "content"}), or plain text lines"""
+    text = Path(path).read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        entries = json.loads(text)
+    elif path.suffix == ".jsonl":
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        entries = text.splitlines()
+    
+    turns = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            if entry.get("role", "user") not in ("user", "human"):
+                continue
+            entry = entry.get("content", "")
+        if str(entry).strip():
+            turns.append(str(entry))
+    return turns
+
+
+def generate_documents(generator: DocumentGenerator, document_store: DocumentStore, config: AgentConfig,
+                       profile: dict, doc_types: list[DocumentType], tone: Optional[str] = None,
+                       export: bool = True, session_id: Optional[str] = None) -> list[dict]:
+    """Generate the requested documents from a complete profile (job_description included)"""
+    if DocumentType.RESUME in doc_types:
+        missing = missing_fields(profile, RESUME_REQUIRED)
+        if missing:
+            raise ValueError(f"Profile is missing resume fields: {', '.join(missing)}")
+        inputs = {name: profile.get(name) for name in RESUME_REQUIRED + RESUME_OPTIONAL}
+        draft = draft_resume(generator, document_store, config, inputs)
+        draft.commit(document_store, generator.structure(draft.content, DocumentType.RESUME))
+    
+    if DocumentType.COVER_LETTER in doc_types:
+        letter = dict(profile)
+        if profile.get("job_description"):
+            digest = preprocess_job_description(profile["job_description"])
+            letter.setdefault("job_title", digest.title)
+            letter.setdefault("company", digest.company)
+        missing = missing_fields(letter, COVER_LETTER_REQUIRED)
+        if missing:
+            raise ValueError(f"Profile is missing cover letter fields: {', '.join(missing)}")
+        inputs = {name: letter[name] for name in COVER_LETTER_REQUIRED}
+        inputs["tone"] = tone or letter.get("tone") or "professional"
+        label = f"{inputs['company']} - {inputs['job_title']}"
+        content = draft_cover_letter(generator, inputs)
+        document_store.create(
+            DocumentType.COVER_LETTER, content, label=label,
+            structure=generator.structure(content, DocumentType.COVER_LETTER)
+        )
+    
+    if not export:
+        return [_document_summary(dt, document_store.get(dt)) for dt in doc_types]
+    return _export_documents(_current_documents(document_store, doc_types), config, session_id)
+
+
+def process_generation_job(payload: dict, generator: DocumentGenerator, config: AgentConfig) -> dict:
+    """Work queue handler: {"profile", "job_description", "documents", "tone"} → exported documents"""
+    profile = dict(payload["profile"])
+    if payload.get("job_description"):
+        profile["job_description"] = payload["job_description"]
+    doc_types = [DocumentType(value) for value in payload.get("documents") or [dt.value for dt in DocumentType]]
+    # A fresh store per job; exports are deduplicated, so a retried job reuses files already written
+    documents = generate_documents(generator, DocumentStore(), config, profile, doc_types, payload.get("tone"))
+    return {"documents": documents}
+
+
+def _read_profile(args) -> tuple[dict, Optional[ImportedProfile]]:
+    """Profile from an imported resume and/or a profile JSON (JSON values win), plus the import itself"""
+    if not (args.profile or args.resume):
+        raise ValueError("Pass --profile, --resume, or both")
+    imported = import_resume_file(args.resume) if args.resume else None
+    profile = imported.as_profile() if imported else {}
+    if args.profile:
+        profile.update(json.loads(Path(args.profile).read_text(encoding="utf-8")))
+    if args.job:
+        profile["job_description"] = Path(args.job).read_text(encoding="utf-8")
+    return profile, imported
+
+
+def cli_generate(args, config: AgentConfig) -> dict:
+    """Profile JSON + job description file → generated (and exported) documents"""
+    profile, imported = _read_profile(args)
+    sessions, session = _open_session(args)
+    document_store = session.document_store if session else DocumentStore()
+    if imported and not args.profile and not imported.missing():
+        # The imported resume is the base, so only the tailoring call is needed
+        document_store.set_base(
+            profile_key(**{name: profile.get(name) for name in BASE_PROFILE_FIELDS}), imported.to_resume_text()
+        )
+    doc_types = [DocumentType(value) for value in args.documents]
+    generator = DocumentGenerator(config)
+    documents = generate_documents(
+        generator, document_store, config, profile, doc_types, args.tone,
+        export=not args.no_export, session_id=args.session
+    )
+    
+    if session:
+        session.user_context.update({name: value for name, value in profile.items() if value})
+        sessions.flush()
+    return {
+        "command": "generate", "session": args.session, "documents": documents,
+        "fact_check": generator.fact_stats, "cascade": generator.cascade_stats,
+        "structured": generator.structured_stats
+    }
+
+
+def cli_enqueue(args, config: AgentConfig) -> dict:
+    """Queue a generation job; re-submitting the same job returns the existing one"""
+    profile, _ = _read_profile(args)
+    payload = {
+        "profile": {name: value for name, value in profile.items() if name != "job_description"},
+        "job_description": profile.get("job_description", ""),
+        "documents": args.documents,
+        "tone": args.tone,
+    }
+    queue = WorkQueue(args.queue)
+    try:
+        job, created = queue.enqueue(payload, args.key)
+    finally:
+        queue.close()
+    return {
+        "command": "enqueue", "job_id": job.job_id, "key": job.idempotency_key, "created": created,
+        "status": job.status.value, "result": job.result
+    }
+
+
+def cli_worker(args, config: AgentConfig) -> dict:
+    """Process queued generation jobs; run several of these to scale out"""
+    generator = DocumentGenerator(config)
+    queue = WorkQueue(args.queue, visibility_timeout=args.visibility_timeout, max_attempts=args.max_attempts)
+    policy = config.retention_policy()
+    stop_retention = start_retention(config.output_dir, policy) if policy else None
+    try:
+        summary = run_worker(
+            queue, lambda payload: process_generation_job(payload, generator, config),
+            worker_id=args.worker_id, poll_interval=args.poll_interval,
+            max_jobs=args.max_jobs, stop_when_empty=args.drain
+        )
+        summary["queue"] = queue.stats()
+    finally:
+        if stop_retention:
+            stop_retention.set()
+        queue.close()
+    return {"command": "worker", **summary}
+
+
+def cli_export(args, config: AgentConfig) -> dict:
+    """Export documents stored in a persisted session"""
+    _, session = _open_session(args)
+    doc_types = [DocumentType(value) for value in args.documents] if args.documents else list(DocumentType)
+    if args.version is None:
+        selected = _current_documents(session.document_store, doc_types)
+    else:
+        # Render the stored version as-is: exporting must not change which version is current
+        if len(doc_types) != 1:
+            raise ValueError("--version needs exactly one document type")
+        versions = session.document_store.get_versions(doc_types[0])
+        selected = [(doc_types[0], metadata) for metadata in versions if metadata.version == args.version]
+        if not selected:
+            raise ValueError(f"{doc_types[0].value} v{args.version} not found")
+    
+    documents = _export_documents(selected, config, args.session)
+    if not documents:
+        raise ValueError(f"Session {args.session} has no documents to export")
+    return {"command": "export", "session": args.session, "documents": documents}
+
+
+def cli_replay(args, config: AgentConfig) -> dict:
+    """Feed a transcript of user turns through the graph and report every reply"""
+    inputs = iter(_load_transcript(Path(args.transcript)))
+    turns: list[dict] = []
+    
+    def read_input() -> str:
+        text = next(inputs, None)
+        if text is None:
+            return EXIT_COMMANDS[0]
+        turns.append({"input": text, "output": []})
+        return text
+    
+    def write_output(text: str):
+        if turns:
+            turns[-1]["output"].append(text.strip())
+    
+    sessions, session = _open_session(args)
+    document_store = session.document_store if session else DocumentStore()
+    tracer = Tracer.from_config(config)
+    app = build_agent_graph(config, tracer, document_store, read_input, write_output, args.session)
+    state = {
+        "messages": session.messages if session else [],
+        "user_context": session.user_context if session else {},
+        "_exit_requested": False
+    }
+    
+    try:
+        with profile_session(config.profile_path):
+            state = app.invoke(state, {"recursion_limit": RECURSION_LIMIT})
+    finally:
+        if tracer.enabled:
+            tracer.export(config.trace_path)
+    
+    if session:
+        session.messages = list(state["messages"])
+        session.user_context = state.get("user_context") or {}
+        sessions.flush()
+    
+    documents = [
+        _document_summary(doc_type, document_store.get(doc_type))
+        for doc_type in DocumentType if document_store.exists(doc_type)
+    ]
+    return {"command": "replay", "session": args.session, "turns": turns, "documents": documents}
+
+
+def cli_prune(args, config: AgentConfig) -> dict:
+    """Apply the retention policy to the export archive once"""
+    days = args.days if args.days is not None else config.retention_days
+    archive = ExportCache(config.output_dir)
+    try:
+        expired = archive.prune(RetentionPolicy(days, args.keep)) if days is not None else 0
+        missing = archive.prune()
+        stats = archive.stats()
+    finally:
+        archive.close()
+    return {"command": "prune", "expired": expired, "missing": missing, "archive": stats}
+
+
+def cli_bundle(args, config: AgentConfig) -> dict:
+    """Stream documents from one or many persisted sessions into one ZIP file"""
+    sessions = SessionStore(args.sessions_dir)
+    session_ids = args.session or sessions.session_ids()
+    doc_types = [DocumentType(value) for value in args.documents] if args.documents else list(DocumentType)
+    # Sessions are loaded one at a time as the archive is written, not all up front
+    stores = (
+        (session_id, session.document_store)
+        for session_id in session_ids if (session := sessions.peek(session_id)) is not None
+    )
+    path = args.out or config.output_dir / "bundles" / f"bundle_{time.strftime('%Y%m%d_%H%M%S')}.zip"
+    export_cache = ExportCache(config.output_dir)
+    try:
+        stats = save_bundle(path, bundle_items(stores, doc_types, args.all_versions), export_cache)
+    finally:
+        export_cache.close()
+    if not stats["documents"]:
+        Path(path).unlink(missing_ok=True)
+        raise ValueError("No documents found in the requested sessions")
+    return {"command": "bundle", "sessions": len(session_ids), **stats}
+
+
+def _synthetic_postings(count: int, seed: int = 7) -> list[JobPosting]:
+    rng = random.Random(seed)
+    skills = sorted(KNOWN_SKILLS)
+    roles = ["Backend Engineer", "Data Analyst", "Frontend Developer", "DevOps Engineer", "ML Engineer", "QA Engineer"]
+    return [
+        JobPosting(
+            posting_id=f"bench-{i}",
+            title=rng.choice(roles),
+            company=f"Company {i % 997}",
+            requirements="\n".join(f"- Experience with {skill}" for skill in rng.sample(skills, 6)),
+        )
+        for i in range(count)
+    ]
+
+
+def _time_ms(fn: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return round((time.perf_counter() - start) * 1000 / repeat, 3)
+
+
+def cli_bench(args, config: AgentConfig) -> dict:
+    """Offline micro-benchmarks of the local hot paths (no API calls)"""
+    postings = _synthetic_postings(args.postings)
+    index = JobIndex()
+    start = time.perf_counter()
+    index.add_many(postings)
+    index.search("warmup")  # The inverted index is built lazily on first search
+    build_ms = round((time.perf_counter() - start) * 1000, 1)
+    
+    resume = "\n".join([
+        "JANE DOE", "Backend Engineer", "", "SUMMARY", "Backend engineer building Python and Go services.",
+        "", "SKILLS", "Python, Go, PostgreSQL, Docker, Kubernetes, AWS, Redis"
+    ])
+    matrix = PostingMatrix([posting.as_job_description() for posting in postings])
+    job_description = postings[0].as_job_description()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        export_cache = ExportCache(Path(tmp))
+        render_ms = _time_ms(lambda: DocumentStore.render_docx(resume, DocumentType.RESUME), 5)
+        structure = from_text(resume, DocumentType.RESUME)
+        structured_ms = _time_ms(lambda: DocumentStore.render_docx(resume, DocumentType.RESUME, structure), 5)
+        export_cache.export(resume, DocumentType.RESUME, 1)
+        cached_ms = _time_ms(lambda: export_cache.export(resume, DocumentType.RESUME, 1), 100)
+        export_cache.close()
+    
+    revised = DocumentStore()
+    first = revised.create(DocumentType.RESUME, resume)
+    second = revised.create(DocumentType.RESUME, resume.replace("Python and Go", "Python, Go and Rust") + "\n\nEDUCATION\nBS Computer Science")
+    diff_cache = DiffCache()
+    
+    response_cache = SemanticResponseCache(config.response_cache_threshold)
+    state_key = (Phase.GATHERING.value, (), tuple(RESUME_REQUIRED))
+    response_cache.store(state_key, "What do you need from me?", "Your name, title, ...")
+    response_cache.store(state_key, "What tones are available?", "Professional, enthusiastic, ...")
+    paraphrases = ["what do you need from me", "What do you need from me??", "what tones are available?",
+                   "What do you need to know?", "Which tones can I pick?"]
+    lookups = [response_cache.lookup(state_key, message) is not None for message in paraphrases]
+    
+    return {
+        "command": "bench",
+        "postings": args.postings,
+        "job_index": {
+            "build_ms": build_ms,
+            "search_ms": _time_ms(lambda: index.search("senior python backend engineer kubernetes", top_k=10), args.repeat),
+        },
+        "ats": {
+            "rank_ms": _time_ms(lambda: matrix.rank(resume, top_k=10), args.repeat),
+            "score_ms": _time_ms(lambda: score_resume(resume, job_description), args.repeat),
+        },
+        "fact_check": {
+            "check_ms": _time_ms(lambda: check_facts(resume, {"skills": "Python, Go", "experience": "Acme"}, job_description), args.repeat),
+        },
+        "job_description": {
+            "preprocess_ms": _time_ms(lambda: preprocess_job_description(job_description + f"\n{uuid4()}"), args.repeat),
+        },
+        "export": {"render_ms": render_ms, "structured_render_ms": structured_ms, "cached_ms": cached_ms},
+        "version_diff": {
+            "compare_ms": _time_ms(lambda: DiffCache().compare(first, second, DocumentType.RESUME), args.repeat),
+            "cached_ms": _time_ms(lambda: diff_cache.compare(first, second, DocumentType.RESUME), args.repeat),
+        },
+        "response_cache": {
+            "lookup_ms": _time_ms(lambda: response_cache.lookup(state_key, "what do you need from me"), args.repeat),
+            "paraphrase_hits": f"{sum(lookups)}/{len(lookups)}",
+        },
+        # Tool schemas only; no tool is invoked, so no generator (or API key) is needed
+        "prompt_overhead": measure_phase_overhead(create_tools(DocumentStore(), None, config), get_main_reply_prompt),
+        "sessions": benchmark_idle_sessions(args.sessions, max_hot=min(100, args.sessions)),
+    }
+
+
+def build_cli() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="drafter", description="Drafter resume & cover letter assistant")
+    parser.add_argument("--output-dir", type=Path, help="Where DOCX files are written (default: ./outputs)")
+    subcommands = parser.add_subparsers(dest="command")
+    
+    subcommands.add_parser("chat", help="Interactive session (default)")
+    
+    def add_session_args(sub, required: bool = False):
+        sub.add_argument("--session", required=required, help="Persist documents under this session id")
+        sub.add_argument("--sessions-dir", type=Path, default=Path("./sessions"))
+    
+    def add_job_args(sub):
+        sub.add_argument("--profile", type=Path, help="JSON with name, title, summary, experience, ...")
+        sub.add_argument("--resume", type=Path, help="Existing resume (.docx/.txt/.md/.pdf) to import the profile from")
+        sub.add_argument("--job", type=Path, help="Plain-text job description")
+        sub.add_argument("--documents", nargs="+", choices=[dt.value for dt in DocumentType],
+                         default=[dt.value for dt in DocumentType])
+        sub.add_argument("--tone", help="Cover letter tone (default: profile tone or professional)")
+    
+    generate = subcommands.add_parser("generate", help="Profile + job description → documents")
+    add_job_args(generate)
+    generate.add_argument("--no-export", action="store_true", help="Generate without writing DOCX files")
+    add_session_args(generate)
+    
+    export = subcommands.add_parser("export", help="Export documents from a persisted session")
+    export.add_argument("--documents", nargs="+", choices=[dt.value for dt in DocumentType])
+    export.add_argument("--version", type=int, help="Export this version instead of the current one")
+    add_session_args(export, required=True)
+    
+    replay = subcommands.add_parser("replay", help="Run a transcript of user turns through the agent")
+    replay.add_argument("transcript", type=Path, help=".json list, .jsonl, or one user turn per line")
+    add_session_args(replay)
+    
+    enqueue = subcommands.add_parser("enqueue", help="Queue a generation job for workers")
+    add_job_args(enqueue)
+    enqueue.add_argument("--queue", type=Path, default=DEFAULT_QUEUE_PATH)
+    enqueue.add_argument("--key", help="Idempotency key (default: hash of the job payload)")
+    
+    worker = subcommands.add_parser("worker", help="Process queued generation jobs")
+    worker.add_argument("--queue", type=Path, default=DEFAULT_QUEUE_PATH)
+    worker.add_argument("--worker-id", help="Name in logs (default: host:pid)")
+    worker.add_argument("--visibility-timeout", type=float, default=300.0, help="Seconds before an unacked job is retried")
+    worker.add_argument("--max-attempts", type=int, default=5)
+    worker.add_argument("--poll-interval", type=float, default=1.0)
+    worker.add_argument("--max-jobs", type=int, help="Stop after this many jobs")
+    worker.add_argument("--drain", action="store_true", help="Stop once the queue is empty")
+    
+    prune = subcommands.add_parser("prune", help="Delete old exports and forget files removed by hand")
+    prune.add_argument("--days", type=float, help="Maximum age (default: DRAFTER_RETENTION_DAYS; unset keeps everything)")
+    prune.add_argument("--keep", type=int, default=3, help="Newest exports kept per session and document type")
+    
+    bundle = subcommands.add_parser("bundle", help="Export documents from many sessions into one ZIP file")
+    bundle.add_argument("--session", nargs="+", help="Session ids to include (default: every persisted session)")
+    bundle.add_argument("--sessions-dir", type=Path, default=Path("./sessions"))
+    bundle.add_argument("--documents", nargs="+", choices=[dt.value for dt in DocumentType])
+    bundle.add_argument("--all-versions", action="store_true", help="Include every stored version, not just the current one")
+    bundle.add_argument("--out", type=Path, help="ZIP path (default: <output-dir>/bundles/bundle_<timestamp>.zip)")
+    
+    bench = subcommands.add_parser("bench", help="Offline benchmarks of local hot paths")
+    bench.add_argument("--postings", type=int, default=20_000)
+    bench.add_argument("--sessions", type=int, default=1_000)
+    bench.add_argument("--repeat", type=int, default=50)
+    return parser
+
+
+CLI_COMMANDS = {
+    "generate": cli_generate, "export": cli_export, "replay": cli_replay, "bench": cli_bench,
+    "enqueue": cli_enqueue, "worker": cli_worker, "prune": cli_prune,
+    "bundle": cli_bundle,
+}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point; headless commands print JSON and return a non-zero exit code on failure"""
+    args = build_cli().parse_args(argv)
+    if args.command in (None, "chat"):
+        run_document_agent()
+        return 0
+    
+    load_dotenv()
+    config = AgentConfig()
+    if args.output_dir:
+        config.output_dir = args.output_dir
+    
+    try:
+        result = CLI_COMMANDS[args.command](args, config)
+    except Exception as e:
+        logger.error(f"{args.command} failed: {e}", exc_info=True)
+        print(json.dumps({"command": args.command, "error": str(e)}))
+        return 1
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Local ATS keyword-match scoring.
+
+Postings are turned into a sparse binary term matrix (CSR layout in plain NumPy
+arrays) weighted by IDF, so one resume is scored against thousands of postings
+with a handful of vectorized operations and no LLM calls.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from helper.document_helper import DocumentStore, DocumentType
+from helper.job_description import STOPWORDS, preprocess_job_description, tokenize
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ATSScore:
+    """Keyword coverage of a resume for one posting"""
+    posting_index: int
+    score: float  # IDF-weighted share of posting keywords found in the resume (0-1)
+    matched: tuple[str, ...]
+    missing: tuple[str, ...]
+
+
+def resume_terms(text: str) -> set[str]:
+    """Distinct content tokens of a resume"""
+    return {token for token in tokenize(text) if token not in STOPWORDS}
+
+
+def posting_terms(text: str) -> set[str]:
+    """Keyword terms of a posting: extracted skills plus keyphrase/requirement tokens"""
+    digest = preprocess_job_description(text)
+    terms = set(digest.skills)
+    for phrase in digest.keywords + digest.requirements:
+        terms.update(token for token in tokenize(phrase) if token not in STOPWORDS and any(c.isalpha() for c in token))
+    return terms
+
+
+class PostingMatrix:
+    """Sparse posting × term matrix built once and reused for every resume scored against it"""
+
+    def __init__(self, postings: Sequence[str]):
+        self.vocabulary: dict[str, int] = {}
+        indices: list[int] = []
+        indptr = [0]
+
+        for text in postings:
+            for term in sorted(posting_terms(text)):
+                indices.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+            indptr.append(len(indices))
+
+        self.terms = np.array(list(self.vocabulary), dtype=object)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.row_ids = np.repeat(np.arange(len(postings), dtype=np.int32), np.diff(self.indptr))
+
+        document_frequency = np.bincount(self.indices, minlength=len(self.vocabulary))
+        self.idf = (np.log((1 + len(postings)) / (1 + document_frequency)) + 1.0).astype(np.float32)
+        self.weights = self.idf[self.indices]
+        self.row_totals = np.bincount(self.row_ids, weights=self.weights, minlength=len(postings))
+
+        logger.info(f"Built posting matrix: {len(postings)} postings, {len(self.vocabulary)} terms, {len(indices)} entries")
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def _hits(self, text: str) -> np.ndarray:
+        mask = np.zeros(len(self.vocabulary), dtype=bool)
+        ids = [self.vocabulary[term] for term in resume_terms(text) if term in self.vocabulary]
+        mask[ids] = True
+        return mask[self.indices]
+
+    def _coverage(self, hits: np.ndarray) -> np.ndarray:
+        matched = np.bincount(self.row_ids, weights=self.weights * hits, minlength=len(self))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.row_totals > 0, matched / self.row_totals, 0.0)
+
+    def scores(self, resume_text: str) -> np.ndarray:
+        """Coverage score of the resume for every posting, in posting order"""
+        return self._coverage(self._hits(resume_text))
+
+    def rank(self, resume_text: str, top_k: Optional[int] = None, detail_terms: int = 10) -> list[ATSScore]:
+        """Postings ordered by coverage, with matched/missing keywords for the top results"""
+        hits = self._hits(resume_text)
+        scores = self._coverage(hits)
+
+        k = len(self) if top_k is None else min(top_k, len(self))
+        if k < len(self):
+            top = np.argpartition(-scores, k - 1)[:k] if k > 0 else np.array([], dtype=np.int64)
+            order = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            order = np.argsort(-scores, kind="stable")
+
+        results = []
+        for row in order:
+            start, end = self.indptr[row], self.indptr[row + 1]
+            # Highest-IDF terms first: the rarer the keyword, the more it distinguishes the posting
+            by_weight = start + np.argsort(-self.weights[start:end], kind="stable")
+            row_hits = hits[by_weight]
+            results.append(ATSScore(
+                posting_index=int(row),
+                score=float(scores[row]),
+                matched=tuple(self.terms[self.indices[by_weight[row_hits]]][:detail_terms]),
+                missing=tuple(self.terms[self.indices[by_weight[~row_hits]]][:detail_terms])
+            ))
+        return results
+
+
+def rank_postings(resume_text: str, postings: Sequence[str], top_k: Optional[int] = None) -> list[ATSScore]:
+    """Score one resume against many postings in a single vectorized pass"""
+    if not postings:
+        return []
+    return PostingMatrix(postings).rank(resume_text, top_k=top_k)
+
+
+def score_resume(resume_text: str, job_description: str) -> ATSScore:
+    """Score one resume against one posting"""
+    return rank_postings(resume_text, [job_description])[0]
+
+
+def rank_postings_for_store(document_store: DocumentStore, postings: Sequence[str],
+                            top_k: Optional[int] = None) -> list[ATSScore]:
+    """Rank postings against the current resume in a DocumentStore"""
+    metadata = document_store.get(DocumentType.RESUME)
+    if not metadata:
+        raise ValueError("No resume exists yet")
+    return rank_postings(metadata.content, postings, top_k=top_k)
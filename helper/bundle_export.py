@@ -0,0 +1,144 @@
+"""
+Streaming ZIP bundles of many documents.
+
+Documents from one or many DocumentStores are rendered one at a time and
+written straight into a ZIP archive, so memory holds at most one rendered
+document plus a chunk of output, and no per-document files are created.
+Documents that were already exported are copied from the export archive
+instead of being rendered again. The archive can go to a file (written
+atomically) or be consumed as an iterator of byte chunks for a streamed
+response; a manifest.json at the end lists every entry.
+"""
+
+import io
+import json
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from helper.document_helper import DocumentMetadata, DocumentStore, DocumentType
+from helper.export_cache import ExportCache
+from helper.file_io import atomic_writer, safe_filename
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass
+class BundleItem:
+    """One document version and its path inside the archive"""
+    arcname: str
+    doc_type: DocumentType
+    metadata: DocumentMetadata
+    owner: str = ""  # Session or candidate the document belongs to
+
+
+def bundle_items(stores: Iterable[tuple[str, DocumentStore]], doc_types: Optional[Iterable[DocumentType]] = None,
+                 all_versions: bool = False) -> Iterator[BundleItem]:
+    """Current (or every) version of each document in each (owner, store), lazily"""
+    doc_types = list(doc_types or DocumentType)
+    for owner, store in stores:
+        folder = f"{safe_filename(owner)}/" if owner else ""
+        for doc_type in doc_types:
+            versions = store.get_versions(doc_type) if all_versions else [store.get(doc_type)]
+            for metadata in versions:
+                if metadata is not None:
+                    yield BundleItem(f"{folder}{doc_type.value}_v{metadata.version}.docx", doc_type, metadata, owner)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable target that hands written bytes back in drain()"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        yield from chunks
+
+
+def _document_chunks(item: BundleItem, export_cache: Optional[ExportCache], chunk_size: int) -> Iterator[bytes]:
+    """DOCX bytes of one item: streamed from an existing export when there is one, otherwise rendered"""
+    metadata = item.metadata
+    existing = (
+        export_cache.lookup(metadata.content, item.doc_type, metadata.structure, item.owner or None)
+        if export_cache else None
+    )
+    if existing is not None:
+        with open(existing, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+        return
+    yield from DocumentStore.iter_docx_chunks(metadata.content, item.doc_type, chunk_size, metadata.structure)
+
+
+def _write_entries(archive: zipfile.ZipFile, items: Iterable[BundleItem], export_cache: Optional[ExportCache],
+                   chunk_size: int, stats: dict) -> Iterator[None]:
+    """Write every item and the manifest, yielding after each chunk so callers can drain output"""
+    manifest = []
+    seen: set[str] = set()
+    for item in items:
+        arcname = item.arcname
+        if arcname in seen:  # Two owners whose names sanitize to the same folder
+            stem, _, suffix = arcname.rpartition(".")
+            arcname = f"{stem}_{len(seen)}.{suffix}"
+        seen.add(arcname)
+        size = 0
+        # DOCX files are already deflated; storing them avoids compressing twice
+        with archive.open(zipfile.ZipInfo(arcname, date_time=item.metadata.last_modified.timetuple()[:6]), "w") as entry:
+            for chunk in _document_chunks(item, export_cache, chunk_size):
+                entry.write(chunk)
+                size += len(chunk)
+                yield
+        stats["documents"] += 1
+        stats["bytes"] += size
+        manifest.append({
+            "path": arcname, "owner": item.owner, "document_type": item.doc_type.value,
+            "version": item.metadata.version, "label": item.metadata.label, "word_count": item.metadata.word_count,
+            "last_modified": item.metadata.last_modified.isoformat(timespec="seconds"), "size": size,
+        })
+    archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+    yield
+
+
+def write_bundle(fileobj: BinaryIO, items: Iterable[BundleItem], export_cache: Optional[ExportCache] = None,
+                 chunk_size: int = CHUNK_SIZE) -> dict:
+    """Write the archive to an open binary file (seekable or not); returns document and byte counts"""
+    stats = {"documents": 0, "bytes": 0}
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_STORED) as archive:
+        for _ in _write_entries(archive, items, export_cache, chunk_size, stats):
+            pass
+    return stats
+
+
+def save_bundle(path: Path, items: Iterable[BundleItem], export_cache: Optional[ExportCache] = None,
+                chunk_size: int = CHUNK_SIZE) -> dict:
+    """write_bundle to path, replacing it atomically once the archive is complete"""
+    with atomic_writer(path) as f:
+        stats = write_bundle(f, items, export_cache, chunk_size)
+    logger.info(f"Saved bundle of {stats['documents']} documents to {path}")
+    return {**stats, "path": str(path)}
+
+
+def iter_bundle(items: Iterable[BundleItem], export_cache: Optional[ExportCache] = None,
+                chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """The archive as byte chunks, produced while documents are rendered (e.g. for a streamed HTTP response)"""
+    sink = _ChunkSink()
+    stats = {"documents": 0, "bytes": 0}
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for _ in _write_entries(archive, items, export_cache, chunk_size, stats):
+            yield from sink.drain()
+    yield from sink.drain()  # Central directory, written on close
+    logger.info(f"Streamed bundle of {stats['documents']} documents")
@@ -1,5 +1,10 @@
-from typing import  Optional
+from typing import  TYPE_CHECKING, Iterator, Optional
 from dataclasses import dataclass, field
+import difflib
+import asyncio
+import io
+import hashlib
+import weakref
 from datetime import datetime
 from pathlib import Path
 from docx.shared import Pt, Inches
@@ -8,10 +13,18 @@ import os
 from enum import Enum
 from docx import Document
 
+from helper.file_io import atomic_write_bytes, atomic_write_bytes_async
 from helper.logger_config import get_logger
 
+if TYPE_CHECKING:
+    from helper.structured_document import StructuredDocument
+
 logger = get_logger(__name__)
 
+# Bump whenever render_docx output changes so cached exports are re-rendered
+DOCX_RENDERER_VERSION = 1
+
+
 class DocumentType(Enum):
     """Enum for document types - more maintainable than strings"""
     RESUME = "resume"
@@ -25,20 +38,78 @@ class AgentConfig:
     max_tokens: int = 500
     output_dir: Path = field(default_factory=lambda: Path("./outputs"))
     
-    def __post_init__(self):
-        self.output_dir.mkdir(exist_ok=True)
 
-@dataclass
+class SharedText(str):
+    """str subclass that can be weakly referenced, so identical contents can be pooled"""
+
+
+# Identical document contents (across versions and sessions) share one string object
+_CONTENT_POOL: "weakref.WeakValueDictionary[str, SharedText]" = weakref.WeakValueDictionary()
+
+
+def intern_content(text: str) -> str:
+    """Return the pooled copy of text, adding it to the pool if unseen"""
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    shared = _CONTENT_POOL.get(key)
+    if shared is None:
+        shared = SharedText(text)
+        _CONTENT_POOL[key] = shared
+    return shared
+
+
+# (start, end, replacement lines) edits against the base document's lines
+LineDelta = tuple[tuple[int, int, tuple[str, ...]], ...]
+
+
+def make_delta(base: str, content: str) -> LineDelta:
+    """Line-level edits that turn base into content"""
+    # split("\n") rather than splitlines(): "\n".join restores trailing newlines and "\r" exactly
+    base_lines = base.split("\n")
+    new_lines = content.split("\n")
+    matcher = difflib.SequenceMatcher(None, base_lines, new_lines, autojunk=False)
+    return tuple(
+        (i1, i2, tuple(new_lines[j1:j2]))
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    )
+
+
+def apply_delta(base: str, delta: LineDelta) -> str:
+    """Rebuild content from its base and a delta produced by make_delta"""
+    base_lines = base.split("\n")
+    result = []
+    cursor = 0
+    for start, end, replacement in delta:
+        result.extend(base_lines[cursor:start])
+        result.extend(replacement)
+        cursor = end
+    result.extend(base_lines[cursor:])
+    return "\n".join(result)
+
+
+@dataclass(slots=True)
 class DocumentMetadata:
     """Track document versioning and history"""
-    content: str
     created_at: datetime
     last_modified: datetime
     version: int = 1
     word_count: int = 0
+    label: Optional[str] = None  # e.g. target company when several letters are kept
+    text: Optional[str] = None  # Full content, unless stored as a delta against base
+    base: Optional["DocumentMetadata"] = None
+    delta: Optional[LineDelta] = None
+    variant_group: Optional[str] = None  # Shared by sibling versions generated together
+    structure: Optional["StructuredDocument"] = None  # Sections/entries/bullets, rendered without guessing
+    previous: Optional["DocumentMetadata"] = None  # Version that was current when this one was created (undo target)
     
     def __post_init__(self):
         self.word_count = len(self.content.split())
+    
+    @property
+    def content(self) -> str:
+        if self.text is not None:
+            return self.text
+        return apply_delta(self.base.content, self.delta)
 
 
 class DocumentStore:
@@ -46,36 +117,90 @@ class DocumentStore:
     Encapsulated state management - no more globals!
     Supports versioning, history, and persistence
     """
+    __slots__ = ("_documents", "_history", "_bases")
+    
     def __init__(self):
         self._documents: dict[DocumentType, DocumentMetadata] = {}
-        self._history: list[tuple[DocumentType, str]] = []
+        self._history: list[tuple[DocumentType, DocumentMetadata]] = []
+        self._bases: dict[str, DocumentMetadata] = {}
     
-    def create(self, doc_type: DocumentType, content: str) -> DocumentMetadata:
-        """Create or update a document with versioning"""
+    def create(self, doc_type: DocumentType, content: str, label: Optional[str] = None,
+               base: Optional[DocumentMetadata] = None,
+               structure: Optional["StructuredDocument"] = None) -> DocumentMetadata:
+        """Create or update a document with versioning (stored as a delta when base is given)"""
         now = datetime.now()
+        storage = (
+            {"base": base, "delta": make_delta(base.content, content)}
+            if base is not None else {"text": intern_content(content)}
+        )
         
         if doc_type in self._documents:
             # Update existing document
             prev = self._documents[doc_type]
             metadata = DocumentMetadata(
-                content=content,
                 created_at=prev.created_at,
                 last_modified=now,
-                version=prev.version + 1
+                version=max(m.version for m in self.get_versions(doc_type)) + 1,
+                label=label,
+                structure=structure,
+                previous=prev,
+                **storage
             )
         else:
             # Create new document
             metadata = DocumentMetadata(
-                content=content,
                 created_at=now,
-                last_modified=now
+                last_modified=now,
+                label=label,
+                structure=structure,
+                **storage
             )
         
         self._documents[doc_type] = metadata
-        self._history.append((doc_type, content))
+        self._history.append((doc_type, metadata))
         logger.info(f"Created/updated {doc_type.value} v{metadata.version}")
         return metadata
     
+    def create_variants(self, doc_type: DocumentType, contents: list[str], labels: list[Optional[str]],
+                        structures: Optional[list[Optional["StructuredDocument"]]] = None) -> list[DocumentMetadata]:
+        """Store sibling versions generated together; the first becomes current until one is selected"""
+        if not contents:
+            return []
+        
+        previous = self._documents.get(doc_type)
+        group = f"{doc_type.value}-{len(self._history)}"
+        variants = []
+        for content, label, structure in zip(contents, labels, structures or [None] * len(contents)):
+            metadata = self.create(doc_type, content, label=label, structure=structure)
+            metadata.variant_group = group
+            metadata.previous = previous  # Undoing any sibling undoes the whole batch
+            variants.append(metadata)
+        
+        self._documents[doc_type] = variants[0]
+        logger.info(f"Created {len(variants)} {doc_type.value} variants after v{previous.version if previous else 0}")
+        return variants
+    
+    def select_version(self, doc_type: DocumentType, version: int) -> Optional[DocumentMetadata]:
+        """Make a stored version (e.g. one of several variants) the current one"""
+        for metadata in self.get_versions(doc_type):
+            if metadata.version == version:
+                self._documents[doc_type] = metadata
+                logger.info(f"Selected {doc_type.value} v{version}")
+                return metadata
+        return None
+    
+    def set_base(self, key: str, content: str) -> DocumentMetadata:
+        """Store a canonical base document (e.g. one per candidate profile) for later deltas"""
+        now = datetime.now()
+        metadata = DocumentMetadata(created_at=now, last_modified=now, label="base", text=intern_content(content))
+        self._bases[key] = metadata
+        logger.info(f"Stored base document {key[:8]}")
+        return metadata
+    
+    def get_base(self, key: str) -> Optional[DocumentMetadata]:
+        """Retrieve a base document by key if one was stored"""
+        return self._bases.get(key)
+    
     def get(self, doc_type: DocumentType) -> Optional[DocumentMetadata]:
         """Retrieve document if exists"""
         return self._documents.get(doc_type)
@@ -86,17 +211,80 @@ class DocumentStore:
     
     def get_history(self, doc_type: DocumentType) -> list[str]:
         """Get version history for a document"""
-        return [content for dt, content in self._history if dt == doc_type]
+        return [metadata.content for dt, metadata in self._history if dt == doc_type]
+    
+    def get_versions(self, doc_type: DocumentType) -> list[DocumentMetadata]:
+        """Get metadata for every stored version of a document, oldest first"""
+        return [metadata for dt, metadata in self._history if dt == doc_type]
+    
+    def undo(self, doc_type: DocumentType) -> Optional[DocumentMetadata]:
+        """
+        Drop the current version (or its whole variant batch) and restore the version that was
+        current before it was created (None if there is none)
+        """
+        current = self._documents.get(doc_type)
+        if current is None:
+            return None
+        versions = self.get_versions(doc_type)
+        group = current.variant_group
+        removed = {id(m) for m in versions if m.variant_group == group} if group else {id(current)}
+        stored = {id(m) for m in versions} - removed
+        
+        try:
+            restore = current.previous
+        except AttributeError:  # Pickled before versions recorded their predecessor
+            earlier = [m for m in versions if m.version < current.version and id(m) in stored]
+            restore = earlier[-1] if earlier else None
+        # Skip versions that an earlier undo already dropped
+        while restore is not None and id(restore) not in stored:
+            restore = getattr(restore, "previous", None)
+        if restore is None:
+            return None
+        
+        self._history = [(dt, m) for dt, m in self._history if id(m) not in removed]
+        self._documents[doc_type] = restore
+        logger.info(f"Reverted {doc_type.value} v{current.version} → v{restore.version} ({len(removed)} version(s) dropped)")
+        return restore
     
     def clear(self):
         """Reset all documents"""
         self._documents.clear()
         self._history.clear()
-
-    def save_to_docx(content: str, filepath: Path, doc_type: DocumentType):
+        self._bases.clear()
+    
+    @staticmethod
+    def iter_docx_chunks(content: str, doc_type: DocumentType, chunk_size: int = 64 * 1024,
+                         structure: Optional["StructuredDocument"] = None) -> Iterator[bytes]:
+        """Rendered DOCX as chunks for a streamed response, without touching disk"""
+        data = DocumentStore.render_docx(content, doc_type, structure)
+        for offset in range(0, len(data), chunk_size):
+            yield data[offset:offset + chunk_size]
+    
+    @staticmethod
+    def save_to_docx(content: str, filepath: Path, doc_type: DocumentType,
+                     structure: Optional["StructuredDocument"] = None):
+        """Render in memory and write atomically, so a crash never leaves a truncated file"""
+        atomic_write_bytes(filepath, DocumentStore.render_docx(content, doc_type, structure))
+        logger.info(f"Saved DOCX to {filepath}")
+    
+    @staticmethod
+    async def asave_to_docx(content: str, filepath: Path, doc_type: DocumentType,
+                            structure: Optional["StructuredDocument"] = None):
+        """save_to_docx with rendering and the write both kept off the event loop"""
+        data = await asyncio.to_thread(DocumentStore.render_docx, content, doc_type, structure)
+        await atomic_write_bytes_async(filepath, data)
+        logger.info(f"Saved DOCX to {filepath}")
+    
+    @staticmethod
+    def render_docx(content: str, doc_type: DocumentType, structure: Optional["StructuredDocument"] = None) -> bytes:
         """
-        Save document content to a formatted DOCX file with proper heading styles
+        Render document content to formatted DOCX bytes with proper heading styles.
+        With a structure the layout comes from it; otherwise headings are detected line by line.
         """
+        if structure is not None:
+            from helper.structured_document import render_structured_docx
+            return render_structured_docx(structure, doc_type)
+        
         doc = Document()
         
         # Set margins (1 inch on all sides)
@@ -174,6 +362,7 @@ class DocumentStore:
                 if line_stripped.startswith('•') or line_stripped.startswith('-'):
                     paragraph.style = 'List Bullet'
         
-        # Save the document
-        doc.save(str(filepath))
-        logger.info(f"Saved DOCX to {filepath}")
+        # Serialize in memory; callers decide whether bytes go to disk or a stream
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
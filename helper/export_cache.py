@@ -0,0 +1,359 @@
+"""
+Content-addressed export archive.
+
+Each export is keyed by a hash of (content, document type, renderer version)
+and written to a sharded path, so no directory grows without bound:
+
+    sessions/<hash prefix of session id>/<session id>/<date>/<doc>_v<version>_<key>.docx
+    shared/<date>/<key prefix>/<doc>_v<version>_<key>.docx   (exports outside a session)
+
+A SQLite manifest in the output directory records every file written, so
+lookups, listings and retention never list directories. Saving an unchanged
+document returns the session's existing file, or hardlinks (or copies) another
+session's identical file into this session's shard, instead of rendering it
+again; each session owns its files, so one session's retention never deletes
+another's exports. Old versions are pruned by a RetentionPolicy, either on
+demand or from a background thread.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from helper.document_helper import DOCX_RENDERER_VERSION, DocumentStore, DocumentType
+from helper.file_io import atomic_writer, safe_filename
+from helper.structured_document import StructuredDocument
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_FILENAME = ".manifest.sqlite3"
+LEGACY_INDEX_FILENAME = ".export_index.json"  # Flat-layout index, imported once into the manifest
+SHARED_SESSION = ""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exports (
+    path TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    session TEXT NOT NULL,
+    doc_type TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS exports_key ON exports (key);
+CREATE INDEX IF NOT EXISTS exports_session ON exports (session, doc_type, created_at);
+CREATE INDEX IF NOT EXISTS exports_age ON exports (created_at);
+"""
+
+
+def export_key(content: str, doc_type: DocumentType, renderer_version: int = DOCX_RENDERER_VERSION,
+               structure: Optional[StructuredDocument] = None) -> str:
+    """Stable hash identifying one rendered export"""
+    digest = hashlib.sha256()
+    digest.update(f"{doc_type.value}\0{renderer_version}\0".encode("utf-8"))
+    digest.update(content.encode("utf-8"))
+    if structure is not None:  # Same text, different renderer
+        digest.update(b"\0structured\0" + structure.model_dump_json().encode("utf-8"))
+    return digest.hexdigest()
+
+
+def shard_path(key: str, doc_type: DocumentType, version: int, session: Optional[str] = None,
+               when: Optional[float] = None) -> Path:
+    """Relative path of an export in the sharded layout"""
+    day = datetime.fromtimestamp(when or time.time()).strftime("%Y-%m-%d")
+    filename = f"{doc_type.value}_v{version}_{key[:12]}.docx"
+    if not session:
+        return Path("shared", day, key[:2], filename)
+    prefix = hashlib.sha1(session.encode("utf-8")).hexdigest()[:2]
+    return Path("sessions", prefix, safe_filename(session, "session"), day, filename)
+
+
+@dataclass
+class ExportRecord:
+    """One file in the manifest"""
+    path: Path
+    key: str
+    session: str
+    doc_type: DocumentType
+    version: int
+    size: int
+    created_at: float
+
+
+@dataclass
+class RetentionPolicy:
+    """Exports older than max_age_days are deleted, except the newest keep_latest per session and document type"""
+    max_age_days: Optional[float] = 30.0
+    keep_latest: int = 3
+
+
+class ExportCache:
+    """Sharded export archive with a manifest index kept next to the exported files"""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.manifest_path = self.output_dir / MANIFEST_FILENAME
+        self._conn: Optional[sqlite3.Connection] = None  # Opened on first use
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.manifest_path), timeout=30, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._import_legacy_index()
+        return self._conn
+
+    def _import_legacy_index(self):
+        """Adopt files listed in the old flat-layout JSON index"""
+        legacy = self.output_dir / LEGACY_INDEX_FILENAME
+        try:
+            index = json.loads(legacy.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable export index {legacy}: {e}")
+            return
+        rows = []
+        for key, filename in index.items():
+            path = self.output_dir / filename
+            match = re.match(r"(resume|cover_letter)_.*_v(\d+)\.docx$", path.name)
+            if match and path.exists():
+                stat = path.stat()
+                rows.append((filename, key, SHARED_SESSION, match.group(1), int(match.group(2)), stat.st_size, stat.st_mtime))
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO exports VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        legacy.unlink()
+        logger.info(f"Imported {len(rows)} exports from {legacy.name} into the manifest")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _row_to_record(self, row: sqlite3.Row) -> ExportRecord:
+        return ExportRecord(
+            path=self.output_dir / row["path"],
+            key=row["key"],
+            session=row["session"],
+            doc_type=DocumentType(row["doc_type"]),
+            version=row["version"],
+            size=row["size"],
+            created_at=row["created_at"],
+        )
+
+    def _existing(self, key: str, session: Optional[str] = None) -> Optional[tuple[Path, str]]:
+        """
+        (path, owning session) of the newest file with this key that is still on disk, preferring
+        the given session's own files; rows for deleted files are dropped
+        """
+        db = self._db()
+        rows = db.execute(
+            "SELECT path, session FROM exports WHERE key = ? ORDER BY session = ? DESC, created_at DESC",
+            (key, session or SHARED_SESSION)
+        ).fetchall()
+        for row in rows:
+            path = self.output_dir / row["path"]
+            if path.exists():
+                return path, row["session"]
+            with db:
+                db.execute("DELETE FROM exports WHERE path = ?", (row["path"],))
+        return None
+
+    def _record(self, path: Path, key: str, session: Optional[str], doc_type: DocumentType, version: int):
+        db = self._db()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO exports VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path.relative_to(self.output_dir).as_posix(), key, session or SHARED_SESSION, doc_type.value,
+                 version, path.stat().st_size, time.time())
+            )
+
+    def lookup(self, content: str, doc_type: DocumentType, structure: Optional[StructuredDocument] = None,
+               session: Optional[str] = None) -> Optional[Path]:
+        """Existing export of exactly this content (the session's own if it has one), if it is still on disk"""
+        with self._lock:
+            existing = self._existing(export_key(content, doc_type, structure=structure), session)
+        return existing[0] if existing else None
+
+    def _reuse(self, key: str, doc_type: DocumentType, version: int, session: Optional[str],
+               link: bool) -> Optional[Path]:
+        """Manifest half of an export: the reusable file (adopted into this session's shard), or None on a miss"""
+        filepath = self.output_dir / shard_path(key, doc_type, version, session)
+        with self._lock:
+            existing = self._existing(key, session)
+            if existing is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if existing is None:
+            return None
+
+        path, owner = existing
+        if owner == (session or SHARED_SESSION) or path == filepath:
+            logger.info(f"Export cache hit for {doc_type.value} → {path}")
+            return path
+        self._adopt(path, filepath, link)
+        self._record_locked(filepath, key, session, doc_type, version)
+        logger.info(f"Export cache hit for {doc_type.value}, {owner}'s {path.name} → {filepath}")
+        return filepath
+
+    def _record_locked(self, path: Path, key: str, session: Optional[str], doc_type: DocumentType, version: int):
+        with self._lock:
+            self._record(path, key, session, doc_type, version)
+
+    def export(self, content: str, doc_type: DocumentType, version: int, session: Optional[str] = None,
+               link: bool = True, structure: Optional[StructuredDocument] = None) -> tuple[Path, bool]:
+        """
+        Return (path, reused). The session's own identical file is returned as is; another
+        session's is hardlinked (link=True) or copied into this session's shard under this
+        version; otherwise the document is rendered, outside the lock.
+        """
+        key = export_key(content, doc_type, structure=structure)
+        reused = self._reuse(key, doc_type, version, session, link)
+        if reused is not None:
+            return reused, True
+        filepath = self.output_dir / shard_path(key, doc_type, version, session)
+        DocumentStore.save_to_docx(content, filepath, doc_type, structure)
+        self._record_locked(filepath, key, session, doc_type, version)
+        return filepath, False
+
+    async def aexport(self, content: str, doc_type: DocumentType, version: int, session: Optional[str] = None,
+                      link: bool = True, structure: Optional[StructuredDocument] = None) -> tuple[Path, bool]:
+        """export for async callers: manifest, file and render work all run off the event loop"""
+        key = export_key(content, doc_type, structure=structure)
+        reused = await asyncio.to_thread(self._reuse, key, doc_type, version, session, link)
+        if reused is not None:
+            return reused, True
+        filepath = self.output_dir / shard_path(key, doc_type, version, session)
+        await DocumentStore.asave_to_docx(content, filepath, doc_type, structure)
+        await asyncio.to_thread(self._record_locked, filepath, key, session, doc_type, version)
+        return filepath, False
+
+    @staticmethod
+    def _adopt(source: Path, filepath: Path, link: bool):
+        """Hardlink source to filepath, or copy it when linking is off or fails (e.g. across devices)"""
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        if link:
+            try:
+                filepath.unlink(missing_ok=True)
+                os.link(source, filepath)
+                return
+            except OSError as e:
+                logger.warning(f"Hardlink failed ({e}); copying {source}")
+        with open(source, "rb") as src, atomic_writer(filepath) as dst:
+            shutil.copyfileobj(src, dst)
+
+    def history(self, session: Optional[str] = None, doc_type: Optional[DocumentType] = None,
+                limit: int = 50) -> list[ExportRecord]:
+        """Newest exports of one session (or of shared exports), without listing directories"""
+        query = "SELECT * FROM exports WHERE session = ?"
+        params: list = [session or SHARED_SESSION]
+        if doc_type is not None:
+            query += " AND doc_type = ?"
+            params.append(doc_type.value)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [self._row_to_record(row) for row in self._db().execute(query, params)]
+
+    def _remove(self, relative: str):
+        """Delete a file and any shard directories it leaves empty"""
+        path = self.output_dir / relative
+        path.unlink(missing_ok=True)
+        parent = path.parent
+        while parent != self.output_dir:
+            try:
+                parent.rmdir()
+            except OSError:
+                break  # Not empty
+            parent = parent.parent
+
+    def prune(self, policy: Optional[RetentionPolicy] = None, batch_size: int = 500) -> int:
+        """
+        With a policy, delete expired exports (keeping the newest keep_latest per session and type);
+        without one, drop manifest entries whose files were deleted. Returns how many were removed.
+        """
+        with self._lock:
+            db = self._db()
+            if policy is None:
+                stale = [row["path"] for row in db.execute("SELECT path FROM exports")
+                         if not (self.output_dir / row["path"]).exists()]
+                with db:
+                    db.executemany("DELETE FROM exports WHERE path = ?", [(path,) for path in stale])
+                return len(stale)
+            if policy.max_age_days is None:
+                return 0
+
+            removed = 0
+            cutoff = time.time() - policy.max_age_days * 86400
+            while True:
+                # Only expired rows are ranked within their group, so the scan stays on the indexes
+                rows = db.execute(
+                    """
+                    SELECT path FROM (
+                        SELECT e.path, e.created_at, (
+                            SELECT COUNT(*) FROM exports n
+                            WHERE n.session = e.session AND n.doc_type = e.doc_type AND n.created_at > e.created_at
+                        ) AS newer
+                        FROM exports e WHERE e.created_at < ?
+                    ) WHERE newer >= ? ORDER BY created_at LIMIT ?
+                    """,
+                    (cutoff, policy.keep_latest, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                paths = [row["path"] for row in rows]
+                for path in paths:
+                    self._remove(path)
+                with db:
+                    db.executemany("DELETE FROM exports WHERE path = ?", [(path,) for path in paths])
+                removed += len(paths)
+        if removed:
+            logger.info(f"Pruned {removed} expired exports from {self.output_dir}")
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            row = self._db().execute("SELECT COUNT(*) AS files, COALESCE(SUM(size), 0) AS bytes FROM exports").fetchone()
+        return {"files": row["files"], "bytes": row["bytes"], "hits": self.hits, "misses": self.misses}
+
+
+def run_retention(output_dir: Path, policy: RetentionPolicy, interval: float, stop: threading.Event):
+    """Prune output_dir every interval seconds until stop is set"""
+    archive = ExportCache(output_dir)
+    try:
+        while not stop.is_set():
+            try:
+                archive.prune(policy)
+            except Exception as e:
+                logger.error(f"Retention pass failed: {e}")
+            stop.wait(interval)
+    finally:
+        archive.close()
+
+
+def start_retention(output_dir: Path, policy: RetentionPolicy, interval: float = 3600.0) -> threading.Event:
+    """Run retention in a daemon thread; set the returned event to stop it"""
+    stop = threading.Event()
+    threading.Thread(
+        target=run_retention, args=(output_dir, policy, interval, stop), name="export-retention", daemon=True
+    ).start()
+    logger.info(f"Export retention started for {output_dir}: {policy}")
+    return stop
@@ -0,0 +1,186 @@
+"""
+Local fact-consistency checks for generated documents.
+
+Entities in the generated text (years, phone numbers, emails, URLs, employers,
+degrees and hard skills) are compared against the candidate's own inputs.
+Contact details and skill-list items can be fixed in place; everything else is
+reported per section so only the affected section needs to be regenerated.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional
+
+from helper.job_description import KNOWN_SKILLS, tokenize
+from helper.resume_sections import HEADER, is_bullet, replace_sections, split_sections
+
+# Skills that are also everyday words or soft skills; too ambiguous to flag
+_AMBIGUOUS_SKILLS = {
+    "c", "r", "go", "rest", "api", "apis", "git", "excel", "communication", "leadership", "management",
+    "negotiation", "analytics", "accounting", "marketing", "agile", "scrum", "kanban", "devops", "express",
+    "spring", "sql", "llm", "nlp",
+}
+_SKILL_ALIASES = {"golang": "go", "powerbi": "power-bi", "postgres": "postgresql", "k8s": "kubernetes"}
+CHECKED_SKILLS = frozenset(KNOWN_SKILLS - _AMBIGUOUS_SKILLS)
+
+_DEGREE_LEVELS = {
+    "bachelor": {"bachelor", "bachelors", "b.s", "bs", "bsc", "b.sc", "b.a", "ba", "a.b", "ab", "b.eng", "beng"},
+    "master": {"master", "masters", "m.s", "ms", "msc", "m.sc", "m.a", "ma", "mba", "m.eng", "meng"},
+    "doctorate": {"phd", "ph.d", "doctorate", "doctoral"},
+    "associate": {"associate", "associates"},
+}
+
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_URL = re.compile(r"(?:https?://)?(?:www\.)?(?:[\w-]+\.)+(?:com|io|dev|net|org|me|co|app)(?:/[^\s|,;)]*)?", re.IGNORECASE)
+_PHONE = re.compile(r"(?<!\w)(\+?\(?\d[\d\s().-]{7,}\d)(?!\w)")
+_COMPANY_NOISE = {"inc", "corp", "corporation", "ltd", "llc", "co", "company", "the", "group", "and"}
+
+
+@dataclass
+class FactIssue:
+    """One entity in the output that the inputs do not support"""
+    kind: str  # year, phone, email, url, skill, employer, degree
+    value: str
+    section: str  # Heading of the section it appears in ('' for the header or a letter body)
+    fixable: bool = False
+
+
+@dataclass
+class FactReport:
+    text: str  # Output with every fixable issue already fixed
+    issues: list[FactIssue] = field(default_factory=list)
+
+    @property
+    def unresolved(self) -> list[FactIssue]:
+        return [issue for issue in self.issues if not issue.fixable]
+
+    def by_section(self) -> dict[str, list[FactIssue]]:
+        grouped: dict[str, list[FactIssue]] = {}
+        for issue in self.unresolved:
+            grouped.setdefault(issue.section, []).append(issue)
+        return grouped
+
+
+def _norm_url(url: str) -> str:
+    return re.sub(r"^(?:https?://)?(?:www\.)?", "", url.lower()).rstrip("/.")
+
+
+def _digits(text: str) -> str:
+    return re.sub(r"\D", "", text)
+
+
+def _skill(token: str) -> str:
+    return _SKILL_ALIASES.get(token, token)
+
+
+def _degree_levels(text: str) -> set[str]:
+    tokens = set(tokenize(text))
+    return {level for level, words in _DEGREE_LEVELS.items() if tokens & words}
+
+
+def _section_issues(heading: str, body: str, source_text: str, source_tokens: set[str],
+                    source_skills: set[str], allowed_years: set[str], education_source: str) -> list[FactIssue]:
+    issues = []
+    for year in sorted(set(_YEAR.findall(body)) - allowed_years):
+        issues.append(FactIssue("year", year, heading))
+
+    for skill in sorted({_skill(t) for t in tokenize(body)} & CHECKED_SKILLS - source_skills):
+        # Inside the skills list an invented item can simply be dropped
+        issues.append(FactIssue("skill", skill, heading, fixable="SKILL" in heading))
+
+    if "EXPERIENCE" in heading:
+        for line in body.splitlines():
+            if "|" in line and not is_bullet(line):
+                company = line.split("|")[0].strip()
+                words = {t for t in tokenize(company) if t not in _COMPANY_NOISE and len(t) > 1}
+                if words and not words & source_tokens:
+                    issues.append(FactIssue("employer", company, heading))
+
+    if "EDUCATION" in heading:
+        for level in sorted(_degree_levels(body) - _degree_levels(education_source)):
+            issues.append(FactIssue("degree", level, heading))
+    return issues
+
+
+def _fix_contacts(text: str, sources: dict[str, str], source_text: str, issues: list[FactIssue]) -> str:
+    """Replace or drop phone numbers, emails and URLs that are not in the inputs"""
+    source_urls = {_norm_url(url) for url in _URL.findall(source_text)}
+    source_digits = _digits(source_text)
+    phone = (sources.get("phone") or "").strip()
+
+    def fix_phone(match: re.Match) -> str:
+        value = match.group(1)
+        digits = _digits(value)
+        if len(digits) < 10 or digits[-7:] in source_digits:
+            return match.group(0)
+        issues.append(FactIssue("phone", value.strip(), HEADER, fixable=True))
+        return match.group(0).replace(value, phone) if phone else ""
+
+    def fix_email(match: re.Match) -> str:
+        if match.group(0).lower() in source_text.lower():
+            return match.group(0)
+        issues.append(FactIssue("email", match.group(0), HEADER, fixable=True))
+        return ""
+
+    def fix_url(match: re.Match) -> str:
+        url = match.group(0)
+        normalized = _norm_url(url)
+        if "@" in url or normalized in source_urls or any(normalized in src for src in source_urls):
+            return url
+        issues.append(FactIssue("url", url, HEADER, fixable=True))
+        if "linkedin" in normalized and sources.get("linkedin_url"):
+            return sources["linkedin_url"]
+        return ""
+
+    text = _PHONE.sub(fix_phone, text)
+    text = _EMAIL.sub(fix_email, text)
+    text = _URL.sub(lambda m: m.group(0) if "@" in text[max(m.start() - 1, 0):m.start()] else fix_url(m), text)
+    # Separators left dangling by removed values, e.g. 'Engineer | | linkedin...'
+    return re.sub(r"(?:\s*\|\s*){2,}", " | ", text).replace(" | \n", "\n").rstrip(" |")
+
+
+def _drop_skills(body: str, skills: set[str]) -> str:
+    """Remove invented items from a comma-separated skills list"""
+    lines = []
+    for line in body.splitlines():
+        prefix, sep, rest = line.rpartition(":") if ":" in line else ("", "", line)
+        items = [item for item in rest.split(",") if not {_skill(t) for t in tokenize(item)} & skills]
+        if items:
+            lines.append(f"{prefix}{sep}{','.join(items)}".strip())
+    return "\n".join(lines)
+
+
+def check_facts(text: str, sources: dict[str, Optional[str]], job_description: str = "",
+                sectioned: bool = True, allow_job_skills: bool = False) -> FactReport:
+    """
+    Compare text against the inputs it was generated from; fixable issues are fixed in report.text.
+    Resumes are checked per section; letters (sectioned=False) may name the posting's skills.
+    """
+    sources = {name: value for name, value in sources.items() if value}
+    source_text = "\n".join(sources.values())
+    source_tokens = set(tokenize(source_text))
+    source_skills = {_skill(t) for t in source_tokens}
+    if allow_job_skills:
+        source_skills |= {_skill(t) for t in tokenize(job_description)}
+    # Dates may legitimately come from the posting (e.g. a start date) or be today's date in a letter
+    allowed_years = set(_YEAR.findall(source_text + "\n" + job_description)) | {str(date.today().year)}
+
+    issues: list[FactIssue] = []
+    text = _fix_contacts(text, sources, source_text, issues)
+
+    sections = split_sections(text) if sectioned else [(HEADER, text)]
+    replacements = {}
+    for heading, body in sections:
+        section_issues = _section_issues(
+            heading, body, source_text, source_tokens, source_skills, allowed_years, sources.get("education", "")
+        )
+        invented_skills = {issue.value for issue in section_issues if issue.kind == "skill" and issue.fixable}
+        if invented_skills:
+            replacements[heading] = _drop_skills(body, invented_skills)
+        issues.extend(section_issues)
+
+    if replacements:
+        text = replace_sections(text, replacements)
+    return FactReport(text, issues)
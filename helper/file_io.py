@@ -0,0 +1,54 @@
+"""
+Atomic file writes.
+
+Data is written to a temp file in the destination directory and moved into
+place with os.replace, so readers never see a partially written file. The
+async variant runs the blocking work in a thread to keep the event loop free;
+atomic_writer does the same for output that is streamed in pieces.
+safe_filename turns user-supplied names (session ids, candidates) into a single
+path component.
+"""
+
+import asyncio
+import contextlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+# mkstemp creates files as 0600; read the process umask once so outputs get normal permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def safe_filename(name: str, default: str = "documents") -> str:
+    """name as one path component: no separators, no leading dots, at most 100 characters"""
+    return re.sub(r"[^\w.-]", "_", name).strip("._")[:100] or default
+
+
+@contextlib.contextmanager
+def atomic_writer(path: Path) -> Iterator[BinaryIO]:
+    """Binary file that replaces path only when the block exits without an error"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Write data to path via temp file + rename, creating the parent directory if needed"""
+    with atomic_writer(path) as f:
+        f.write(data)
+
+
+async def atomic_write_bytes_async(path: Path, data: bytes):
+    """atomic_write_bytes off the event loop"""
+    await asyncio.to_thread(atomic_write_bytes, path, data)
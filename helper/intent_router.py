@@ -0,0 +1,138 @@
+"""
+Local intent router for Drafter.
+
+Short commands that name a document ("preview my resume", "save both", "undo the
+last change to my resume", "compare v1 and v3") are mapped straight to tool calls
+so they never reach the LLM. A message is routed only when the whole of it is one
+of the command forms below; anything else (questions, negations, free-form
+content, other file formats) falls back to the model.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from helper.document_helper import DocumentStore, DocumentType
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RoutedIntent:
+    """A tool call resolved locally without the model"""
+    tool_name: str
+    args: dict = field(default_factory=dict)
+
+
+_POLITE = r"(?:please |can you |could you )?"
+_THANKS = r"(?: please| thanks| thank you)?"
+_NOUN = r"(?:resume|cv|cover ?letter|letter|documents?|files?)"
+_DOC = rf"(?:(?:my|the|current|both|all) )*(?:{_NOUN}|both|all|everything)"
+_DOCS = rf"{_DOC}(?: and {_DOC})?"
+_VERSION = r"v\d+|version \d+"
+
+# A message must match one of these completely, from the imperative verb to the document noun
+_COMMANDS: list[tuple[str, re.Pattern]] = [
+    ("compare_versions", re.compile(
+        rf"{_POLITE}(?:compare|diff) (?:(?:{_DOC}) )?(?:the )?(?:versions|revisions|(?:{_VERSION})(?: (?:and|with|to|vs) (?:{_VERSION}))?)"
+        rf"(?: of {_DOC})?{_THANKS}"
+        rf"|{_POLITE}(?:compare|diff) {_DOC}(?: versions| revisions)?{_THANKS}"
+        rf"|(?:show (?:me )?|tell me )?what (?:has |have |did you )?chang(?:e|ed)(?: in {_DOC})?"
+    )),
+    ("show_version_history", re.compile(
+        rf"{_POLITE}(?:(?:show|list|view)(?: me)? )?(?:the )?(?:version history|versions|revisions) (?:of |for )?{_DOC}{_THANKS}"
+        rf"|{_POLITE}(?:show|list|view)(?: me)? {_DOC} (?:version history|versions|history|revisions){_THANKS}"
+    )),
+    # Destructive: only the explicit form naming the document, never a bare "undo"
+    ("undo_last_change", re.compile(
+        rf"{_POLITE}(?:undo|revert|roll ?back)(?: the)?(?: last| latest)?(?: change| edit)?(?: to| on| in| of)? {_DOC}{_THANKS}"
+    )),
+    ("save_documents", re.compile(
+        rf"{_POLITE}(?:save|export|download) {_DOCS}(?: (?:as|to) (?:docx|word))?{_THANKS}"
+    )),
+    ("preview_document", re.compile(
+        rf"{_POLITE}(?:preview|show|view|display)(?: me)? {_DOCS}{_THANKS}"
+    )),
+]
+
+_RESUME_PATTERN = re.compile(r"\b(resume|cv)\b")
+_COVER_LETTER_PATTERN = re.compile(r"\b(cover ?letter|letter)\b")
+_BOTH_PATTERN = re.compile(r"\b(both|all|everything|documents|files)\b")
+_VERSION_PATTERN = re.compile(r"\b(?:v|version )(\d+)\b")
+
+# "don't save yet", "no, do not save", "never mind" are never commands
+_NEGATION_PATTERN = re.compile(r"\b(don t|dont|do not|does not|doesn t|no|not|never|nevermind|stop|cancel|wait)\b")
+
+
+class IntentRouter:
+    """Regex router in front of the model for cheap, deterministic commands"""
+
+    def __init__(self, document_store: DocumentStore, max_words: int = 10):
+        self.document_store = document_store
+        self.max_words = max_words
+
+    def route(self, user_input: str) -> Optional[list[RoutedIntent]]:
+        """Return the tool calls for a command, or None if the model should decide"""
+        text = " ".join(re.sub(r"[^\w\s]", " ", user_input.lower()).split())
+        if not text or len(text.split()) > self.max_words or _NEGATION_PATTERN.search(text):
+            return None
+
+        actions = [name for name, pattern in _COMMANDS if pattern.fullmatch(text)]
+        if not actions:
+            return None
+        action = actions[0]  # Patterns are ordered so that e.g. "show resume versions" is history, not preview
+        targets = self._resolve_targets(text)
+
+        if action == "compare_versions":
+            return self._compare(text, targets)
+
+        if action == "save_documents":
+            if targets is None or len(targets) > 1:
+                return self._routed(user_input, [RoutedIntent("save_documents", {"document_types": None})])
+            return self._routed(user_input, [RoutedIntent("save_documents", {"document_types": [targets[0].value]})])
+
+        if targets is None:
+            targets = self._existing_types()
+            if len(targets) != 1:
+                return None
+
+        if len(targets) > 1 and action != "preview_document":
+            return None
+
+        return self._routed(user_input, [RoutedIntent(action, {"document_type": dt.value}) for dt in targets])
+
+    def _compare(self, text: str, targets: Optional[list[DocumentType]]) -> Optional[list[RoutedIntent]]:
+        """compare_versions for the named document, or the one edited last; 'v1 and v3' picks versions"""
+        if targets is None:
+            existing = self._existing_types()
+            targets = [max(existing, key=lambda dt: self.document_store.get(dt).last_modified)] if existing else []
+        versions = [int(number) for number in _VERSION_PATTERN.findall(text)]
+        if len(targets) != 1:
+            return None
+        args = {"document_type": targets[0].value}
+        if len(versions) == 2:
+            args.update(old_version=min(versions), new_version=max(versions))
+        elif versions:
+            args["old_version"] = versions[0]
+        return self._routed(text, [RoutedIntent("compare_versions", args)])
+
+    @staticmethod
+    def _routed(user_input: str, intents: list[RoutedIntent]) -> list[RoutedIntent]:
+        logger.info(f"Fast path routed '{user_input}' → {[(i.tool_name, i.args) for i in intents]}")
+        return intents
+
+    def _resolve_targets(self, text: str) -> Optional[list[DocumentType]]:
+        """Document types named in the message (None if none named)"""
+        if _BOTH_PATTERN.search(text):
+            return self._existing_types() or None
+
+        targets = []
+        if _RESUME_PATTERN.search(text):
+            targets.append(DocumentType.RESUME)
+        if _COVER_LETTER_PATTERN.search(text):
+            targets.append(DocumentType.COVER_LETTER)
+        return targets or None
+
+    def _existing_types(self) -> list[DocumentType]:
+        return [dt for dt in DocumentType if self.document_store.exists(dt)]
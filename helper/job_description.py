@@ -0,0 +1,260 @@
+"""
+Local job description preprocessing.
+
+Job postings are mostly boilerplate (benefits, EEO statements, company blurbs).
+This module strips that out and extracts the title, company, requirements,
+skills and RAKE-style keywords so prompts only carry a compact summary.
+Everything runs locally and results are cached per posting hash.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either etc few for from further had
+has have having he her here hers how i if in into is it its itself just may me might more most must my no
+nor not of off on once only or other our ours out over own per plus same she should so some such than that
+the their them then there these they this those through to too under until up upon us very via was we were
+what when where which while who whom why will with within without would you your yours
+able ability across work working role team teams position candidate candidates ideal including include
+strong excellent good great new using use used well one two three years year plus etc looking join
+requirements requirement responsibilities qualifications preferred skills skill
+""".split())
+
+# Lines that never carry requirements worth prompting with
+_BOILERPLATE_PATTERN = re.compile(
+    r"equal opportunity|affirmative action|without regard to|race, color|sexual orientation|"
+    r"veteran status|reasonable accommodation|background check|e-?verify|"
+    r"\b(benefits|perks|401\(?k\)?|paid time off|pto|dental|vision insurance|health insurance)\b|"
+    r"apply now|click apply|to apply|privacy (policy|notice)|recruitment agenc",
+    re.IGNORECASE
+)
+
+_REQUIREMENT_CUES = re.compile(
+    r"\b(required|requirements?|must|should have|proficien\w*|experience (in|with)|knowledge of|"
+    r"familiar\w*|expertise|degree|bachelor|master|years?|skills?|qualifications?|understanding of|"
+    r"hands-on|background in|certif\w*)\b",
+    re.IGNORECASE
+)
+
+_TITLE_PATTERN = re.compile(r"^\s*(?:job\s+title|title|position|role)\s*[:\-]\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+_COMPANY_PATTERN = re.compile(r"^\s*(?:company|employer|organization)\s*[:\-]\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+# "About Acme:" names the company; "About us" / "About the role" do not (the name itself must be capitalized)
+_ABOUT_PATTERN = re.compile(
+    r"^\s*(?i:about)\s+(?!(?i:us|you|the|this|our|me)\b)([A-Z][\w&.\- ]{1,40}?)\s*:?\s*$", re.MULTILINE
+)
+
+# Phrases postings use and candidates describing themselves don't
+_POSTING_CUES = re.compile(
+    r"\b(we are|we're|you will|you'll|your role|responsibilities|requirements|qualifications|"
+    r"ideal candidate|what you|about the (?:role|job|position|team)|job (?:title|description)|"
+    r"apply|benefits|we offer|join (?:our|us))\b",
+    re.IGNORECASE
+)
+_FIRST_PERSON = re.compile(r"\b(i|i'm|i've|my|me)\b", re.IGNORECASE)
+
+# Tokens keep tech punctuation: c++, c#, node.js, .net, ci/cd
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./\-]*[a-z0-9+#]|[a-z0-9]|\.[a-z]+")
+_PHRASE_SPLIT = re.compile(r"[,;:()\[\]!?\n•·|]|\.\s|\s[-–—]\s")
+
+KNOWN_SKILLS = frozenset("""
+python java javascript typescript c c++ c# go golang rust ruby php scala kotlin swift r sql nosql bash
+html css react angular vue node.js django flask fastapi spring .net express next.js
+aws azure gcp docker kubernetes terraform ansible jenkins ci/cd git linux unix
+postgresql mysql mongodb redis elasticsearch kafka spark hadoop airflow snowflake
+pandas numpy tensorflow pytorch scikit-learn llm nlp
+excel tableau power-bi powerbi salesforce sap jira figma photoshop
+agile scrum kanban devops microservices rest graphql api apis
+communication leadership management negotiation analytics accounting marketing seo
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens that keep common tech punctuation (c++, node.js, ci/cd)"""
+    return _TOKEN_PATTERN.findall(text.lower().replace("'s ", " ").replace("’s ", " "))
+
+
+def normalize_posting(text: str) -> str:
+    """Collapse whitespace so trivially different copies share a hash"""
+    return "\n".join(" ".join(line.split()) for line in text.strip().splitlines() if line.strip())
+
+
+def posting_hash(text: str) -> str:
+    return hashlib.sha256(normalize_posting(text).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class JobDigest:
+    """Compact, structured view of a job posting"""
+    posting_hash: str
+    title: Optional[str]
+    company: Optional[str]
+    requirements: tuple[str, ...]
+    skills: tuple[str, ...]
+    keywords: tuple[str, ...]
+    original_length: int
+
+    def to_prompt(self) -> str:
+        """Render the digest as the compact text block used in prompts"""
+        parts = []
+        if self.title:
+            parts.append(f"Title: {self.title}")
+        if self.company:
+            parts.append(f"Company: {self.company}")
+        if self.skills:
+            parts.append(f"Skills: {', '.join(self.skills)}")
+        if self.keywords:
+            parts.append(f"Keywords: {', '.join(self.keywords)}")
+        if self.requirements:
+            parts.append("Requirements:\n" + "\n".join(f"- {req}" for req in self.requirements))
+        return "\n".join(parts)
+
+
+def strip_boilerplate(text: str) -> list[str]:
+    """Return posting lines with boilerplate and duplicate lines removed"""
+    seen = set()
+    lines = []
+    for line in normalize_posting(text).splitlines():
+        line = line.strip(" \t-*•·")
+        key = line.lower()
+        if not line or key in seen or _BOILERPLATE_PATTERN.search(line):
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+
+def extract_keywords(text: str, top_n: int = 15) -> list[str]:
+    """RAKE-style keyphrases: split at stopwords/punctuation, score words by degree/frequency"""
+    phrases = []
+    for chunk in _PHRASE_SPLIT.split(text.lower()):
+        current = []
+        for token in tokenize(chunk):
+            if token in STOPWORDS or not any(ch.isalpha() for ch in token):
+                if current:
+                    phrases.append(tuple(current))
+                current = []
+            else:
+                current.append(token)
+        if current:
+            phrases.append(tuple(current))
+
+    # Overly long runs are sentences the splitter missed, not keyphrases
+    phrases = [p for p in phrases if len(p) <= 4]
+
+    frequency: dict[str, int] = {}
+    degree: dict[str, int] = {}
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] = frequency.get(word, 0) + 1
+            degree[word] = degree.get(word, 0) + len(phrase) - 1
+
+    phrase_scores: dict[str, float] = {}
+    for phrase in phrases:
+        key = " ".join(phrase)
+        score = sum((degree[w] + frequency[w]) / frequency[w] for w in phrase)
+        # Repeated phrases matter more than one-off ones
+        phrase_scores[key] = phrase_scores.get(key, 0.0) + score
+
+    ranked = sorted(phrase_scores.items(), key=lambda item: (-item[1], item[0]))
+    return [phrase for phrase, _ in ranked[:top_n]]
+
+
+def extract_skills(text: str) -> list[str]:
+    """Known skill terms in order of first appearance"""
+    skills = []
+    for token in tokenize(text):
+        if token in KNOWN_SKILLS and token not in skills:
+            skills.append(token)
+    return skills
+
+
+def _extract_title(text: str, lines: list[str]) -> Optional[str]:
+    match = _TITLE_PATTERN.search(text)
+    if match:
+        return match.group(1).strip()
+    # Postings usually open with the title on its own short line
+    if lines and len(lines[0].split()) <= 8 and not lines[0].endswith("."):
+        return lines[0]
+    return None
+
+
+def _extract_company(text: str) -> Optional[str]:
+    for pattern in (_COMPANY_PATTERN, _ABOUT_PATTERN):
+        match = pattern.search(text)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+_CACHE: "OrderedDict[str, JobDigest]" = OrderedDict()
+_CACHE_SIZE = 512
+_CACHE_LOCK = threading.Lock()  # Digests are built from speculative and section-parallel worker threads
+
+
+def preprocess_job_description(text: str, max_requirements: int = 12) -> JobDigest:
+    """Build (or fetch from cache) the compact digest of a job posting"""
+    key = posting_hash(text)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+        if cached is not None:
+            _CACHE.move_to_end(key)
+            return cached
+
+    lines = strip_boilerplate(text)
+    body = "\n".join(lines)
+
+    requirements = []
+    for line in lines:
+        # Lines ending in ":" are section headers like "Requirements:"
+        if _REQUIREMENT_CUES.search(line) and not line.endswith(":") and len(line) <= 220:
+            requirements.append(line.rstrip("."))
+        if len(requirements) >= max_requirements:
+            break
+
+    digest = JobDigest(
+        posting_hash=key,
+        title=_extract_title(text, lines),
+        company=_extract_company(text),
+        requirements=tuple(requirements),
+        skills=tuple(extract_skills(body)),
+        keywords=tuple(extract_keywords(body)),
+        original_length=len(text)
+    )
+
+    with _CACHE_LOCK:
+        _CACHE[key] = digest
+        if len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+
+    logger.info(f"Preprocessed job description {key[:8]}: {len(text)} → {len(digest.to_prompt())} chars")
+    return digest
+
+
+def looks_like_job_description(text: str) -> bool:
+    """Long text written like a posting (posting phrases, requirement lines), not the candidate describing themselves"""
+    if len(text) < 300:
+        return False
+    cues = len(_POSTING_CUES.findall(text))
+    return (
+        cues >= 2
+        and len(_FIRST_PERSON.findall(text)) <= cues
+        and len(preprocess_job_description(text).requirements) >= 2
+    )
+
+
+def compact_job_description(text: str) -> str:
+    """Prompt-ready job description: the digest, or the original if that is already shorter"""
+    if not text:
+        return text
+    compact = preprocess_job_description(text).to_prompt()
+    return compact if compact and len(compact) < len(text) else text
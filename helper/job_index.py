@@ -0,0 +1,189 @@
+"""
+Local job posting store with an inverted index.
+
+Postings are indexed over title, company and requirements with precomputed
+BM25 impacts. Posting lists are kept impact-ordered in NumPy arrays, so a query
+only touches the strongest candidates per term and stays sub-millisecond at
+hundreds of thousands of postings. An optional embedding index (local
+sentence-transformers model) can rerank the lexical candidates.
+"""
+
+import json
+import math
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from helper.job_description import STOPWORDS, tokenize
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class JobPosting:
+    """A job the candidate could apply to"""
+    posting_id: str
+    title: str
+    company: str
+    requirements: str = ""
+    description: str = ""
+    url: Optional[str] = None
+
+    def as_job_description(self) -> str:
+        """Plain-text posting suitable for the resume/cover letter prompts"""
+        parts = [self.title, f"Company: {self.company}", self.requirements, self.description]
+        return "\n".join(part for part in parts if part)
+
+
+def _index_terms(text: str) -> list[str]:
+    return [token for token in tokenize(text) if token not in STOPWORDS and any(c.isalpha() for c in token)]
+
+
+def load_embedding_encoder(model_name: str = "all-MiniLM-L6-v2") -> Optional[Callable[[list[str]], np.ndarray]]:
+    """Local sentence-transformers encoder, or None if the package or model isn't available"""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        logger.info("sentence-transformers not installed; embedding index disabled")
+        return None
+    try:
+        model = SentenceTransformer(model_name)
+    except Exception as e:
+        logger.warning(f"Could not load embedding model {model_name} ({e}); using lexical ranking only")
+        return None
+    return lambda texts: model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+
+
+class JobIndex:
+    """Inverted index over job postings, queryable by free text or candidate profile"""
+
+    FIELD_WEIGHTS = {"title": 3.0, "company": 1.0, "requirements": 1.5}
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, encoder: Optional[Callable[[list[str]], np.ndarray]] = None,
+                 candidates_per_term: int = 2000):
+        self.encoder = encoder
+        self.candidates_per_term = candidates_per_term
+        self._postings: list[JobPosting] = []
+        self._positions: dict[str, int] = {}
+        self._term_freqs: list[dict[str, float]] = []
+        self._doc_lengths: list[float] = []
+        # term -> (doc ids, impacts), both sorted by impact descending
+        self._inverted: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._embeddings: Optional[np.ndarray] = None
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def get(self, posting_id: str) -> Optional[JobPosting]:
+        position = self._positions.get(posting_id)
+        return self._postings[position] if position is not None else None
+
+    def add(self, posting: JobPosting):
+        """Add or replace a posting; the index is rebuilt lazily on the next query"""
+        term_freqs: dict[str, float] = {}
+        for field_name, weight in self.FIELD_WEIGHTS.items():
+            for term in _index_terms(getattr(posting, field_name)):
+                term_freqs[term] = term_freqs.get(term, 0.0) + weight
+
+        position = self._positions.get(posting.posting_id)
+        if position is None:
+            self._positions[posting.posting_id] = len(self._postings)
+            self._postings.append(posting)
+            self._term_freqs.append(term_freqs)
+            self._doc_lengths.append(sum(term_freqs.values()))
+        else:
+            self._postings[position] = posting
+            self._term_freqs[position] = term_freqs
+            self._doc_lengths[position] = sum(term_freqs.values())
+        self._dirty = True
+
+    def add_many(self, postings: Iterable[JobPosting]):
+        for posting in postings:
+            self.add(posting)
+
+    def _build(self):
+        """Precompute BM25 impacts and impact-ordered posting lists"""
+        n_docs = len(self._postings)
+        avg_length = (sum(self._doc_lengths) / n_docs) if n_docs else 0.0
+
+        lists: dict[str, tuple[list[int], list[float]]] = {}
+        for doc_id, term_freqs in enumerate(self._term_freqs):
+            norm = self.K1 * (1 - self.B + self.B * self._doc_lengths[doc_id] / avg_length) if avg_length else self.K1
+            for term, tf in term_freqs.items():
+                ids, impacts = lists.setdefault(term, ([], []))
+                ids.append(doc_id)
+                impacts.append(tf * (self.K1 + 1) / (tf + norm))
+
+        self._inverted = {}
+        for term, (ids, impacts) in lists.items():
+            idf = math.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+            ids_array = np.asarray(ids, dtype=np.int32)
+            impact_array = np.asarray(impacts, dtype=np.float32) * idf
+            order = np.argsort(-impact_array, kind="stable")
+            self._inverted[term] = (ids_array[order], impact_array[order])
+
+        if self.encoder is not None and n_docs:
+            self._embeddings = np.asarray(
+                self.encoder([f"{p.title}. {p.requirements}" for p in self._postings]), dtype=np.float32
+            )
+
+        self._dirty = False
+        logger.info(f"Built job index: {n_docs} postings, {len(self._inverted)} terms")
+
+    def search(self, query: str, top_k: int = 10, rerank: bool = False) -> list[tuple[JobPosting, float]]:
+        """Top-K postings for a free-text query, optionally reranked by embedding similarity"""
+        if self._dirty:
+            self._build()
+
+        ids_parts, impact_parts = [], []
+        for term, query_weight in Counter(_index_terms(query)).items():
+            entry = self._inverted.get(term)
+            if entry is not None:
+                ids_parts.append(entry[0][:self.candidates_per_term])
+                impact_parts.append(entry[1][:self.candidates_per_term] * query_weight)
+        if not ids_parts:
+            return []
+
+        unique_ids, inverse = np.unique(np.concatenate(ids_parts), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(impact_parts))
+
+        if rerank and self._embeddings is not None:
+            query_vector = np.asarray(self.encoder([query]), dtype=np.float32)[0]
+            shortlist = np.argsort(-scores, kind="stable")[:max(top_k * 10, 50)]
+            unique_ids, scores = unique_ids[shortlist], self._embeddings[unique_ids[shortlist]] @ query_vector
+
+        k = min(top_k, len(unique_ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._postings[unique_ids[i]], float(scores[i])) for i in top]
+
+    def search_profile(self, profile: dict, top_k: int = 10, rerank: bool = False) -> list[tuple[JobPosting, float]]:
+        """Top-K postings for a candidate profile (title and skills weigh most)"""
+        title = profile.get("title") or ""
+        # Title terms are repeated so they outweigh incidental summary words
+        query = " ".join([title, title, profile.get("skills") or "", profile.get("summary") or ""])
+        return self.search(query, top_k=top_k, rerank=rerank)
+
+    def save(self, path: Path):
+        """Persist postings as JSON lines (the index itself is rebuilt on load)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            for posting in self._postings:
+                f.write(json.dumps(asdict(posting), ensure_ascii=False) + "\n")
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "JobIndex":
+        """Load postings from a JSON lines file written by save()"""
+        index = cls(**kwargs)
+        with Path(path).open(encoding="utf-8") as f:
+            index.add_many(JobPosting(**json.loads(line)) for line in f if line.strip())
+        logger.info(f"Loaded {len(index)} postings from {path}")
+        return index
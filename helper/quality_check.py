@@ -0,0 +1,69 @@
+"""
+Local quality checks for generated documents.
+
+Cheap structural checks (no model calls) used by the generation cascade: a
+draft from the fast model is kept only when none of these find a problem,
+otherwise the document is regenerated on the stronger model.
+"""
+
+import re
+from typing import Optional
+
+from helper.resume_sections import get_section, parse_sections_reply, split_sections
+
+RESUME_SECTIONS = ("SUMMARY", "EXPERIENCE", "EDUCATION", "SKILLS")
+TAILORED_SECTIONS = ("SUMMARY", "SKILLS")
+
+_PLACEHOLDER = re.compile(r"\[(?:your|company|name|date|title|phone|insert|hiring)[^\]]*\]", re.IGNORECASE)
+_REFUSAL = re.compile(r"\b(as an ai|i cannot|i can't|i'm sorry|i am sorry)\b", re.IGNORECASE)
+
+
+def _mentions_first_name(content: str, name: Optional[str]) -> bool:
+    parts = (name or "").split()
+    return not parts or parts[0].casefold() in content.casefold()
+
+
+def _common_issues(content: str, min_words: int) -> list[str]:
+    issues = []
+    words = len(content.split())
+    if words < min_words:
+        issues.append(f"too short ({words} words)")
+    if _PLACEHOLDER.search(content):
+        issues.append("unfilled placeholder")
+    if _REFUSAL.search(content):
+        issues.append("refusal or meta commentary")
+    if content.rstrip() and content.rstrip()[-1] in ",;:-(":
+        issues.append("ends mid-sentence")
+    return issues
+
+
+def resume_issues(content: str, name: Optional[str] = None, phone: Optional[str] = None) -> list[str]:
+    """Problems that make a resume draft unusable; empty when it looks complete"""
+    issues = _common_issues(content, min_words=120)
+    sections = split_sections(content)
+    missing = [heading for heading in RESUME_SECTIONS if not get_section(sections, heading).strip()]
+    if missing:
+        issues.append(f"missing sections: {', '.join(missing)}")
+    if not _mentions_first_name(content, name):
+        issues.append("candidate name missing")
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) >= 7 and digits[-7:] not in re.sub(r"\D", "", content):
+        issues.append("phone number missing")
+    return issues
+
+
+def tailoring_issues(reply: str) -> list[str]:
+    """Problems with a SUMMARY/SKILLS tailoring reply"""
+    found = parse_sections_reply(reply, TAILORED_SECTIONS)
+    missing = [heading for heading in TAILORED_SECTIONS if not found.get(heading, "").strip()]
+    return [f"missing sections: {', '.join(missing)}"] if missing else []
+
+
+def cover_letter_issues(content: str, name: Optional[str] = None, company: Optional[str] = None) -> list[str]:
+    """Problems that make a cover letter draft unusable; empty when it looks complete"""
+    issues = _common_issues(content, min_words=150)
+    if company and company.casefold() not in content.casefold():
+        issues.append("company not mentioned")
+    if not _mentions_first_name(content, name):
+        issues.append("no signature with the candidate's name")
+    return issues
@@ -0,0 +1,138 @@
+"""
+Semantic cache for recurring chat turns.
+
+Generic questions ("what do you need from me?", "which tones are there?") get
+the same answer from the model whenever the conversation is in the same state.
+Replies are cached per state fingerprint (phase, missing profile fields) and
+matched on the user's message by cosine similarity of a hashed character
+n-gram sketch, or of a local embedding model when one is supplied. Only
+text-only replies to short, personal-data-free messages are cached.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+
+from helper.logger_config import get_logger
+from helper.speculative import extract_contact_fields
+
+logger = get_logger(__name__)
+
+SKETCH_DIMS = 512
+MAX_CACHEABLE_CHARS = 160
+_DIGITS = re.compile(r"\d{3,}")
+_QUESTION = re.compile(
+    r"^(?:what|which|how|can|could|do|does|is|are|will|should|why|when|where|who|hi|hello|hey|help)\b|\?$",
+    re.IGNORECASE,
+)
+
+
+def ngram_sketch(text: str, n: int = 3, dims: int = SKETCH_DIMS) -> np.ndarray:
+    """Unit vector of hashed character n-gram counts (word-boundary padded, case/punctuation folded)"""
+    normalized = " ".join(re.sub(r"[^\w\s]", " ", text.casefold()).split())
+    vector = np.zeros(dims, dtype=np.float32)
+    for word in normalized.split():
+        padded = f" {word} "
+        for i in range(max(len(padded) - n + 1, 1)):
+            digest = hashlib.blake2b(padded[i:i + n].encode("utf-8"), digest_size=4).digest()
+            vector[int.from_bytes(digest, "little") % dims] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def is_cacheable_message(text: str) -> bool:
+    """Short questions or greetings without names, numbers or contact details, i.e. nothing about one user"""
+    words = text.split()
+    return (
+        0 < len(text) <= MAX_CACHEABLE_CHARS
+        and bool(_QUESTION.search(text.strip()))
+        and not any(word[0].isupper() and word != "I" and not word.startswith("I'") for word in words[1:])
+        and not extract_contact_fields(text)
+        and not _DIGITS.search(text)
+        and "@" not in text
+    )
+
+
+def is_cacheable_reply(reply: str, user_context: dict) -> bool:
+    """Replies that don't echo anything the user told us"""
+    lowered = reply.casefold()
+    return bool(reply.strip()) and not any(
+        isinstance(value, str) and len(value) > 2 and value.casefold() in lowered
+        for value in user_context.values()
+    ) and not any(
+        part.casefold() in lowered
+        for part in str(user_context.get("name", "")).split() if len(part) > 2
+    )
+
+
+@dataclass
+class _Entry:
+    state: Hashable
+    message: str
+    vector: np.ndarray
+    reply: str
+
+
+class SemanticResponseCache:
+    """LRU of (state, message) → reply with similarity lookup inside each state"""
+
+    def __init__(self, threshold: float = 0.9, max_entries: int = 2048,
+                 encoder: Optional[Callable[[list[str]], np.ndarray]] = None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.encoder = encoder
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._by_state: dict[Hashable, list[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _embed(self, text: str) -> np.ndarray:
+        if self.encoder is not None:
+            return np.asarray(self.encoder([text])[0], dtype=np.float32)
+        return ngram_sketch(text)
+
+    def lookup(self, state: Hashable, message: str) -> Optional[str]:
+        """Cached reply for the most similar message in this state, if similar enough"""
+        vector = self._embed(message)
+        with self._lock:
+            ids = self._by_state.get(state)
+            if ids:
+                similarities = np.stack([self._entries[i].vector for i in ids]) @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    entry_id = ids[best]
+                    self._entries.move_to_end(entry_id)
+                    self.hits += 1
+                    logger.info(f"Response cache hit ({similarities[best]:.2f}) for '{message[:40]}'")
+                    return self._entries[entry_id].reply
+            self.misses += 1
+            return None
+
+    def store(self, state: Hashable, message: str, reply: str):
+        vector = self._embed(message)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _Entry(state, message, vector, reply)
+            self._by_state.setdefault(state, []).append(entry_id)
+            while len(self._entries) > self.max_entries:
+                old_id, old = self._entries.popitem(last=False)
+                bucket = self._by_state[old.state]
+                bucket.remove(old_id)
+                if not bucket:
+                    del self._by_state[old.state]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0}
@@ -0,0 +1,209 @@
+"""
+Import an existing resume (DOCX, TXT/MD or PDF) into a candidate profile.
+
+Files are read as a stream of lines: DOCX paragraphs come from an incremental
+parse of word/document.xml, text files line by line and PDFs page by page,
+so large uploads never need to be held in memory at once. Lines are sorted
+into the profile fields used by create_resume by their section headings.
+"""
+
+import re
+import zipfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from xml.etree import ElementTree
+
+from helper.logger_config import get_logger
+from helper.resume_sections import is_section_heading
+from helper.speculative import PROFILE_FIELDS, extract_contact_fields
+
+logger = get_logger(__name__)
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Heading keywords → profile field (first match wins, so more specific keywords come first)
+SECTION_FIELDS = (
+    ("CERTIFICATION", "certifications"),
+    ("LICENSE", "certifications"),
+    ("SUMMARY", "summary"),
+    ("PROFILE", "summary"),
+    ("OBJECTIVE", "summary"),
+    ("ABOUT", "summary"),
+    ("EXPERIENCE", "experience"),
+    ("EMPLOYMENT", "experience"),
+    ("WORK HISTORY", "experience"),
+    ("PROJECT", "experience"),
+    ("EDUCATION", "education"),
+    ("SKILL", "skills"),
+    ("TECHNOLOGIES", "skills"),
+    ("PORTFOLIO", "portfolio"),
+)
+
+SUPPORTED_SUFFIXES = (".docx", ".txt", ".md", ".pdf")
+
+
+@dataclass
+class ImportedProfile:
+    """Profile fields recovered from an existing resume"""
+    name: str = ""
+    title: str = ""
+    phone: str = ""
+    linkedin_url: str = ""
+    portfolio: str = ""
+    summary: str = ""
+    experience: str = ""
+    education: str = ""
+    skills: str = ""
+    certifications: str = ""
+
+    def as_profile(self) -> dict[str, str]:
+        """Non-empty fields, ready to merge into user_context or pass to create_resume"""
+        return {key: value for key, value in asdict(self).items() if value}
+
+    def missing(self) -> list[str]:
+        return [name for name in PROFILE_FIELDS + ("phone", "linkedin_url") if not getattr(self, name)]
+
+    def to_resume_text(self) -> str:
+        """The import in the plain-text layout generated resumes use, so it can serve as a base"""
+        header = " | ".join(part for part in (self.title, self.phone, self.linkedin_url, self.portfolio) if part)
+        blocks = ["\n".join(line for line in (self.name, header) if line)]
+        for heading, body in (("SUMMARY", self.summary), ("EXPERIENCE", self.experience),
+                              ("EDUCATION", self.education), ("SKILLS", self.skills),
+                              ("CERTIFICATIONS", self.certifications)):
+            if body:
+                blocks.append(f"{heading}\n{body}")
+        return "\n\n".join(blocks) + "\n"
+
+
+def _iter_docx_lines(path: Path) -> Iterator[str]:
+    """Paragraph texts from word/document.xml without building the whole tree"""
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as xml:
+        parts: list[str] = []
+        for event, element in ElementTree.iterparse(xml, events=("end",)):
+            if element.tag == f"{_WORD_NS}t":
+                parts.append(element.text or "")
+            elif element.tag == f"{_WORD_NS}tab":
+                parts.append("\t")
+            elif element.tag == f"{_WORD_NS}p":
+                yield "".join(parts)
+                parts.clear()
+                element.clear()  # Finished paragraphs are dropped as we go
+
+
+def _iter_text_lines(path: Path) -> Iterator[str]:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def _iter_pdf_lines(path: Path) -> Iterator[str]:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ValueError("PDF import needs the optional 'pypdf' package (pip install pypdf)")
+    for page in PdfReader(str(path)).pages:
+        yield from (page.extract_text() or "").splitlines()
+
+
+def iter_document_lines(path: Path) -> Iterator[str]:
+    """Lines of a resume file, read incrementally according to its type"""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".docx":
+        return _iter_docx_lines(path)
+    if suffix in (".txt", ".md"):
+        return _iter_text_lines(path)
+    if suffix == ".pdf":
+        return _iter_pdf_lines(path)
+    raise ValueError(f"Unsupported resume format '{suffix}'. Use one of: {', '.join(SUPPORTED_SUFFIXES)}")
+
+
+# Words that may accompany a keyword in a heading ("PROFESSIONAL EXPERIENCE", "Skills & Tools:", "## About Me")
+_HEADING_QUALIFIERS = frozenset({
+    "PROFESSIONAL", "RELEVANT", "TECHNICAL", "CORE", "KEY", "CAREER", "ACADEMIC", "SELECTED", "PERSONAL",
+    "ADDITIONAL", "OTHER", "RECENT", "ME", "OF", "AND", "&", "/", "TOOLS", "COMPETENCIES", "QUALIFICATIONS",
+    "TRAINING", "COURSEWORK", "LINKS", "SIDE",
+})
+_HEADING_KEYWORDS = frozenset(word for keyword, _ in SECTION_FIELDS for word in keyword.split())
+
+
+def _is_heading_word(word: str) -> bool:
+    return word in _HEADING_QUALIFIERS or word in _HEADING_KEYWORDS or word.rstrip("S") in _HEADING_KEYWORDS
+
+
+def _section_field(line: str) -> Optional[str]:
+    """
+    Profile field for a heading line ('SKILLS', 'Work Experience:', '## Education', '**Projects**'), else None.
+    Only ALL CAPS, colon-terminated or markdown headings count, and their words must all be section
+    keywords or qualifiers, so a 'Project Manager' title or an 'Education Program Manager' role stays content.
+    """
+    stripped = line.strip()
+    text = stripped.strip("#*").strip().rstrip(":").strip()
+    if not text or len(text.split()) > 4:
+        return None
+    marked = stripped.startswith("#") or (stripped.startswith("**") and stripped.endswith("**"))
+    if not (is_section_heading(text) or stripped.endswith(":") or marked):
+        return None
+    upper = text.upper()
+    words = upper.replace("&", " & ").replace("/", " / ").replace(",", " ").split()
+    if not all(_is_heading_word(word) for word in words):
+        return None
+    return next((field for keyword, field in SECTION_FIELDS if keyword in upper), None)
+
+
+def parse_resume_lines(lines: Iterable[str]) -> ImportedProfile:
+    """Sort resume lines into profile fields by section heading"""
+    profile = ImportedProfile()
+    header: list[str] = []
+    sections: dict[str, list[str]] = {}
+    current: Optional[str] = None
+
+    for raw in lines:
+        line = raw.rstrip()
+        field = _section_field(line)
+        if field:
+            current = field
+            sections.setdefault(field, [])
+        elif current is None:
+            if line.strip():
+                header.append(line.strip())
+        else:
+            sections[current].append(line)
+
+    contacts = extract_contact_fields("\n".join(header))
+    if header:
+        profile.name = header[0]
+    if len(header) > 1:
+        profile.title = header[1].split("|")[0].strip()
+        if extract_contact_fields(profile.title):
+            profile.title = ""
+    profile.phone = contacts.get("phone", "")
+    profile.linkedin_url = contacts.get("linkedin_url", "")
+    profile.portfolio = contacts.get("portfolio", "")
+
+    for field, body_lines in sections.items():
+        body = "\n".join(body_lines).strip("\n")
+        body = re.sub(r"\n{3,}", "\n\n", body)
+        if field == "portfolio":
+            profile.portfolio = profile.portfolio or extract_contact_fields(body).get("portfolio", body.strip())
+        else:
+            existing = getattr(profile, field)
+            setattr(profile, field, f"{existing}\n\n{body}".strip() if existing else body)
+
+    # Contact details sometimes sit at the bottom of the document instead of the header
+    if not (profile.phone and profile.linkedin_url):
+        found = extract_contact_fields("\n".join("\n".join(body) for body in sections.values()))
+        profile.phone = profile.phone or found.get("phone", "")
+        profile.linkedin_url = profile.linkedin_url or found.get("linkedin_url", "")
+    return profile
+
+
+def import_resume_file(path: Path) -> ImportedProfile:
+    """Parse a resume file into a profile"""
+    path = Path(path)
+    if not path.exists():
+        raise ValueError(f"File not found: {path}")
+    profile = parse_resume_lines(iter_document_lines(path))
+    logger.info(f"Imported resume {path.name}: {len(profile.as_profile())} fields, missing {profile.missing()}")
+    return profile
@@ -0,0 +1,112 @@
+"""
+Plain-text resume section helpers.
+
+Generated resumes follow the layout in the resume prompt: a header block,
+then ALL CAPS section headings (SUMMARY, EXPERIENCE, ...) separated by blank
+lines. These helpers split, replace and reorder those sections locally so
+tailoring passes only need the model for the parts that actually change.
+"""
+
+from typing import Iterable
+
+HEADER = ""  # Pseudo-heading for the lines before the first section
+
+_BULLET_PREFIXES = ("-", "•", "*")
+
+
+def is_section_heading(line: str) -> bool:
+    """ALL CAPS line of at most four words, e.g. 'WORK EXPERIENCE'"""
+    stripped = line.strip()
+    return (
+        bool(stripped)
+        and stripped.isupper()
+        and len(stripped.split()) <= 4
+        and not any(ch.isdigit() for ch in stripped)
+        and "@" not in stripped
+        and "|" not in stripped
+    )
+
+
+def split_sections(text: str) -> list[tuple[str, str]]:
+    """Split a resume into (heading, body) pairs in document order"""
+    sections: list[tuple[str, list[str]]] = [(HEADER, [])]
+    for line in text.splitlines():
+        if is_section_heading(line):
+            sections.append((line.strip(), []))
+        else:
+            sections[-1][1].append(line)
+
+    result = [(heading, "\n".join(lines).strip("\n")) for heading, lines in sections]
+    if result and result[0] == (HEADER, ""):
+        result = result[1:]
+    return result
+
+
+def join_sections(sections: Iterable[tuple[str, str]]) -> str:
+    """Inverse of split_sections, with one blank line between sections"""
+    blocks = []
+    for heading, body in sections:
+        blocks.append(f"{heading}\n{body}".strip("\n") if heading else body.strip("\n"))
+    return "\n\n".join(block for block in blocks if block) + "\n"
+
+
+def get_section(sections: list[tuple[str, str]], name: str) -> str:
+    """Body of the first section whose heading contains name (case-insensitive)"""
+    for heading, body in sections:
+        if name.upper() in heading:
+            return body
+    return ""
+
+
+def replace_sections(text: str, replacements: dict[str, str]) -> str:
+    """Swap section bodies by heading keyword; unknown keywords are ignored"""
+    sections = split_sections(text)
+    updated = []
+    for heading, body in sections:
+        for name, new_body in replacements.items():
+            if heading and name.upper() in heading and new_body.strip():
+                body = new_body.strip("\n")
+                break
+        updated.append((heading, body))
+    return join_sections(updated)
+
+
+def is_bullet(line: str) -> bool:
+    return line.strip().startswith(_BULLET_PREFIXES)
+
+
+def reorder_bullets(section_body: str, keywords: set[str], tokenize) -> str:
+    """Within each entry, move bullets that mention more target keywords to the top"""
+    lines = section_body.splitlines()
+    result: list[str] = []
+    run: list[str] = []
+
+    def flush():
+        scored = sorted(
+            enumerate(run),
+            key=lambda item: (-len(keywords.intersection(tokenize(item[1]))), item[0])
+        )
+        result.extend(line for _, line in scored)
+        run.clear()
+
+    for line in lines:
+        if is_bullet(line):
+            run.append(line)
+        else:
+            if run:
+                flush()
+            result.append(line)
+    if run:
+        flush()
+    return "\n".join(result)
+
+
+def parse_sections_reply(reply: str, names: Iterable[str]) -> dict[str, str]:
+    """Pull the requested sections out of a model reply that may include extra text"""
+    wanted = [name.upper() for name in names]
+    found = {}
+    for heading, body in split_sections(reply):
+        for name in wanted:
+            if heading and name in heading and name not in found:
+                found[name] = body
+    return found
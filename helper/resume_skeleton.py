@@ -0,0 +1,87 @@
+"""
+Deterministic resume skeleton.
+
+The header, education and certifications are formatted locally from the
+profile; only the prose sections (summary, experience entries, skills) need
+the model. This module splits the profile into those pieces and assembles the
+finished resume in the same layout the full-document prompt produces.
+"""
+
+import re
+from typing import Optional
+
+from helper.resume_sections import is_bullet, is_section_heading, join_sections
+
+_YEAR = re.compile(r"\b(19|20)\d{2}\b|\bpresent\b", re.IGNORECASE)
+
+
+def render_header(name: str, title: str, phone: str, linkedin_url: str, portfolio: Optional[str] = None) -> str:
+    """Name line followed by 'Title | Phone | LinkedIn | Portfolio'"""
+    contact = " | ".join(part.strip() for part in (title, phone, linkedin_url, portfolio or "") if part and part.strip())
+    return f"{name.strip()}\n{contact}"
+
+
+def _items(text: Optional[str]) -> list[str]:
+    """Non-empty lines (or ';'-separated items on a single line), without bullet markers"""
+    if not text:
+        return []
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if len(lines) == 1 and ";" in lines[0]:
+        lines = [part.strip() for part in lines[0].split(";") if part.strip()]
+    return [line.lstrip("-•* ").strip() for line in lines]
+
+
+def render_education(education: str) -> str:
+    """One line per degree, as given"""
+    return "\n".join(_items(education))
+
+
+def render_certifications(certifications: Optional[str]) -> str:
+    items = _items(certifications)
+    if len(items) == 1 and "," in items[0]:
+        items = [part.strip() for part in items[0].split(",") if part.strip()]
+    return "\n".join(items)
+
+
+def _is_entry_start(line: str) -> bool:
+    """A non-bullet line naming a role or company, e.g. 'Acme | Engineer | 2019-2023' or 'Engineer at Acme'"""
+    stripped = line.strip()
+    return bool(stripped) and not is_bullet(stripped) and (
+        "|" in stripped or " at " in stripped or bool(_YEAR.search(stripped))
+    )
+
+
+def split_experience_entries(experience: str) -> list[str]:
+    """Separate jobs in the candidate's free-text experience (blank lines, or one header line per job)"""
+    blocks = [block.strip() for block in re.split(r"\n\s*\n", experience.strip()) if block.strip()]
+    if len(blocks) > 1:
+        return blocks
+
+    entries: list[list[str]] = []
+    for line in experience.strip().splitlines():
+        if not entries or (_is_entry_start(line) and any(is_bullet(prev) for prev in entries[-1])):
+            entries.append([line])
+        else:
+            entries[-1].append(line)
+    return ["\n".join(entry).strip() for entry in entries if "".join(entry).strip()]
+
+
+def strip_heading(reply: str, heading: str) -> str:
+    """Drop a leading section heading the model added despite instructions"""
+    lines = reply.strip().splitlines()
+    if lines and is_section_heading(lines[0].rstrip(":")) and heading in lines[0].upper():
+        lines = lines[1:]
+    return "\n".join(lines).strip()
+
+
+def assemble_resume(header: str, summary: str, experience_entries: list[str], education: str,
+                    skills: str, certifications: str = "") -> str:
+    sections = [
+        ("", header),
+        ("SUMMARY", summary),
+        ("EXPERIENCE", "\n\n".join(entry.strip() for entry in experience_entries if entry.strip())),
+        ("EDUCATION", education),
+        ("SKILLS", skills),
+        ("CERTIFICATIONS", certifications),
+    ]
+    return join_sections((heading, body) for heading, body in sections if body.strip())
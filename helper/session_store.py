@@ -0,0 +1,178 @@
+"""
+Compact storage for many concurrent sessions.
+
+Only the most recently used sessions stay in memory; idle ones are spilled to
+disk as compressed pickles with their messages reduced to plain dicts, and are
+loaded back transparently on the next access.
+
+Run `python -m helper.session_store` for a memory benchmark over 10k idle sessions.
+"""
+
+import gc
+import pickle
+import re
+import tempfile
+import threading
+import tracemalloc
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, messages_from_dict, messages_to_dict
+
+from helper.document_helper import DocumentStore, DocumentType
+from helper.file_io import atomic_write_bytes
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class Session:
+    """Everything a conversation needs besides the shared config and graph"""
+    session_id: str
+    messages: list[BaseMessage] = field(default_factory=list)
+    user_context: dict = field(default_factory=dict)
+    document_store: DocumentStore = field(default_factory=DocumentStore)
+
+
+_SESSION_ID_PATTERN = re.compile(r"[\w.-]{1,100}")
+
+
+def check_session_id(session_id: str) -> str:
+    """Reject ids that would name a file outside the spill directory (separators, '..', empty)"""
+    if not isinstance(session_id, str) or not _SESSION_ID_PATTERN.fullmatch(session_id) or not session_id.strip("."):
+        raise ValueError(f"Invalid session id {session_id!r}: use up to 100 letters, digits, '.', '-' or '_'")
+    return session_id
+
+
+def _dump(session: Session) -> bytes:
+    payload = (session.session_id, messages_to_dict(session.messages), session.user_context, session.document_store)
+    return zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), level=1)
+
+
+def _load(data: bytes) -> Session:
+    session_id, messages, user_context, document_store = pickle.loads(zlib.decompress(data))
+    return Session(session_id, messages_from_dict(messages), user_context, document_store)
+
+
+class SessionStore:
+    """LRU of hot sessions in memory; everything else lives on disk"""
+
+    def __init__(self, spill_dir: Path, max_hot: int = 256):
+        self.spill_dir = Path(spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self.max_hot = max_hot
+        self._hot: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, session_id: str) -> Path:
+        return self.spill_dir / f"{check_session_id(session_id)}.session"
+
+    def __len__(self) -> int:
+        spilled = sum(1 for path in self.spill_dir.glob("*.session") if path.stem not in self._hot)
+        return len(self._hot) + spilled
+
+    def get(self, session_id: str) -> Session:
+        """Hot session, session loaded from disk, or a new empty session"""
+        with self._lock:
+            session = self._hot.get(session_id)
+            if session is not None:
+                self._hot.move_to_end(session_id)
+                return session
+
+            path = self._path(session_id)
+            session = _load(path.read_bytes()) if path.exists() else Session(session_id)
+            self._put(session)
+            return session
+
+    def peek(self, session_id: str) -> Optional[Session]:
+        """Session without making it hot, for read-only callers going through many sessions"""
+        with self._lock:
+            session = self._hot.get(session_id)
+        if session is not None:
+            return session
+        path = self._path(session_id)
+        return _load(path.read_bytes()) if path.exists() else None
+
+    def session_ids(self) -> list[str]:
+        """Every known session, hot or spilled"""
+        with self._lock:
+            hot = list(self._hot)
+        return hot + sorted(path.stem for path in self.spill_dir.glob("*.session") if path.stem not in hot)
+
+    def put(self, session: Session):
+        check_session_id(session.session_id)
+        with self._lock:
+            self._put(session)
+
+    def _put(self, session: Session):
+        self._hot[session.session_id] = session
+        self._hot.move_to_end(session.session_id)
+        while len(self._hot) > self.max_hot:
+            _, idle = self._hot.popitem(last=False)
+            self._spill(idle)
+
+    def _spill(self, session: Session):
+        """Write atomically so a crash never leaves a half-written session behind"""
+        atomic_write_bytes(self._path(session.session_id), _dump(session))
+
+    def flush(self):
+        """Spill every hot session (e.g. before shutdown)"""
+        with self._lock:
+            for session in self._hot.values():
+                self._spill(session)
+            self._hot.clear()
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._hot.pop(session_id, None)
+            self._path(session_id).unlink(missing_ok=True)
+
+
+def _sample_session(session_id: str) -> Session:
+    session = Session(session_id)
+    for turn in range(5):
+        session.messages.append(HumanMessage(content=f"Turn {turn}: I worked at Acme as an engineer from 2019 to 2023."))
+        session.messages.append(AIMessage(content="Thanks! What did you achieve there? Any numbers you can share?"))
+    session.user_context = {"name": f"Candidate {session_id}", "phone": "+63 917 123 4567"}
+    resume = "JANE DOE\nBackend Engineer\n\nSUMMARY\n" + "Built reliable services. " * 40
+    session.document_store.create(DocumentType.RESUME, resume)
+    session.document_store.create(DocumentType.RESUME, resume + "\nSKILLS\nPython, Go")
+    return session
+
+
+def benchmark_idle_sessions(n_sessions: int = 10_000, max_hot: int = 100,
+                            spill_dir: Optional[Path] = None) -> dict:
+    """Traced memory of n idle sessions held fully in memory vs. through a SessionStore"""
+    gc.collect()
+    tracemalloc.start()
+
+    in_memory = {str(i): _sample_session(str(i)) for i in range(n_sessions)}
+    all_in_memory, _ = tracemalloc.get_traced_memory()
+    del in_memory
+    gc.collect()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline, _ = tracemalloc.get_traced_memory()
+        store = SessionStore(spill_dir or Path(tmp), max_hot=max_hot)
+        for i in range(n_sessions):
+            store.put(_sample_session(str(i)))
+        gc.collect()
+        with_store, _ = tracemalloc.get_traced_memory()
+        spilled_bytes = sum(path.stat().st_size for path in store.spill_dir.glob("*.session"))
+    tracemalloc.stop()
+
+    return {
+        "sessions": n_sessions,
+        "max_hot": max_hot,
+        "in_memory_mb": round(all_in_memory / 1e6, 1),
+        "session_store_mb": round((with_store - baseline) / 1e6, 1),
+        "spilled_mb_on_disk": round(spilled_bytes / 1e6, 1),
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark_idle_sessions())
@@ -0,0 +1,200 @@
+"""
+Speculative document drafting.
+
+While the interview is still running, the profile is filled from the user's
+answers (the field the assistant just asked for, contact details, a pasted job
+posting) and drafts are started in the background as soon as it holds every
+required field. When the real tool call arrives, a draft made from the same
+inputs (short fields may be reworded slightly; longer ones must carry the same
+words) is committed instantly; anything else is cancelled, or its result
+discarded if it already started. A profile that gained information since a
+draft started (e.g. another job) restarts the draft. Drafts never touch the
+document store.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from helper.job_description import STOPWORDS
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_FIELDS = ("name", "title", "summary", "experience", "education", "skills")
+RESUME_REQUIRED = PROFILE_FIELDS + ("job_description", "phone", "linkedin_url")
+RESUME_OPTIONAL = ("portfolio", "certifications")
+COVER_LETTER_REQUIRED = PROFILE_FIELDS + ("job_title", "company")
+COVER_LETTER_OPTIONAL = ("tone",)
+
+_PHONE_PATTERN = re.compile(r"(?<!\w)(\+?\d[\d\s().-]{7,}\d)(?!\w)")
+_LINKEDIN_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/[^\s,;]+", re.IGNORECASE)
+_PORTFOLIO_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?(?:github\.com|gitlab\.com|behance\.net|[\w-]+\.dev)/?[^\s,;]*", re.IGNORECASE)
+
+
+def extract_contact_fields(text: str) -> dict[str, str]:
+    """Profile fields that can be recognized locally in a user message"""
+    fields = {}
+    linkedin = _LINKEDIN_PATTERN.search(text)
+    if linkedin:
+        fields["linkedin_url"] = linkedin.group(0)
+    portfolio = _PORTFOLIO_PATTERN.search(text)
+    if portfolio:
+        fields["portfolio"] = portfolio.group(0)
+    for match in _PHONE_PATTERN.finditer(text):
+        # Date ranges like "2019-2023" also match the pattern; phone numbers have 10+ digits
+        if sum(ch.isdigit() for ch in match.group(1)) >= 10:
+            fields["phone"] = match.group(1).strip()
+            break
+    return fields
+
+
+# Question keywords → the profile field the user's next answer fills
+_QUESTION_FIELDS = (
+    (re.compile(r"\bjob (?:description|posting|ad)\b", re.IGNORECASE), "job_description"),
+    (re.compile(r"\blinked ?in\b", re.IGNORECASE), "linkedin_url"),
+    (re.compile(r"\bphone\b", re.IGNORECASE), "phone"),
+    (re.compile(r"\bportfolio\b|\bgithub\b", re.IGNORECASE), "portfolio"),
+    (re.compile(r"\bcertifications?\b", re.IGNORECASE), "certifications"),
+    (re.compile(r"\b(?:full )?name\b", re.IGNORECASE), "name"),
+    (re.compile(r"\btitle\b", re.IGNORECASE), "title"),
+    (re.compile(r"\bsummary\b|\babout yourself\b", re.IGNORECASE), "summary"),
+    (re.compile(r"\b(?:work )?experience\b|\bwork history\b", re.IGNORECASE), "experience"),
+    (re.compile(r"\beducation\b|\bdegrees?\b", re.IGNORECASE), "education"),
+    (re.compile(r"\bskills\b", re.IGNORECASE), "skills"),
+)
+_LEAD_IN = re.compile(
+    r"^(?:sure|yes|ok(?:ay)?|of course)?[,.!\s]*(?:(?:my|the)(?: \w+){1,2} (?:is|are)|i'?m|i am|it'?s|it is)?[:\s]*(?:an? (?=\w))?",
+    re.IGNORECASE
+)
+
+
+def asked_field(question: str) -> Optional[str]:
+    """The one profile field the assistant's questions ask for, or None if they ask for none or several"""
+    questions = [sentence for sentence in re.split(r"(?<=[.?!])\s+|\n+", question) if sentence.strip().endswith("?")]
+    fields = {field for sentence in questions for pattern, field in _QUESTION_FIELDS if pattern.search(sentence)}
+    return fields.pop() if len(fields) == 1 else None
+
+
+def answer_fields(question: str, answer: str) -> dict[str, str]:
+    """Profile fields recognized in an interview answer: contact details, plus the field that was asked for"""
+    fields = extract_contact_fields(answer)
+    field = asked_field(question)
+    if field and field not in fields and answer.strip():
+        value = answer.strip()
+        if len(value.split()) <= 12:  # "My name is Jane Doe" → "Jane Doe"; longer answers are kept whole
+            value = _LEAD_IN.sub("", value, count=1).strip().rstrip(".") or value
+        fields[field] = value
+    return fields
+
+
+def _tokens(value) -> set[str]:
+    return set(re.findall(r"\w+", str(value or "").casefold())) - STOPWORDS
+
+
+def inputs_match(drafted: dict, requested: dict, min_overlap: float = 0.8, short_field: int = 8) -> bool:
+    """
+    Whether a draft made from drafted inputs can stand in for requested ones. Each field must be
+    empty in both, or share most words in both directions (short fields, which the model may
+    reword), or have the same words (longer fields, where a few new words can be a whole new job).
+    """
+    for key in drafted.keys() | requested.keys():
+        a, b = _tokens(drafted.get(key)), _tokens(requested.get(key))
+        if a == b:
+            continue
+        if not a or not b or max(len(a), len(b)) > short_field:
+            return False
+        if len(a & b) / max(len(a), len(b)) < min_overlap:
+            return False
+    return True
+
+
+def missing_fields(user_context: dict, required: tuple[str, ...]) -> list[str]:
+    return [name for name in required if not user_context.get(name)]
+
+
+def _fingerprint(inputs: dict) -> str:
+    normalized = {
+        key: " ".join(str(value).split()).casefold()
+        for key, value in inputs.items() if value not in (None, "")
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class SpeculativeDrafter:
+    """Background drafts keyed by document kind and a fingerprint of their inputs"""
+
+    def __init__(self, max_workers: int = 2, max_settled: int = 256):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative")
+        self._pending: dict[str, tuple[str, dict, Future]] = {}
+        # Fingerprints already turned into real documents, oldest first
+        self._settled: "OrderedDict[str, None]" = OrderedDict()
+        self.max_settled = max_settled
+        self._closed = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def start(self, kind: str, inputs: dict, draft: Callable[[], object]) -> bool:
+        """Start drafting unless a matching draft is already pending; replaces stale drafts"""
+        fingerprint = _fingerprint(inputs)
+        with self._lock:
+            pending = self._pending.get(kind)
+            if self._closed or fingerprint in self._settled or (pending and inputs_match(pending[1], inputs)):
+                return False
+            if pending:
+                pending[2].cancel()
+            self._pending[kind] = (fingerprint, dict(inputs), self._executor.submit(draft))
+        logger.info(f"Speculative {kind} draft started ({fingerprint[:8]})")
+        return True
+
+    def claim(self, kind: str, inputs: dict, timeout: Optional[float] = None):
+        """Result of a pending draft with matching inputs, or None (and cancel it) on mismatch"""
+        requested = _fingerprint(inputs)
+        with self._lock:
+            pending = self._pending.pop(kind, None)
+            self._settle(requested)
+            if pending is not None:
+                self._settle(pending[0])  # The interview inputs it was made from are settled too
+        if pending is None:
+            return None
+
+        fingerprint, drafted, future = pending
+        if fingerprint != requested and not inputs_match(drafted, inputs):
+            future.cancel()
+            self.misses += 1
+            logger.info(f"Speculative {kind} draft discarded (inputs changed)")
+            return None
+
+        try:
+            result = future.result(timeout=timeout)
+        except Exception as e:
+            self.misses += 1
+            logger.warning(f"Speculative {kind} draft failed, regenerating: {e}")
+            return None
+        self.hits += 1
+        logger.info(f"Speculative {kind} draft committed ({fingerprint[:8]})")
+        return result
+
+    def _settle(self, fingerprint: str):
+        self._settled[fingerprint] = None
+        self._settled.move_to_end(fingerprint)
+        while len(self._settled) > self.max_settled:
+            self._settled.popitem(last=False)
+
+    def cancel_all(self):
+        with self._lock:
+            for _, _, future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+
+    def shutdown(self):
+        """Cancel pending drafts and stop the workers; later start() calls are ignored"""
+        with self._lock:
+            self._closed = True
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
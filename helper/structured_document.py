@@ -0,0 +1,196 @@
+"""
+Structured documents: header lines, titled sections, paragraphs and entries with bullets.
+
+In structured mode the model returns this schema instead of free text. It is
+validated locally, turned into the plain-text layout every other tool works
+on (header block first, ALL CAPS headings, '- ' bullets, blank lines between
+blocks), and stored as is in the DocumentStore next to that text. Because the
+layout is produced by to_text, from_text reads it back exactly, so local edits
+to that text (fact fixes) keep a structure too. Exports render from the structure directly
+instead of guessing headings line by line.
+"""
+
+import io
+from typing import Optional
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Inches, Pt
+from pydantic import BaseModel, Field
+
+from helper.document_helper import DocumentType
+from helper.resume_sections import is_bullet, is_section_heading, split_sections
+
+class Entry(BaseModel):
+    """One job, project or degree with its bullet points"""
+    heading: str = Field(description="One line, e.g. 'Company | Role | 2019 – Present'")
+    bullets: list[str] = Field(default_factory=list, description="Achievements, without bullet characters")
+
+
+class Section(BaseModel):
+    title: str = Field(description="ALL CAPS section heading such as SUMMARY or EXPERIENCE; empty for a letter body")
+    paragraphs: list[str] = Field(default_factory=list, description="Plain paragraphs or lines, in order")
+    entries: list[Entry] = Field(default_factory=list, description="Entries with bullets, after the paragraphs")
+
+
+class StructuredDocument(BaseModel):
+    """A resume or cover letter as data rather than formatted text"""
+    header: list[str] = Field(description="Name first, then contact/title lines (letters: also date and recipient)")
+    sections: list[Section]
+
+
+def _clean(text: str) -> str:
+    return " ".join(text.split())
+
+
+def normalize_document(document: StructuredDocument) -> StructuredDocument:
+    """Canonical form: single-line fields, upper-case titles, no bullet characters, no empty items"""
+    sections = []
+    for section in document.sections:
+        entries = [
+            Entry(heading=_clean(entry.heading),
+                  bullets=[_clean(b).lstrip("-•* ").strip() for b in entry.bullets if _clean(b).lstrip("-•* ").strip()])
+            for entry in section.entries
+        ]
+        paragraphs = ["\n".join(_clean(line) for line in p.splitlines() if line.strip()) for p in section.paragraphs]
+        sections.append(Section(
+            title=_clean(section.title).rstrip(":").upper(),
+            paragraphs=[p for p in paragraphs if p],
+            entries=[entry for entry in entries if entry.heading or entry.bullets],
+        ))
+    return StructuredDocument(header=[_clean(line) for line in document.header if line.strip()], sections=sections)
+
+
+def validate_document(document: StructuredDocument, doc_type: DocumentType) -> list[str]:
+    """Problems that would make the document empty or not survive the text layout round trip"""
+    problems = []
+    if not document.header:
+        problems.append("header is empty (the candidate's name must come first)")
+    if not any(section.paragraphs or section.entries for section in document.sections):
+        problems.append("document has no content")
+
+    for section in document.sections:
+        if doc_type == DocumentType.RESUME and not is_section_heading(section.title):
+            problems.append(f"section title '{section.title}' must be an ALL CAPS heading of at most four words")
+        for paragraph in section.paragraphs if doc_type == DocumentType.RESUME else []:
+            if any(is_bullet(line) or is_section_heading(line) for line in paragraph.splitlines()):
+                problems.append(f"paragraph in {section.title or 'letter body'} contains a bullet or heading line")
+        for entry in section.entries:
+            if not entry.bullets:
+                problems.append(f"entry '{entry.heading}' has no bullets (use a paragraph instead)")
+            if is_bullet(entry.heading) or is_section_heading(entry.heading):
+                problems.append(f"entry heading '{entry.heading}' looks like a bullet or section heading")
+
+    if doc_type == DocumentType.COVER_LETTER and any(section.title for section in document.sections):
+        problems.append("cover letter sections must not have titles")
+    return problems
+
+
+def to_text(document: StructuredDocument) -> str:
+    """Plain-text layout shared with the rest of the pipeline"""
+    blocks = ["\n".join(document.header)]
+    for section in document.sections:
+        body = section.paragraphs + [
+            "\n".join(([entry.heading] if entry.heading else []) + [f"- {bullet}" for bullet in entry.bullets])
+            for entry in section.entries
+        ]
+        if section.title:
+            blocks.append(f"{section.title}\n" + "\n\n".join(body))
+        else:
+            blocks.extend(body)
+    return "\n\n".join(block for block in blocks if block.strip()) + "\n"
+
+
+def _parse_body(title: str, body: str) -> Section:
+    """Blank-line separated blocks; blocks with bullets become entries, the rest paragraphs"""
+    section = Section(title=title)
+    for block in [block for block in body.split("\n\n") if block.strip()]:
+        lines = [line.strip() for line in block.splitlines() if line.strip()]
+        if not any(is_bullet(line) for line in lines):
+            section.paragraphs.append("\n".join(lines))
+            continue
+        entry: Optional[Entry] = None
+        for line in lines:
+            if is_bullet(line):
+                if entry is None:
+                    entry = Entry(heading="")
+                    section.entries.append(entry)
+                entry.bullets.append(line.lstrip("-•* ").strip())
+            else:
+                if entry is not None and not entry.bullets:
+                    entry.heading = f"{entry.heading} {line}".strip()
+                    continue
+                entry = Entry(heading=line)
+                section.entries.append(entry)
+    return section
+
+
+def from_text(text: str, doc_type: DocumentType) -> StructuredDocument:
+    """Read the to_text layout back (exact for text that to_text produced)"""
+    if doc_type == DocumentType.COVER_LETTER:
+        blocks = [block.strip() for block in text.strip().split("\n\n") if block.strip()]
+        header = blocks[0].splitlines() if blocks else []
+        return StructuredDocument(header=header, sections=[Section(title="", paragraphs=blocks[1:])])
+
+    # The first block is always the header, even an ALL CAPS name that would pass for a section heading
+    first, _, rest = text.strip().partition("\n\n")
+    header = [line.strip() for line in first.splitlines() if line.strip()]
+    # Lines between the header and the first heading become an untitled section, which resumes reject
+    sections = [_parse_body(heading, body) for heading, body in split_sections(rest)]
+    return StructuredDocument(header=header, sections=sections)
+
+
+def structure_for(text: str, doc_type: DocumentType) -> Optional[StructuredDocument]:
+    """Structure of text in the canonical layout, or None if it does not validate"""
+    document = from_text(text, doc_type)
+    return document if not validate_document(document, doc_type) else None
+
+
+def _run(paragraph, text: str, size: int, bold: bool = False):
+    run = paragraph.add_run(text)
+    run.font.name = "Calibri"
+    run.font.size = Pt(size)
+    run.bold = bold
+    return run
+
+
+def render_structured_docx(document: StructuredDocument, doc_type: DocumentType) -> bytes:
+    """DOCX straight from the structure; no per-line classification"""
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = section.bottom_margin = Inches(1)
+        section.left_margin = section.right_margin = Inches(1)
+
+    centered = doc_type == DocumentType.RESUME
+    for index, line in enumerate(document.header):
+        paragraph = doc.add_paragraph()
+        if centered:
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        _run(paragraph, line, 16 if index == 0 and centered else 11, bold=index == 0)
+
+    for section in document.sections:
+        if section.title:
+            heading = doc.add_paragraph()
+            _run(heading, section.title, 12, bold=True)
+            heading.paragraph_format.space_before = Pt(12)
+            heading.paragraph_format.space_after = Pt(6)
+        elif not centered:
+            doc.add_paragraph()
+        for text in section.paragraphs:
+            paragraph = doc.add_paragraph()
+            for i, line in enumerate(text.splitlines()):
+                run = _run(paragraph, line, 11)
+                if i < len(text.splitlines()) - 1:
+                    run.add_break()
+        for entry in section.entries:
+            if entry.heading:
+                heading = doc.add_paragraph()
+                _run(heading, entry.heading, 11, bold=True)
+                heading.paragraph_format.space_before = Pt(6)
+            for bullet in entry.bullets:
+                _run(doc.add_paragraph(style="List Bullet"), bullet, 11)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
@@ -0,0 +1,158 @@
+"""
+Phase-aware tool selection.
+
+Each chat turn binds only the tools that fit the conversation phase, with
+one-line descriptions instead of the full docstrings. TOOL_SPECS is the single
+source for both the bound schemas and the tool list in the system prompt, so
+the two cannot drift apart.
+"""
+
+import functools
+import json
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, ToolMessage
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from helper.document_helper import DocumentStore, DocumentType
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class Phase(Enum):
+    GATHERING = "gathering"  # No documents yet: collect profile info, then create
+    DRAFTING = "drafting"    # Responding to a tool result right after a document was made
+    EDITING = "editing"      # Documents exist and the user is refining them
+    EXPORTING = "exporting"  # The user wants files
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Compact documentation for one tool and the phases it is offered in"""
+    summary: str
+    phases: frozenset[Phase]
+
+
+_CREATE = frozenset({Phase.GATHERING, Phase.DRAFTING, Phase.EDITING})
+_WITH_DOCUMENTS = frozenset({Phase.DRAFTING, Phase.EDITING, Phase.EXPORTING})
+
+TOOL_SPECS: dict[str, ToolSpec] = {
+    "import_resume": ToolSpec("Parse the user's existing resume file (.docx/.txt/.md/.pdf) into profile fields.", frozenset({Phase.GATHERING, Phase.EDITING})),
+    "create_resume": ToolSpec("Write a resume tailored to job_description once every required field is known.", _CREATE),
+    "create_cover_letter": ToolSpec("Write a cover letter for job_title at company; tone: professional, enthusiastic, formal or creative.", _CREATE),
+    "create_cover_letter_variants": ToolSpec("Write one cover letter per company x tone in one batch (drafts_per_variant > 1 for alternatives); use instead of repeated create_cover_letter calls.", _CREATE),
+    "find_matching_jobs": ToolSpec("Find best-fit postings in the local job index for the candidate.", frozenset({Phase.GATHERING, Phase.EDITING})),
+    "create_cover_letters_for_jobs": ToolSpec("Write cover letters for several posting_ids from find_matching_jobs in one batch.", frozenset({Phase.GATHERING, Phase.EDITING})),
+    "update_document": ToolSpec("Replace a document with the FULL updated content (not just the changes).", frozenset({Phase.EDITING})),
+    "preview_document": ToolSpec("Show the current version of a document without saving.", _WITH_DOCUMENTS),
+    "select_version": ToolSpec("Make a stored version (e.g. a chosen variant) the current one.", _WITH_DOCUMENTS),
+    "show_version_history": ToolSpec("List every stored version of a document.", frozenset({Phase.EDITING})),
+    "compare_versions": ToolSpec("Summarize what changed between two versions of a document (local, instant); redline=True also saves a marked-up DOCX.", frozenset({Phase.DRAFTING, Phase.EDITING})),
+    "undo_last_change": ToolSpec("Restore the previous version of a document.", frozenset({Phase.EDITING})),
+    "score_resume_ats": ToolSpec("Score the current resume's keyword coverage against job postings (local, instant).", frozenset({Phase.DRAFTING, Phase.EDITING})),
+    "export_bundle": ToolSpec("Save documents (optionally all_versions) into one ZIP file.", frozenset({Phase.EDITING, Phase.EXPORTING})),
+    "save_documents": ToolSpec("Save documents as DOCX files (resume, cover_letter, or both when omitted).", frozenset({Phase.EDITING, Phase.EXPORTING})),
+}
+
+# Only a request that is itself an export command selects EXPORTING: "save it", "export the resume as docx",
+# "can you download both files". Messages that merely mention files or saving ("update the file with my new job",
+# "save my changes to the summary") are edits and keep the editing tools.
+_EXPORT_DOCUMENT = r"(?:resumes?|cvs?|cover\s+letters?|letters?|documents?|docs|files?|drafts?|docx|pdfs?)"
+_EXPORT_OBJECT = (
+    r"(?:it|them|both|everything|all(?:\s+of\s+them)?"
+    rf"|(?:(?:the|my|both|all|these|those)\s+)*(?:final\s+|latest\s+|current\s+|new\s+)?{_EXPORT_DOCUMENT}"
+    rf"(?:\s+(?:and|&)\s+(?:the\s+|my\s+)?{_EXPORT_DOCUMENT})?)"
+)
+_EXPORT_PATTERN = re.compile(
+    r"^\W*(?:(?:please|ok(?:ay)?|great|thanks|perfect|now|go\s+ahead\s+and|(?:can|could|would)\s+you"
+    r"|i\s+(?:want|need)\s+to|i'?d\s+like\s+to|let\s+me)[\s,!.]+)*"
+    rf"(?:save|export|download)(?:\s+{_EXPORT_OBJECT})?"
+    r"(?:\s+(?:as|to|into|in)\s+(?:an?\s+|the\s+|my\s+)?(?:docx|pdfs?|word(?:\s+(?:files?|docs?|documents?))?"
+    r"|files?|disk|desktop|folder|downloads|outputs?|zip))?(?:\s+(?:now|please))?[\s.?!]*$",
+    re.IGNORECASE,
+)
+
+
+def detect_phase(messages: Sequence[BaseMessage], document_store: DocumentStore, user_input: str = "") -> Phase:
+    """Conversation phase for the coming model call"""
+    has_documents = any(document_store.exists(doc_type) for doc_type in DocumentType)
+    if not has_documents:
+        return Phase.GATHERING
+    if user_input and _EXPORT_PATTERN.match(user_input.strip()):
+        return Phase.EXPORTING
+    if not user_input and messages and isinstance(messages[-1], ToolMessage):
+        return Phase.DRAFTING
+    return Phase.EDITING
+
+
+def compact_tool(tool: BaseTool) -> BaseTool:
+    """Copy of tool whose schema carries the one-line summary instead of the full description"""
+    spec = TOOL_SPECS.get(tool.name)
+    return tool.model_copy(update={"description": spec.summary}) if spec else tool
+
+
+def tools_for_phase(tools: Sequence[BaseTool], phase: Optional[Phase]) -> list[BaseTool]:
+    """Compact tools offered in phase (every tool when phase is None)"""
+    return [
+        compact_tool(tool) for tool in tools
+        if phase is None or tool.name not in TOOL_SPECS or phase in TOOL_SPECS[tool.name].phases
+    ]
+
+
+def _signature(tool: BaseTool) -> str:
+    params = [
+        f"{name}={field['default']!r}" if "default" in field else name
+        for name, field in tool.args.items()
+    ]
+    return f"{tool.name}({', '.join(params)})"
+
+
+def render_tool_docs(tools: Sequence[BaseTool]) -> str:
+    """Numbered tool list for the system prompt, with signatures taken from the real schemas"""
+    return "\n".join(
+        f"{i}. {_signature(tool)}\n    - {TOOL_SPECS[tool.name].summary if tool.name in TOOL_SPECS else tool.description.strip()}"
+        for i, tool in enumerate(tools, 1)
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # Not installed, or the encoding file can't be downloaded
+        logger.info(f"tiktoken unavailable, estimating tokens from length: {e}")
+        return None
+
+
+def count_tokens(text: str) -> tuple[int, str]:
+    """Token count with tiktoken when its encoding is available, else a chars/4 estimate"""
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4, "chars/4"
+    return len(encoding.encode(text)), encoding.name
+
+
+def schema_text(tools: Sequence[BaseTool]) -> str:
+    """The JSON tool definitions sent with every request"""
+    return json.dumps([convert_to_openai_tool(tool) for tool in tools])
+
+
+def measure_phase_overhead(tools: Sequence[BaseTool], build_prompt: Callable[[str], str]) -> dict:
+    """Per-turn system prompt + tool schema tokens for each phase vs. binding every full tool"""
+    def overhead(bound: Sequence[BaseTool]) -> int:
+        return count_tokens(build_prompt(render_tool_docs(bound)) + schema_text(bound))[0]
+
+    baseline = overhead(tools)
+    phases = {phase.value: overhead(tools_for_phase(tools, phase)) for phase in Phase}
+    return {
+        "tokenizer": count_tokens("")[1],
+        "all_tools_tokens": baseline,
+        "phase_tokens": phases,
+        "mean_reduction_pct": round(100 * (1 - sum(phases.values()) / len(phases) / baseline), 1),
+    }
@@ -0,0 +1,167 @@
+"""
+Opt-in tracing for Drafter.
+
+Spans are recorded with nested timings per thread and can be exported as
+Chrome trace-event JSON (chrome://tracing, Perfetto, speedscope) or as
+collapsed stacks for flamegraph.pl / inferno. A disabled tracer costs one
+attribute check per span. cProfile can also wrap a whole session.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed region; stack is the chain of span names from the root"""
+    name: str
+    stack: tuple[str, ...]
+    start_ns: int
+    duration_ns: int = 0
+    thread_id: int = 0
+    args: dict = field(default_factory=dict)
+
+
+class Tracer:
+    """Records nested spans across graph nodes, tools and generator calls"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin_ns = time.perf_counter_ns()
+
+    @classmethod
+    def from_config(cls, config) -> "Tracer":
+        return cls(enabled=bool(config.trace_path))
+
+    def _stack(self) -> list[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def _span(self, name: str, args: dict):
+        stack = self._stack()
+        stack.append(name)
+        span = Span(name, tuple(stack), time.perf_counter_ns(), thread_id=threading.get_ident(), args=args)
+        try:
+            yield span
+        finally:
+            span.duration_ns = time.perf_counter_ns() - span.start_ns
+            stack.pop()
+            with self._lock:
+                self.spans.append(span)
+
+    def span(self, name: str, **args):
+        """Context manager timing a region: `with tracer.span("prompt"): ...`"""
+        return self._span(name, args) if self.enabled else nullcontext()
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        """Return fn timed under a span called name (fn itself when disabled)"""
+        if not self.enabled:
+            return fn
+
+        @functools.wraps(fn)
+        def traced(*args, **kwargs):
+            with self._span(name, {}):
+                return fn(*args, **kwargs)
+        return traced
+
+    def traced(self, name: Optional[str] = None):
+        """Decorator form of wrap, defaulting to the function's qualified name"""
+        return lambda fn: self.wrap(name or fn.__qualname__, fn)
+
+    def wrap_tool(self, tool):
+        """Time a LangChain tool's function under 'tool:<name>'"""
+        if self.enabled and getattr(tool, "func", None) is not None:
+            tool.func = self.wrap(f"tool:{tool.name}", tool.func)
+        return tool
+
+    def to_chrome_trace(self) -> dict:
+        """Trace-event JSON with one complete ('X') event per span"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": (span.start_ns - self._origin_ns) / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {key: str(value) for key, value in span.args.items()},
+            }
+            for span in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_collapsed_stacks(self) -> str:
+        """'root;child;leaf <self time in µs>' lines for flamegraph tools"""
+        totals: dict[tuple[str, ...], int] = {}
+        child_time: dict[tuple[str, ...], int] = {}
+        for span in self.spans:
+            totals[span.stack] = totals.get(span.stack, 0) + span.duration_ns
+            if len(span.stack) > 1:
+                parent = span.stack[:-1]
+                child_time[parent] = child_time.get(parent, 0) + span.duration_ns
+        lines = []
+        for stack, total in sorted(totals.items()):
+            self_us = max(total - child_time.get(stack, 0), 0) // 1000
+            if self_us:
+                lines.append(f"{';'.join(stack)} {self_us}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Call count and total/mean milliseconds per span name"""
+        stats: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            entry = stats.setdefault(span.name, {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_ns / 1e6
+        for entry in stats.values():
+            entry["mean_ms"] = entry["total_ms"] / entry["count"]
+        return stats
+
+    def export(self, path: Path):
+        """Write Chrome trace JSON for *.json paths, collapsed stacks otherwise"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            path.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        else:
+            path.write_text(self.to_collapsed_stacks(), encoding="utf-8")
+        logger.info(f"Wrote {len(self.spans)} spans to {path}")
+
+
+NULL_TRACER = Tracer(enabled=False)
+
+
+@contextmanager
+def profile_session(path: Optional[Path]):
+    """Run the enclosed block under cProfile and dump stats to path (no-op if path is None)"""
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+        logger.info(f"Wrote cProfile stats to {path}")
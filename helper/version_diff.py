@@ -0,0 +1,223 @@
+"""
+Local diffs between stored document versions.
+
+"What changed?" is answered from the DocumentStore history instead of sending
+both versions to the model: lines are aligned first, changed lines are then
+compared word by word, and resumes are summarized per section. Diffs are
+cached per (old, new) content pair, and can be rendered as a redlined DOCX
+(deletions struck through in red, insertions underlined in blue).
+"""
+
+import difflib
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from docx import Document
+from docx.shared import Inches, Pt, RGBColor
+
+from helper.document_helper import DocumentMetadata, DocumentType
+from helper.logger_config import get_logger
+from helper.resume_sections import HEADER, split_sections
+
+logger = get_logger(__name__)
+
+EQUAL, INSERT, DELETE = "equal", "insert", "delete"
+LETTER_BODY = "LETTER"  # Pseudo-section for cover letters, which are not split
+
+Segment = tuple[str, str]  # (EQUAL/INSERT/DELETE, text)
+
+
+@dataclass
+class SectionChange:
+    """Word counts changed in one section, with a few of the changed phrases"""
+    section: str
+    status: str  # added, removed or changed
+    words_added: int = 0
+    words_removed: int = 0
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+@dataclass
+class VersionDiff:
+    doc_type: DocumentType
+    old_version: int
+    new_version: int
+    lines: list[list[Segment]]  # One entry per line of the merged document
+    sections: list[SectionChange]
+
+    @property
+    def words_added(self) -> int:
+        return sum(change.words_added for change in self.sections)
+
+    @property
+    def words_removed(self) -> int:
+        return sum(change.words_removed for change in self.sections)
+
+
+def word_segments(old: str, new: str) -> list[Segment]:
+    """Word-level edits turning old into new, adjacent words of the same kind merged"""
+    old_words, new_words = old.split(), new.split()
+    segments: list[Segment] = []
+    matcher = difflib.SequenceMatcher(None, old_words, new_words, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ("delete", "replace"):
+            segments.append((DELETE, " ".join(old_words[i1:i2])))
+        if tag in ("insert", "replace"):
+            segments.append((INSERT, " ".join(new_words[j1:j2])))
+        if tag == "equal":
+            segments.append((EQUAL, " ".join(old_words[i1:i2])))
+    return segments
+
+
+def line_segments(old: str, new: str) -> list[list[Segment]]:
+    """Lines aligned first, then paired changed lines compared word by word"""
+    old_lines, new_lines = old.splitlines(), new.splitlines()
+    lines: list[list[Segment]] = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            lines.extend([[(EQUAL, line)] for line in old_lines[i1:i2]])
+            continue
+        removed, added = old_lines[i1:i2], new_lines[j1:j2]
+        for index in range(max(len(removed), len(added))):
+            if index < len(removed) and index < len(added):
+                lines.append(word_segments(removed[index], added[index]))
+            elif index < len(removed):
+                lines.append([(DELETE, removed[index])] if removed[index].strip() else [(EQUAL, "")])
+            else:
+                lines.append([(INSERT, added[index])] if added[index].strip() else [(EQUAL, "")])
+    return lines
+
+
+def _sections(text: str, doc_type: DocumentType) -> dict[str, str]:
+    if doc_type == DocumentType.COVER_LETTER:
+        return {LETTER_BODY: text}
+    return dict(split_sections(text))
+
+
+def _short(phrase: str, limit: int = 60) -> str:
+    phrase = phrase.lstrip("-•* ")  # Whole bullet lines are shown without their bullet
+    return phrase if len(phrase) <= limit else phrase[:limit - 1].rstrip() + "…"
+
+
+def section_changes(old: str, new: str, doc_type: DocumentType, samples: int = 3) -> list[SectionChange]:
+    """Per-section word counts of what was added and removed, in the new document's order"""
+    old_sections, new_sections = _sections(old, doc_type), _sections(new, doc_type)
+    changes = []
+    for name in list(new_sections) + [name for name in old_sections if name not in new_sections]:
+        old_body, new_body = old_sections.get(name, ""), new_sections.get(name, "")
+        if old_body == new_body:
+            continue
+        status = "added" if name not in old_sections else "removed" if name not in new_sections else "changed"
+        change = SectionChange(name, status)
+        for kind, text in (segment for line in line_segments(old_body, new_body) for segment in line):
+            if kind == INSERT:
+                change.words_added += len(text.split())
+                change.added.append(_short(text))
+            elif kind == DELETE:
+                change.words_removed += len(text.split())
+                change.removed.append(_short(text))
+        if change.words_added or change.words_removed:  # Whitespace-only edits are not reported
+            change.added, change.removed = change.added[:samples], change.removed[:samples]
+            changes.append(change)
+    return changes
+
+
+def compare(old: DocumentMetadata, new: DocumentMetadata, doc_type: DocumentType) -> VersionDiff:
+    old_text, new_text = old.content, new.content
+    return VersionDiff(
+        doc_type=doc_type,
+        old_version=old.version,
+        new_version=new.version,
+        lines=line_segments(old_text, new_text),
+        sections=section_changes(old_text, new_text, doc_type),
+    )
+
+
+def summarize(diff: VersionDiff) -> str:
+    """Compact change summary: totals, then one line per changed section with sample phrases"""
+    title = f"{diff.doc_type.value.title()} v{diff.old_version} → v{diff.new_version}"
+    if not diff.sections:
+        return f"{title}: no changes"
+    lines = [f"{title}: +{diff.words_added} / -{diff.words_removed} words in {len(diff.sections)} section(s)"]
+    for change in diff.sections:
+        name = "Header" if change.section == HEADER else "Letter" if change.section == LETTER_BODY else change.section.title()
+        line = f"  • {name} ({change.status}, +{change.words_added}/-{change.words_removed})"
+        if change.added:
+            line += f"\n      + {' | '.join(change.added)}"
+        if change.removed:
+            line += f"\n      - {' | '.join(change.removed)}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def render_redline_docx(diff: VersionDiff) -> bytes:
+    """DOCX of the new version with deletions struck through in red and insertions underlined in blue"""
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = section.bottom_margin = Inches(1)
+        section.left_margin = section.right_margin = Inches(1)
+    doc.add_paragraph().add_run(f"{diff.doc_type.value.title()}: changes from v{diff.old_version} to v{diff.new_version}").bold = True
+
+    for segments in diff.lines:
+        paragraph = doc.add_paragraph()
+        paragraph.paragraph_format.space_after = Pt(0)
+        for index, (kind, text) in enumerate(segments):
+            run = paragraph.add_run(text + (" " if index < len(segments) - 1 else ""))
+            run.font.name = "Calibri"
+            run.font.size = Pt(11)
+            if kind == DELETE:
+                run.font.strike = True
+                run.font.color.rgb = RGBColor(0xC0, 0x00, 0x00)
+            elif kind == INSERT:
+                run.font.underline = True
+                run.font.color.rgb = RGBColor(0x00, 0x33, 0xCC)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _content_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class DiffCache:
+    """LRU of computed diffs keyed by both versions' content, so asking twice costs nothing"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._diffs: "OrderedDict[tuple, VersionDiff]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compare(self, old: DocumentMetadata, new: DocumentMetadata, doc_type: DocumentType) -> VersionDiff:
+        key = (doc_type, old.version, new.version, _content_key(old.content), _content_key(new.content))
+        with self._lock:
+            diff = self._diffs.get(key)
+            if diff is not None:
+                self._diffs.move_to_end(key)
+                self.hits += 1
+                return diff
+        diff = compare(old, new, doc_type)
+        with self._lock:
+            self.misses += 1
+            self._diffs[key] = diff
+            while len(self._diffs) > self.max_entries:
+                self._diffs.popitem(last=False)
+        logger.info(f"Compared {doc_type.value} v{old.version} → v{new.version}: {len(diff.sections)} sections changed")
+        return diff
+
+
+def previous_version(versions: list[DocumentMetadata], current: DocumentMetadata) -> Optional[DocumentMetadata]:
+    """Version stored just before current (variants and undo make 'version - 1' unreliable)"""
+    for index, metadata in enumerate(versions):
+        if metadata is current:
+            return versions[index - 1] if index else None
+    return versions[-2] if len(versions) > 1 else None
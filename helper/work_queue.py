@@ -0,0 +1,250 @@
+"""
+SQLite-backed work queue with at-least-once delivery.
+
+Jobs are deduplicated by idempotency key, so re-submitting the same request
+returns the existing job (and its result once done) instead of generating
+twice. A claimed job is leased for a visibility timeout; if the worker dies
+before acking, the lease expires and another worker picks the job up; a job
+whose lease has expired max_attempts times is failed instead of retried.
+Workers renew the lease while a job runs. Any number of worker processes can
+share one database file.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+from uuid import uuid4
+
+from helper.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    DONE = "done"
+    FAILED = "failed"  # Gave up after max_attempts
+
+
+@dataclass
+class Job:
+    """A claimed (or looked-up) unit of work"""
+    job_id: int
+    idempotency_key: str
+    payload: dict
+    status: JobStatus
+    attempts: int
+    lease: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+
+def idempotency_key(payload: dict) -> str:
+    """Key derived from the payload itself, for callers that don't supply one"""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    visible_at REAL NOT NULL,
+    lease TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, visible_at);
+"""
+
+
+class WorkQueue:
+    """Durable job queue in a single SQLite file (WAL mode, safe across processes)"""
+
+    def __init__(self, path: Path, visibility_timeout: float = 300.0, max_attempts: int = 5):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        # Autocommit mode; write transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def _row_to_job(self, row: sqlite3.Row) -> Job:
+        return Job(
+            job_id=row["job_id"],
+            idempotency_key=row["idempotency_key"],
+            payload=json.loads(row["payload"]),
+            status=JobStatus(row["status"]),
+            attempts=row["attempts"],
+            lease=row["lease"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+        )
+
+    def enqueue(self, payload: dict, key: Optional[str] = None) -> tuple[Job, bool]:
+        """Add a job; returns (job, created) where created is False for a duplicate key"""
+        key = key or idempotency_key(payload)
+        now = time.time()
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO jobs (idempotency_key, payload, status, visible_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, json.dumps(payload), JobStatus.QUEUED.value, now, now, now)
+        )
+        created = cursor.rowcount == 1
+        if not created:
+            logger.info(f"Job {key[:12]} already queued; not enqueued again")
+        return self.get(key), created
+
+    def get(self, key: str) -> Optional[Job]:
+        row = self._conn.execute("SELECT * FROM jobs WHERE idempotency_key = ?", (key,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self) -> Optional[Job]:
+        """Lease the oldest visible job for visibility_timeout seconds, or None if nothing is ready"""
+        now = time.time()
+        lease = uuid4().hex
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Workers that crashed or timed out on their last allowed attempt never call nack
+            expired = self._conn.execute(
+                "UPDATE jobs SET status = ?, lease = NULL, error = COALESCE(error, ?), updated_at = ? "
+                "WHERE status = ? AND visible_at <= ? AND lease IS NOT NULL AND attempts >= ?",
+                (JobStatus.FAILED.value, f"Lease expired on attempt {self.max_attempts}", now,
+                 JobStatus.QUEUED.value, now, self.max_attempts)
+            ).rowcount
+            if expired:
+                logger.warning(f"Failed {expired} job(s) whose lease expired after {self.max_attempts} attempts")
+            row = self._conn.execute(
+                "SELECT job_id FROM jobs WHERE status = ? AND visible_at <= ? ORDER BY job_id LIMIT 1",
+                (JobStatus.QUEUED.value, now)
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET lease = ?, visible_at = ?, attempts = attempts + 1, updated_at = ? WHERE job_id = ?",
+                (lease, now + self.visibility_timeout, now, row["job_id"])
+            )
+            job = self._row_to_job(
+                self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (row["job_id"],)).fetchone()
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return job
+
+    def _update_leased(self, job: Job, sql: str, params: tuple) -> bool:
+        """Apply an update only while the caller still holds the job's lease"""
+        cursor = self._conn.execute(f"{sql} WHERE job_id = ? AND lease = ?", params + (job.job_id, job.lease))
+        if cursor.rowcount == 0:
+            logger.warning(f"Lease on job {job.job_id} expired; another worker owns it now")
+            return False
+        return True
+
+    def extend(self, job: Job, seconds: Optional[float] = None) -> bool:
+        """Push the visibility timeout out for long-running jobs"""
+        visible_at = time.time() + (seconds or self.visibility_timeout)
+        return self._update_leased(job, "UPDATE jobs SET visible_at = ?", (visible_at,))
+
+    def ack(self, job: Job, result: dict) -> bool:
+        now = time.time()
+        return self._update_leased(
+            job, "UPDATE jobs SET status = ?, result = ?, error = NULL, lease = NULL, updated_at = ?",
+            (JobStatus.DONE.value, json.dumps(result), now)
+        )
+
+    def nack(self, job: Job, error: str, retry_delay: float = 5.0) -> bool:
+        """Release a failed job for retry (with linear backoff), or mark it failed after max_attempts"""
+        now = time.time()
+        if job.attempts >= self.max_attempts:
+            status, visible_at = JobStatus.FAILED, now
+        else:
+            status, visible_at = JobStatus.QUEUED, now + retry_delay * job.attempts
+        return self._update_leased(
+            job, "UPDATE jobs SET status = ?, visible_at = ?, error = ?, lease = NULL, updated_at = ?",
+            (status.value, visible_at, error, now)
+        )
+
+    def stats(self) -> dict[str, int]:
+        rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@contextmanager
+def _heartbeat(queue: WorkQueue, job: Job, interval: float) -> Iterator[None]:
+    """Extend the job's lease every interval seconds while the block runs, until the lease is lost"""
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(interval):
+            if not queue.extend(job):
+                return
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{job.job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_worker(queue: WorkQueue, handler: Callable[[dict], dict], worker_id: Optional[str] = None,
+               poll_interval: float = 1.0, max_jobs: Optional[int] = None, stop_when_empty: bool = False) -> dict:
+    """Claim, process and ack jobs until stopped; returns counts of processed, failed and lost jobs"""
+    worker_id = worker_id or default_worker_id()
+    processed = failed = lost = 0
+    logger.info(f"Worker {worker_id} started on {queue.path}")
+
+    while max_jobs is None or processed + failed + lost < max_jobs:
+        job = queue.claim()
+        if job is None:
+            if stop_when_empty:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logger.info(f"Worker {worker_id} processing job {job.job_id} (attempt {job.attempts})")
+        try:
+            with _heartbeat(queue, job, queue.visibility_timeout / 3):
+                result = handler(job.payload)
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed on attempt {job.attempts}: {e}")
+            queue.nack(job, str(e))
+            failed += 1
+            continue
+        if not queue.ack(job, result):
+            # Another worker re-claimed the job; its run is the one that counts
+            logger.warning(f"Worker {worker_id} lost the lease on job {job.job_id}; result discarded")
+            lost += 1
+            continue
+        processed += 1
+
+    logger.info(f"Worker {worker_id} stopped: {processed} processed, {failed} failed, {lost} lost")
+    return {"worker_id": worker_id, "processed": processed, "failed": failed, "lost": lost}
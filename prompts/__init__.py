@@ -1,5 +1,11 @@
 from .resume_prompt import get_resume_prompt
 from .cover_letter_prompt import get_cover_letter_prompt
 from .main_reply_prompt import get_main_reply_prompt
+from .tailor_prompt import get_tailor_prompt
+from .repair_prompt import get_repair_prompt
+from .section_prompt import get_summary_section_prompt, get_experience_entry_prompt, get_skills_section_prompt
+from .structured_prompt import get_structured_format_prompt
 
-__all__ = ['get_resume_prompt', 'get_cover_letter_prompt', 'get_main_reply_prompt']
\ No newline at end of file
+__all__ = ['get_resume_prompt', 'get_cover_letter_prompt', 'get_main_reply_prompt', 'get_tailor_prompt', 'get_repair_prompt',
+           'get_summary_section_prompt', 'get_experience_entry_prompt', 'get_skills_section_prompt',
+           'get_structured_format_prompt']
\ No newline at end of file
@@ -0,0 +1,23 @@
+def get_repair_prompt(section_name: str, content: str, problems: str, candidate_info: str) -> str:
+    """Generate the prompt that fixes unsupported facts in one section of a generated document"""
+    return f"""
+You are FactChecker, a careful resume editor. The {section_name} below was generated for a candidate
+but mentions details that do not appear in the candidate's own information.
+
+{section_name}:
+{content}
+
+Unsupported details:
+{problems}
+
+Candidate information (the ONLY source of facts):
+{candidate_info}
+
+TASK
+- Rewrite the {section_name} so it no longer states the unsupported details: remove them, or replace them
+  with the matching fact from the candidate information.
+- Keep everything else (wording, order, format, length) as close to the original as possible.
+
+RULES
+- Plain text only. Return only the rewritten {section_name}, without a heading. No explanations.
+"""
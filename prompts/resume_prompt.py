@@ -19,7 +19,7 @@ User info:
 - LinkedIn URL: {linkedin_url}
 - Portfolio/GitHub URL: {portfolio_url if portfolio_url else "Not provided"}
 - Certifications: {certifications if certifications else "Not provided"}
-- Target Job Description (Optimize for this): {job_description}
+- Target Job Description (Optimize for this; may be a pre-extracted summary of requirements, skills and keywords): {job_description}
 
 TASK
 - Produce a clean, plain-text resume using only provided info.
@@ -0,0 +1,57 @@
+def get_summary_section_prompt(name: str, title: str, summary: str, experience: str, job_description: str) -> str:
+    """Generate the prompt for the SUMMARY section alone"""
+    return f"""
+You are ResumeWriter, an ATS-optimized resume AI. Write only the SUMMARY section of {name}'s resume.
+
+Title: {title}
+Background: {summary}
+Experience (for context only): {experience}
+Target Job (requirements, skills and keywords): {job_description}
+
+TASK
+- 2–3 sentences highlighting core strengths, key achievements and the value brought to the target job.
+- Use the job's terminology where it truthfully applies. Never invent facts.
+
+RULES
+- Plain text only. No heading, no markdown, no explanations.
+"""
+
+
+def get_experience_entry_prompt(entry: str, title: str, job_description: str) -> str:
+    """Generate the prompt for one EXPERIENCE entry (its header line and bullets)"""
+    return f"""
+You are ResumeWriter, an ATS-optimized resume AI. Rewrite ONE work experience entry of a {title}'s resume.
+
+Entry as provided by the candidate:
+{entry}
+
+Target Job (requirements, skills and keywords): {job_description}
+
+FORMAT
+[Company Name] | [Role/Title] | [Start Date – End Date or Present]
+- Action verb + achievement (quantify when the entry gives numbers).
+- Action verb + achievement.
+- Optional third bullet if high-impact.
+
+RULES
+- Use only facts from the entry; omit dates if none are given.
+- Plain text only. Return only the entry. No heading, no explanations.
+"""
+
+
+def get_skills_section_prompt(skills: str, job_description: str) -> str:
+    """Generate the prompt for the SKILLS section alone"""
+    return f"""
+You are ResumeWriter, an ATS-optimized resume AI. Write only the SKILLS section of a resume.
+
+Skills provided: {skills}
+Target Job (requirements, skills and keywords): {job_description}
+
+TASK
+- List only the skills provided, comma-separated, with the ones the job asks for first.
+- Group similar skills on separate lines (e.g. "Languages: ...") if that helps.
+
+RULES
+- Never add skills that were not provided.
+- Plain text only. No heading, no explanations.
+"""
@@ -0,0 +1,14 @@
+def get_structured_format_prompt(document: str) -> str:
+    """Generate the output-format instructions used when the document is returned as structured data"""
+    return f"""
+OUTPUT FORMAT (overrides any plain-text formatting rules above)
+Return the {document} as structured data, not as formatted text:
+- header: the candidate's name first, then one item per header line (title | phone | links; for a letter also
+  the date and recipient lines).
+- sections: in document order. A resume uses ALL CAPS titles (SUMMARY, EXPERIENCE, EDUCATION, SKILLS,
+  CERTIFICATIONS if provided). A cover letter has a single section with an empty title whose paragraphs are the
+  greeting, the body paragraphs and the sign-off.
+- paragraphs: plain sentences or lines (one degree per line in EDUCATION; skills comma-separated).
+- entries: one per job or project, heading like "Company | Role | Start – End", bullets without bullet characters.
+Never put headings or bullet characters inside paragraphs.
+"""
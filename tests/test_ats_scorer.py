@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from helper.ats_scorer import PostingMatrix, rank_postings, rank_postings_for_store, score_resume
+from helper.document_helper import DocumentStore, DocumentType
+
+RESUME = "JANE DOE\n\nSKILLS\nPython, PostgreSQL, Kubernetes\n\nEXPERIENCE\n- Built Python services on Kubernetes\n"
+
+POSTINGS = [
+    "Backend Engineer\n\nRequirements:\n- Python and PostgreSQL required\n- Experience with Kubernetes",
+    "Frontend Developer\n\nRequirements:\n- React and TypeScript required\n- Experience with CSS",
+    "Data Engineer\n\nRequirements:\n- Python and Spark required\n- Experience with Airflow",
+]
+
+
+def test_postings_are_ranked_by_keyword_coverage():
+    ranked = rank_postings(RESUME, POSTINGS)
+    assert [result.posting_index for result in ranked] == [0, 2, 1]
+    assert ranked[0].score > ranked[1].score > ranked[2].score >= 0
+    assert {"python", "postgresql", "kubernetes"} <= set(ranked[0].matched)
+    assert "react" in ranked[-1].missing
+
+
+def test_top_k_matches_the_full_ranking():
+    matrix = PostingMatrix(POSTINGS * 10)
+    full = matrix.rank(RESUME)
+    top = matrix.rank(RESUME, top_k=5)
+    assert [r.score for r in top] == [r.score for r in full[:5]]
+    np.testing.assert_allclose(matrix.scores(RESUME), [r.score for r in sorted(full, key=lambda r: r.posting_index)])
+
+
+def test_single_posting_and_store_helpers():
+    assert score_resume(RESUME, POSTINGS[0]).score == pytest.approx(rank_postings(RESUME, POSTINGS[:1])[0].score)
+    assert rank_postings(RESUME, []) == []
+    store = DocumentStore()
+    with pytest.raises(ValueError):
+        rank_postings_for_store(store, POSTINGS)
+    store.create(DocumentType.RESUME, RESUME)
+    assert rank_postings_for_store(store, POSTINGS, top_k=1)[0].posting_index == 0
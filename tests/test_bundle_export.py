@@ -0,0 +1,66 @@
+import io
+import json
+import zipfile
+
+from helper.bundle_export import MANIFEST_NAME, bundle_items, iter_bundle, save_bundle
+from helper.document_helper import DocumentStore, DocumentType
+from helper.export_cache import ExportCache
+
+RESUME = "JANE DOE\nEngineer\n\nSUMMARY\nBuilds services.\n"
+LETTER = "Dear Hiring Manager,\n\nI would like to join Acme.\n\nSincerely,\nJane Doe\n"
+
+
+def _stores():
+    jane = DocumentStore()
+    jane.create(DocumentType.RESUME, RESUME)
+    jane.create(DocumentType.RESUME, RESUME + "Ships on time.\n")
+    jane.create(DocumentType.COVER_LETTER, LETTER)
+    john = DocumentStore()
+    john.create(DocumentType.RESUME, RESUME.replace("JANE", "JOHN"))
+    return [("jane", jane), ("john", john)]
+
+
+def test_items_cover_current_or_every_version():
+    current = [item.arcname for item in bundle_items(_stores())]
+    assert current == ["jane/resume_v2.docx", "jane/cover_letter_v1.docx", "john/resume_v1.docx"]
+    every = [item.arcname for item in bundle_items(_stores(), [DocumentType.RESUME], all_versions=True)]
+    assert every == ["jane/resume_v1.docx", "jane/resume_v2.docx", "john/resume_v1.docx"]
+
+
+def test_saved_bundle_lists_every_entry_in_its_manifest(tmp_path):
+    stats = save_bundle(tmp_path / "bundle.zip", bundle_items(_stores()))
+    with zipfile.ZipFile(tmp_path / "bundle.zip") as archive:
+        assert archive.testzip() is None
+        manifest = json.loads(archive.read(MANIFEST_NAME))
+        assert [entry["path"] for entry in manifest] == archive.namelist()[:-1]
+        assert sum(entry["size"] for entry in manifest) == stats["bytes"]
+    assert stats["documents"] == 3
+    assert [(entry["owner"], entry["version"]) for entry in manifest] == [("jane", 2), ("jane", 1), ("john", 1)]
+
+
+def test_streamed_bundle_is_a_valid_archive():
+    data = b"".join(iter_bundle(bundle_items(_stores()), chunk_size=1024))
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert len(archive.namelist()) == 4
+
+
+def test_existing_exports_are_copied_instead_of_rendered(tmp_path):
+    [(owner, store)] = _stores()[:1]
+    cache = ExportCache(tmp_path / "outputs")
+    metadata = store.get(DocumentType.RESUME)
+    exported, _ = cache.export(metadata.content, DocumentType.RESUME, metadata.version, session=owner)
+    data = b"".join(iter_bundle(bundle_items([(owner, store)], [DocumentType.RESUME]), cache))
+    cache.close()
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.read("jane/resume_v2.docx") == exported.read_bytes()
+
+
+def test_owners_that_sanitize_to_the_same_folder_keep_separate_entries(tmp_path):
+    first, second = DocumentStore(), DocumentStore()
+    first.create(DocumentType.RESUME, RESUME)
+    second.create(DocumentType.RESUME, RESUME.replace("JANE", "JOHN"))
+    save_bundle(tmp_path / "bundle.zip", bundle_items([("a/b", first), ("a_b", second)]))
+    with zipfile.ZipFile(tmp_path / "bundle.zip") as archive:
+        names = archive.namelist()
+    assert len(set(names)) == 3
@@ -0,0 +1,38 @@
+import json
+
+from drafter_cli import main
+from helper.document_helper import DocumentType
+from helper.session_store import SessionStore
+
+
+def test_exporting_an_old_version_leaves_the_current_one_alone(tmp_path, capsys):
+    sessions = SessionStore(tmp_path / "sessions")
+    store = sessions.get("jane").document_store
+    store.create(DocumentType.RESUME, "JANE DOE\n\nSUMMARY\nFirst draft", label="first")
+    store.create(DocumentType.RESUME, "JANE DOE\n\nSUMMARY\nSecond draft", label="second")
+    sessions.flush()
+
+    code = main([
+        "--output-dir", str(tmp_path / "outputs"), "export", "--session", "jane",
+        "--sessions-dir", str(tmp_path / "sessions"), "--documents", "resume", "--version", "1",
+    ])
+
+    assert code == 0
+    [document] = json.loads(capsys.readouterr().out)["documents"]
+    assert (document["version"], document["label"]) == (1, "first")
+    reloaded = SessionStore(tmp_path / "sessions").get("jane").document_store
+    assert reloaded.get(DocumentType.RESUME).label == "second"
+
+
+def test_exporting_a_missing_version_fails(tmp_path, capsys):
+    sessions = SessionStore(tmp_path / "sessions")
+    sessions.get("jane").document_store.create(DocumentType.RESUME, "JANE DOE\n\nSUMMARY\nDraft")
+    sessions.flush()
+
+    code = main([
+        "--output-dir", str(tmp_path / "outputs"), "export", "--session", "jane",
+        "--sessions-dir", str(tmp_path / "sessions"), "--documents", "resume", "--version", "7",
+    ])
+
+    assert code == 1
+    assert "v7 not found" in json.loads(capsys.readouterr().out)["error"]
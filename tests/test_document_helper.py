@@ -0,0 +1,58 @@
+import pytest
+
+from helper.document_helper import DocumentStore, DocumentType, apply_delta, make_delta
+
+BASE = "JANE DOE\nEngineer\n\nSUMMARY\nBuilds services.\n\nSKILLS\nPython, Go\n"
+
+
+@pytest.mark.parametrize("content", [
+    BASE.replace("Python, Go", "Python, Go, Rust"),
+    BASE.rstrip("\n"),
+    BASE + "\n\n",
+    BASE.replace("\n", "\r\n"),
+    "",
+    BASE.replace("SUMMARY\nBuilds services.\n\n", ""),
+])
+def test_delta_round_trip_is_exact(content):
+    assert apply_delta(BASE, make_delta(BASE, content)) == content
+
+
+def test_delta_versions_read_back_their_content():
+    store = DocumentStore()
+    base = store.set_base("profile", BASE)
+    tailored = BASE.replace("Builds services.", "Builds payment services.")
+    metadata = store.create(DocumentType.RESUME, tailored, base=base)
+    assert metadata.delta and metadata.content == tailored
+
+
+def test_undo_after_variants_restores_the_version_before_the_batch():
+    store = DocumentStore()
+    before = store.create(DocumentType.COVER_LETTER, "Dear Acme,")
+    store.create_variants(DocumentType.COVER_LETTER, ["Dear Globex,", "Dear Initech,", "Dear Umbrella,"], ["G", "I", "U"])
+    store.select_version(DocumentType.COVER_LETTER, 3)
+    assert store.undo(DocumentType.COVER_LETTER) is before
+    assert [m.version for m in store.get_versions(DocumentType.COVER_LETTER)] == [1]
+    assert store.undo(DocumentType.COVER_LETTER) is None
+
+
+def test_undo_after_select_goes_back_not_forward():
+    store = DocumentStore()
+    store.create(DocumentType.RESUME, BASE)
+    store.create(DocumentType.RESUME, BASE + "v2")
+    store.select_version(DocumentType.RESUME, 1)
+    assert store.undo(DocumentType.RESUME) is None
+    assert store.get(DocumentType.RESUME).version == 1
+
+    # An edit made on top of the selected version undoes back to it
+    store.create(DocumentType.RESUME, BASE + "v3")
+    assert store.undo(DocumentType.RESUME).version == 1
+    assert [m.version for m in store.get_versions(DocumentType.RESUME)] == [1, 2]
+
+
+def test_undo_chain_walks_back_one_version_at_a_time():
+    store = DocumentStore()
+    for i in range(3):
+        store.create(DocumentType.RESUME, f"{BASE}{i}")
+    assert store.undo(DocumentType.RESUME).version == 2
+    assert store.undo(DocumentType.RESUME).version == 1
+    assert store.undo(DocumentType.RESUME) is None
@@ -0,0 +1,73 @@
+from helper.document_helper import DocumentStore, DocumentType
+from helper.export_cache import ExportCache, RetentionPolicy
+
+RESUME = "JANE DOE\nEngineer\n\nSUMMARY\nBuilds services.\n"
+
+
+def test_same_session_hit_returns_its_own_file(tmp_path):
+    cache = ExportCache(tmp_path)
+    first, reused = cache.export(RESUME, DocumentType.RESUME, 1, session="a")
+    again, reused_again = cache.export(RESUME, DocumentType.RESUME, 1, session="a")
+    assert (again, reused, reused_again) == (first, False, True)
+
+
+def test_other_sessions_get_their_own_file_under_their_version(tmp_path):
+    cache = ExportCache(tmp_path)
+    path_a, _ = cache.export(RESUME, DocumentType.RESUME, 1, session="a")
+    path_b, reused = cache.export(RESUME, DocumentType.RESUME, 4, session="b")
+    copied, _ = cache.export(RESUME, DocumentType.RESUME, 2, session="c", link=False)
+    assert reused and path_b != path_a and "_v4_" in path_b.name and "/b/" in path_b.as_posix()
+    assert copied.read_bytes() == path_a.read_bytes()
+    assert [record.path for record in cache.history("b")] == [path_b]
+
+    # A's retention no longer takes B's file with it
+    for _ in range(2):
+        cache.export(RESUME + f"\n{_}", DocumentType.RESUME, 2, session="a")
+    cache.prune(RetentionPolicy(max_age_days=-1, keep_latest=1))
+    assert not path_a.exists() and path_b.exists()
+
+
+def test_render_happens_outside_the_lock(tmp_path, monkeypatch):
+    cache = ExportCache(tmp_path)
+    held = []
+    render = DocumentStore.render_docx
+
+    def spy(*args):
+        held.append(cache._lock.locked())
+        return render(*args)
+
+    monkeypatch.setattr(DocumentStore, "render_docx", staticmethod(spy))
+    cache.export(RESUME, DocumentType.RESUME, 1)
+    assert held == [False]
+
+
+def test_async_export_keeps_the_event_loop_free(tmp_path):
+    import asyncio
+
+    cache = ExportCache(tmp_path)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        letter = "Jane Doe\n\nDear Acme,\n\nI am writing to apply."
+        (resume, fresh), (again, reused), (letter_path, _) = await asyncio.gather(
+            cache.aexport(RESUME, DocumentType.RESUME, 1, session="a"),
+            cache.aexport(RESUME, DocumentType.RESUME, 1, session="a"),
+            cache.aexport(letter, DocumentType.COVER_LETTER, 1, session="a"),
+        )
+        await DocumentStore.asave_to_docx(RESUME, tmp_path / "direct.docx", DocumentType.RESUME)
+        task.cancel()
+        return ticks, resume, again, letter_path
+
+    ticks, resume, again, letter_path = asyncio.run(main())
+    assert ticks > 1  # The loop kept running while documents rendered in threads
+    assert resume == again and resume.exists() and letter_path.exists()
+    assert (tmp_path / "direct.docx").read_bytes()[:2] == b"PK"
+    assert len(cache.history("a")) == 2
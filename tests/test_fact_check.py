@@ -0,0 +1,65 @@
+from helper.fact_check import check_facts
+
+SOURCES = {
+    "name": "Jane Doe",
+    "title": "Backend Engineer",
+    "phone": "(415) 555-0142",
+    "linkedin_url": "linkedin.com/in/janedoe",
+    "experience": "Acme Corp | Backend Engineer | 2019-2023\n- Built Python and PostgreSQL services",
+    "education": "B.S. Computer Science, State University, 2018",
+    "skills": "Python, PostgreSQL, Docker",
+}
+
+RESUME = """JANE DOE
+Backend Engineer | (415) 555-9999 | linkedin.com/in/jane-doe-123 | jane@fake.io
+
+EXPERIENCE
+Acme Corp | Backend Engineer | 2017-2023
+- Built Python and PostgreSQL services
+Globex | Staff Engineer | 2015-2017
+- Led Kubernetes migration
+
+EDUCATION
+M.S. Computer Science, State University, 2018
+
+SKILLS
+Python, PostgreSQL, Docker, Kubernetes, Rust
+"""
+
+
+def test_contact_details_are_replaced_with_the_candidates_own():
+    report = check_facts(RESUME, SOURCES)
+    assert report.text.splitlines()[1] == "Backend Engineer | (415) 555-0142 | linkedin.com/in/janedoe"
+    fixed = {(issue.kind, issue.value) for issue in report.issues if issue.fixable}
+    assert {("email", "jane@fake.io"), ("url", "linkedin.com/in/jane-doe-123")} <= fixed
+
+
+def test_invented_skills_are_dropped_from_the_skills_list():
+    report = check_facts(RESUME, SOURCES)
+    assert report.text.rstrip().endswith("SKILLS\nPython, PostgreSQL, Docker")
+    assert "SKILLS" not in report.by_section()
+
+
+def test_unsupported_facts_are_reported_per_section():
+    by_section = {
+        heading: {(issue.kind, issue.value) for issue in issues}
+        for heading, issues in check_facts(RESUME, SOURCES).by_section().items()
+    }
+    assert by_section == {
+        "EXPERIENCE": {("year", "2015"), ("year", "2017"), ("skill", "kubernetes"), ("employer", "Globex")},
+        "EDUCATION": {("degree", "master")},
+    }
+
+
+def test_faithful_resume_has_no_issues():
+    resume = "JANE DOE\nBackend Engineer | (415) 555-0142\n\nEXPERIENCE\nAcme Corp | Backend Engineer | 2019-2023\n\nSKILLS\nPython, Docker"
+    report = check_facts(resume, SOURCES)
+    assert report.issues == []
+    assert report.text == resume
+
+
+def test_letters_may_name_the_postings_skills():
+    letter = "I would bring my Python experience to your Kubernetes platform."
+    assert check_facts(letter, SOURCES, "Requires Kubernetes", sectioned=False, allow_job_skills=True).issues == []
+    [issue] = check_facts(letter, SOURCES, "Requires Kubernetes", sectioned=False).issues
+    assert (issue.kind, issue.value, issue.fixable) == ("skill", "kubernetes", False)
@@ -0,0 +1,80 @@
+import pytest
+
+from helper.document_helper import DocumentStore, DocumentType
+from helper.intent_router import IntentRouter
+
+
+@pytest.fixture
+def router() -> IntentRouter:
+    store = DocumentStore()
+    store.create(DocumentType.RESUME, "JANE DOE\n\nSUMMARY\nEngineer.\n")
+    store.create(DocumentType.RESUME, "JANE DOE\n\nSUMMARY\nSenior engineer.\n")
+    return IntentRouter(store)
+
+
+ROUTED = [
+    ("preview my resume", "preview_document", {"document_type": "resume"}),
+    ("Show me the resume", "preview_document", {"document_type": "resume"}),
+    ("please display my cv", "preview_document", {"document_type": "resume"}),
+    ("save both", "save_documents", {"document_types": ["resume"]}),
+    ("save my resume", "save_documents", {"document_types": ["resume"]}),
+    ("export the resume as docx", "save_documents", {"document_types": ["resume"]}),
+    ("download all files", "save_documents", {"document_types": ["resume"]}),
+    ("undo the last change to my resume", "undo_last_change", {"document_type": "resume"}),
+    ("revert my resume", "undo_last_change", {"document_type": "resume"}),
+    ("show resume versions", "show_version_history", {"document_type": "resume"}),
+    ("version history of my resume", "show_version_history", {"document_type": "resume"}),
+    ("what changed?", "compare_versions", {"document_type": "resume"}),
+    ("What did you change in my resume?", "compare_versions", {"document_type": "resume"}),
+    ("compare versions", "compare_versions", {"document_type": "resume"}),
+    ("diff my resume", "compare_versions", {"document_type": "resume"}),
+    ("compare v1 and v3", "compare_versions", {"document_type": "resume", "old_version": 1, "new_version": 3}),
+    ("compare v1 with v2 of my resume", "compare_versions", {"document_type": "resume", "old_version": 1, "new_version": 2}),
+]
+
+NOT_ROUTED = [
+    # Negations
+    "don't undo that",
+    "never mind, no need to revert",
+    "don't save yet",
+    "no, do not save",
+    "not yet, don't show my resume",
+    # Keywords inside ordinary chat
+    "here is my work history",
+    "I have no work history",
+    "I see",
+    "see below",
+    "display name: John",
+    "show me how to write a summary",
+    "compare my skills to the job",
+    "diff between us and them",
+    "what changed at your company?",
+    # Formats the tools can't produce, and destructive commands without a document
+    "export to pdf",
+    "save my resume as pdf",
+    "undo",
+    "undo last change",
+    "revert that",
+    # Questions and edits
+    "how do I save my resume?",
+    "make my resume shorter",
+    "",
+]
+
+
+@pytest.mark.parametrize("message, tool_name, args", ROUTED)
+def test_commands_are_routed(router, message, tool_name, args):
+    intents = router.route(message)
+    assert intents is not None, message
+    assert [(intent.tool_name, intent.args) for intent in intents] == [(tool_name, args)]
+
+
+@pytest.mark.parametrize("message", NOT_ROUTED)
+def test_chat_goes_to_the_model(router, message):
+    assert router.route(message) is None
+
+
+def test_undo_needs_a_single_document(router):
+    router.document_store.create(DocumentType.COVER_LETTER, "Dear team,")
+    assert router.route("undo the last change to both") is None
+    assert router.route("undo the last change to my cover letter")[0].args == {"document_type": "cover_letter"}
@@ -0,0 +1,45 @@
+from helper.job_description import looks_like_job_description, preprocess_job_description
+
+POSTING = """Senior Backend Engineer
+
+About Acme:
+Acme builds payment infrastructure for small businesses.
+
+About the role
+You will design and operate Python services.
+
+Requirements:
+- 5+ years of experience with Python
+- Experience with PostgreSQL and Kubernetes required
+- Strong knowledge of distributed systems
+
+We offer competitive benefits. Apply now!"""
+
+EXPERIENCE = (
+    "I worked at Acme for 5 years as a backend engineer. My experience with Python is strong and I have "
+    "knowledge of PostgreSQL and Kubernetes. I led a team of 4 engineers and I have hands-on experience with "
+    "distributed systems. I also have a bachelor degree in CS and 3 years of experience with Go."
+)
+
+
+def test_about_heading_names_the_company():
+    assert preprocess_job_description(POSTING).company == "Acme"
+    assert preprocess_job_description("Engineer\n\nAbout us:\nWe build things.").company is None
+
+
+def test_posting_is_told_apart_from_pasted_experience():
+    assert looks_like_job_description(POSTING)
+    assert not looks_like_job_description(EXPERIENCE)
+
+
+def test_cache_survives_concurrent_callers(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from helper import job_description
+
+    monkeypatch.setattr(job_description, "_CACHE_SIZE", 8)
+    postings = [POSTING.replace("Acme", f"Acme{i}") for i in range(64)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        digests = list(pool.map(preprocess_job_description, postings * 4))
+    assert [digest.company for digest in digests[:64]] == [f"Acme{i}" for i in range(64)]
+    assert len(job_description._CACHE) <= 8
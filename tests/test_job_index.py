@@ -0,0 +1,75 @@
+import numpy as np
+
+from helper.job_index import JobIndex, JobPosting
+
+POSTINGS = [
+    JobPosting("1", "Backend Engineer", "Acme", "Python, PostgreSQL, Kubernetes"),
+    JobPosting("2", "Frontend Developer", "Globex", "React, TypeScript, CSS"),
+    JobPosting("3", "Data Engineer", "Initech", "Python, Spark, Airflow"),
+    JobPosting("4", "Python Backend Developer", "Umbrella", "Python, Django, PostgreSQL"),
+]
+
+_AXES = ["spark", "airflow", "react", "django"]
+
+
+def _encoder(texts):
+    """Deterministic stand-in for a sentence-transformers model: one axis per keyword"""
+    vectors = np.array([[float(axis in text.lower()) for axis in _AXES] + [0.1] for text in texts])
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _index(**kwargs) -> JobIndex:
+    index = JobIndex(**kwargs)
+    index.add_many(POSTINGS)
+    return index
+
+
+def test_lexical_ranking_weighs_title_terms():
+    results = _index().search("python backend", top_k=3)
+    assert [posting.posting_id for posting, _ in results][:2] == ["4", "1"]
+    assert all(score > 0 for _, score in results)
+    assert _index().search("cobol") == []
+
+
+def test_replacing_a_posting_reindexes_it(tmp_path):
+    index = _index()
+    index.add(JobPosting("2", "Python Data Scientist", "Globex", "Python, pandas"))
+    assert "2" in [posting.posting_id for posting, _ in index.search("python", top_k=4)]
+    index.save(tmp_path / "jobs.jsonl")
+    loaded = JobIndex.load(tmp_path / "jobs.jsonl")
+    assert len(loaded) == 4 and loaded.get("2").title == "Python Data Scientist"
+
+
+def test_rerank_orders_lexical_candidates_by_embedding_similarity():
+    index = _index(encoder=_encoder)
+    lexical = [posting.posting_id for posting, _ in index.search("python engineer spark airflow pipelines")]
+    reranked = index.search("python engineer spark airflow pipelines", rerank=True)
+    assert reranked[0][0].posting_id == "3"
+    assert sorted(posting.posting_id for posting, _ in reranked) == sorted(lexical)
+    # Without an encoder rerank falls back to the lexical order
+    assert [p.posting_id for p, _ in _index().search("python backend", rerank=True)] == [
+        p.posting_id for p, _ in _index().search("python backend")
+    ]
+
+
+def test_profile_search_uses_title_and_skills():
+    results = _index().search_profile({"title": "Frontend Developer", "skills": "React"}, top_k=1)
+    assert results[0][0].posting_id == "2"
+
+
+def test_find_matching_jobs_reranks_when_an_encoder_is_configured(monkeypatch):
+    from drafter_agentV2 import AgentConfig, create_tools
+    from helper.document_helper import DocumentStore
+
+    calls = []
+    for index in (_index(), _index(encoder=_encoder)):
+        search_profile = index.search_profile
+
+        def spy(*args, search_profile=search_profile, **kwargs):
+            calls.append(kwargs["rerank"])
+            return search_profile(*args, **kwargs)
+
+        monkeypatch.setattr(index, "search_profile", spy)
+        tools = {t.name: t for t in create_tools(DocumentStore(), None, AgentConfig(), index)}
+        assert "[3] Data Engineer" in tools["find_matching_jobs"].invoke({"title": "Data Engineer", "skills": "Spark"})
+    assert calls == [False, True]
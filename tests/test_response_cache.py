@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from helper.response_cache import SemanticResponseCache, is_cacheable_message, is_cacheable_reply, ngram_sketch
+
+STATE = ("gathering", (), ("name", "job_description"))
+
+
+def test_sketch_ignores_case_and_punctuation():
+    assert np.allclose(ngram_sketch("What do you need from me?"), ngram_sketch("what do you need from me"))
+    assert np.linalg.norm(ngram_sketch("hello")) == pytest.approx(1.0)
+    assert not ngram_sketch("").any()
+
+
+def test_paraphrases_hit_within_the_same_state_only():
+    cache = SemanticResponseCache(threshold=0.8)
+    cache.store(STATE, "What do you need from me?", "Your name, title and the job posting.")
+    assert cache.lookup(STATE, "what do you need from me") == "Your name, title and the job posting."
+    assert cache.lookup(("editing", ("resume",), ()), "What do you need from me?") is None
+    assert cache.lookup(STATE, "Which tones can a cover letter use?") is None
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 2, "hit_rate": 0.333}
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = SemanticResponseCache(max_entries=2)
+    cache.store(STATE, "what do you need from me", "a")
+    cache.store(STATE, "which tones are there", "b")
+    assert cache.lookup(STATE, "what do you need from me") == "a"
+    cache.store(("other",), "how does this work", "c")
+    assert len(cache) == 2
+    assert cache.lookup(STATE, "which tones are there") is None
+    assert cache.lookup(STATE, "what do you need from me") == "a"
+
+
+def test_encoder_replaces_the_sketch():
+    encoder = lambda texts: np.array([[1.0, 0.0] if "tone" in text else [0.0, 1.0] for text in texts])
+    cache = SemanticResponseCache(threshold=0.99, encoder=encoder)
+    cache.store(STATE, "which tones are there", "professional, enthusiastic, formal or creative")
+    assert cache.lookup(STATE, "list every tone") == "professional, enthusiastic, formal or creative"
+
+
+@pytest.mark.parametrize("message, cacheable", [
+    ("what do you need from me?", True),
+    ("hi", True),
+    ("What tones are there?", True),
+    ("can you write a letter for Acme?", False),
+    ("my phone is (415) 555-0142, what next?", False),
+    ("is jane@example.com ok?", False),
+    ("make it shorter", False),
+    ("what " + "else " * 40, False),
+])
+def test_only_short_impersonal_questions_are_cacheable(message, cacheable):
+    assert is_cacheable_message(message) is cacheable
+
+
+def test_replies_that_echo_the_user_are_not_cached():
+    context = {"name": "Jane Doe", "title": "Backend Engineer"}
+    assert is_cacheable_reply("Tell me your name and the job posting.", context)
+    assert not is_cacheable_reply("Thanks Jane! What's the job posting?", context)
+    assert not is_cacheable_reply("A backend engineer resume needs a posting.", context)
+    assert not is_cacheable_reply("   ", context)
@@ -0,0 +1,86 @@
+from docx import Document
+
+from helper.resume_import import import_resume_file, parse_resume_lines
+
+PROJECT_MANAGER = """\
+Maria Lopez
+Project Manager
+(415) 555-0142 | linkedin.com/in/marialopez | github.com/mlopez
+
+PROFESSIONAL SUMMARY
+Project manager with eight years of delivery experience in fintech.
+
+EXPERIENCE
+Senior Project Manager, Ledgerly — 2019-2024
+- Delivered a payments migration for 2M accounts on schedule
+Education Program Manager, Code For Kids — 2016-2019
+- Ran after-school coding courses for 300 students
+- Recruited and trained 25 volunteer instructors
+
+EDUCATION
+B.A. Economics, UC Davis, 2015
+
+Skills & Tools:
+Jira, Confluence, SQL, Agile, Risk management
+"""
+
+MARKDOWN = """\
+# Sam Chen
+Data Engineer | sam@example.com | (206) 555-0199
+
+## About Me
+Data engineer who likes boring, reliable pipelines.
+
+## Work Experience
+**Data Engineer**, Streamline — 2021-Present
+- Cut nightly batch runtime from 6h to 40m
+Project Lead, Open Data Day
+- Organized a city data hackathon
+
+**Projects**
+- dbt-lint: a linter for dbt models
+
+## Technical Skills
+Python, Spark, Airflow
+"""
+
+
+def test_title_and_contact_lines_stay_in_the_header():
+    profile = parse_resume_lines(PROJECT_MANAGER.splitlines())
+    assert profile.name == "Maria Lopez"
+    assert profile.title == "Project Manager"
+    assert "555-0142" in profile.phone
+    assert profile.linkedin_url.endswith("linkedin.com/in/marialopez")
+    assert "555-0142" not in profile.experience
+
+
+def test_roles_named_after_sections_stay_in_their_section():
+    profile = parse_resume_lines(PROJECT_MANAGER.splitlines())
+    assert "Education Program Manager, Code For Kids" in profile.experience
+    assert "Recruited and trained 25 volunteer instructors" in profile.experience
+    assert profile.education == "B.A. Economics, UC Davis, 2015"
+    assert profile.summary.startswith("Project manager with eight years")
+    assert profile.skills.startswith("Jira, Confluence")
+
+
+def test_markdown_headings(tmp_path):
+    path = tmp_path / "resume.md"
+    path.write_text(MARKDOWN, encoding="utf-8")
+    profile = import_resume_file(path)
+    assert profile.title == "Data Engineer"
+    assert profile.summary == "Data engineer who likes boring, reliable pipelines."
+    assert "Project Lead, Open Data Day" in profile.experience
+    assert "dbt-lint" in profile.experience
+    assert profile.skills == "Python, Spark, Airflow"
+
+
+def test_docx_paragraphs(tmp_path):
+    document = Document()
+    for line in PROJECT_MANAGER.splitlines():
+        document.add_paragraph(line)
+    path = tmp_path / "resume.docx"
+    document.save(path)
+    profile = import_resume_file(path)
+    assert profile.title == "Project Manager"
+    assert "Education Program Manager" in profile.experience
+    assert profile.education == "B.A. Economics, UC Davis, 2015"
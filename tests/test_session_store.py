@@ -0,0 +1,30 @@
+import pytest
+
+from helper.export_cache import shard_path
+from helper.document_helper import DocumentType
+from helper.file_io import safe_filename
+from helper.session_store import Session, SessionStore
+
+
+@pytest.mark.parametrize("session_id", ["../x", "..", "a/b", "a\\b", "/etc/passwd", "", "x" * 101])
+def test_ids_that_leave_the_spill_directory_are_rejected(tmp_path, session_id):
+    store = SessionStore(tmp_path / "sessions")
+    with pytest.raises(ValueError):
+        store.get(session_id)
+    with pytest.raises(ValueError):
+        store.put(Session(session_id))
+    assert not list(tmp_path.rglob("*.session"))
+
+
+def test_spilled_sessions_keep_their_ids(tmp_path):
+    store = SessionStore(tmp_path, max_hot=1)
+    store.get("alice-1").user_context["name"] = "Alice"
+    store.get("bob.2")
+    assert store.session_ids() == ["bob.2", "alice-1"]
+    assert store.peek("alice-1").user_context == {"name": "Alice"}
+
+
+def test_file_names_stay_inside_their_directory():
+    assert safe_filename("../../etc/x") == "etc_x"
+    assert safe_filename("..") == "documents"
+    assert ".." not in shard_path("k" * 40, DocumentType.RESUME, 1, session="..").parts
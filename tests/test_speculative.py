@@ -0,0 +1,53 @@
+from helper.speculative import SpeculativeDrafter, answer_fields, inputs_match
+
+
+def test_answers_fill_the_field_that_was_asked():
+    assert answer_fields("Great! What's your full name?", "My name is Jane Doe.") == {"name": "Jane Doe"}
+    assert answer_fields("What is your professional title?", "I'm a Senior Backend Engineer") == {
+        "title": "Senior Backend Engineer"
+    }
+    assert answer_fields("What's your phone number?", "555-123-4567") == {"phone": "555-123-4567"}
+    # Two fields asked at once, or none: only contact details are taken
+    assert answer_fields("What's your name and title?", "Jane, engineer") == {}
+    assert answer_fields("Nice to meet you.", "hello") == {}
+
+
+def test_reworded_tool_args_still_match_the_draft():
+    drafted = {"name": "Jane Doe", "summary": "Backend engineer building Python services", "portfolio": None}
+    assert inputs_match(drafted, {"name": "Jane Doe", "summary": "Backend engineer building Python services.", "portfolio": ""})
+    assert not inputs_match(drafted, {"name": "John Smith", "summary": drafted["summary"]})
+
+
+def test_claim_commits_a_matching_draft_and_discards_others():
+    drafter = SpeculativeDrafter()
+    try:
+        drafter.start("resume", {"name": "Jane Doe", "skills": "Python, Go"}, lambda: "draft")
+        assert drafter.claim("resume", {"name": "Jane Doe", "skills": "python go"}, timeout=5) == "draft"
+        drafter.start("cover_letter", {"name": "Jane Doe", "company": "Acme"}, lambda: "letter")
+        assert drafter.claim("cover_letter", {"name": "Jane Doe", "company": "Globex"}, timeout=5) is None
+    finally:
+        drafter.shutdown()
+
+
+def test_profile_with_a_new_job_restarts_the_draft():
+    first = {"name": "Jane Doe", "experience": "Acme | Backend Engineer | 2019 - 2023\n- Built payment APIs in Python"}
+    grown = dict(first, experience=first["experience"] + "\nGlobex | Staff Engineer | 2023 - Present\n- Led platform team")
+    assert not inputs_match(first, grown)
+    assert not inputs_match(grown, first)
+
+    drafter = SpeculativeDrafter()
+    try:
+        assert drafter.start("resume", first, lambda: "without Globex")
+        assert drafter.start("resume", grown, lambda: "with Globex")
+        assert drafter.claim("resume", grown, timeout=5) == "with Globex"
+    finally:
+        drafter.shutdown()
+
+
+def test_settled_fingerprints_are_capped_and_shutdown_stops_new_drafts():
+    drafter = SpeculativeDrafter(max_settled=4)
+    for i in range(10):
+        drafter.claim("resume", {"name": f"Candidate {i}"})
+    assert len(drafter._settled) == 4
+    drafter.shutdown()
+    assert not drafter.start("resume", {"name": "Jane Doe"}, lambda: "draft")
@@ -0,0 +1,33 @@
+from drafter_agentV2 import AgentConfig, DocumentGenerator
+from helper.document_helper import DocumentType
+from helper.structured_document import Entry, Section, StructuredDocument, from_text, structure_for, to_text
+
+RESUME = StructuredDocument(
+    header=["JANE DOE", "Backend Engineer | +1 555 123 4567"],
+    sections=[
+        Section(title="SUMMARY", paragraphs=["Backend engineer building Python services."]),
+        Section(title="EXPERIENCE", entries=[Entry(heading="Acme | Engineer | 2019 - 2024", bullets=["Built APIs"])]),
+        Section(title="SKILLS", paragraphs=["Python, PostgreSQL"]),
+    ],
+)
+
+
+def test_all_caps_name_stays_in_the_header():
+    assert from_text(to_text(RESUME), DocumentType.RESUME) == RESUME
+    assert structure_for(to_text(RESUME), DocumentType.RESUME) == RESUME
+
+
+def test_generated_structure_is_stored_as_returned(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    config = AgentConfig()
+    config.structured_output = True
+    generator = DocumentGenerator(config)
+    monkeypatch.setattr(generator, "_generate_structured", lambda *args: (to_text(RESUME), RESUME))
+
+    content = generator.generate_resume(
+        "Jane Doe", "Backend Engineer", "Backend engineer building Python services.", "Acme, Engineer, 2019 - 2024",
+        "", "Python, PostgreSQL", "", "+1 555 123 4567", ""
+    )
+    assert content == to_text(RESUME)
+    assert generator.structure(content, DocumentType.RESUME) is RESUME
+    assert generator.structure("plain text", DocumentType.RESUME) is None
@@ -0,0 +1,34 @@
+from drafter_agentV2 import AgentConfig, DocumentGenerator
+from helper.fact_check import check_facts
+
+BASE = """JANE DOE
+Backend Engineer | +1 555 123 4567 | jane@example.com
+
+SUMMARY
+Backend engineer with 6 years building Python services.
+
+SKILLS
+Python, PostgreSQL, Kubernetes
+
+EXPERIENCE
+Acme Corp | Senior Engineer | 2019 - 2024
+- Built payment APIs in Python
+
+EDUCATION
+B.S. Computer Science, State University, 2018
+M.S. Computer Science, State University, 2020
+"""
+
+JOB = "Senior Python engineer. Requirements: Python, PostgreSQL, Kubernetes. 5+ years of experience."
+
+
+def test_tailoring_an_unchanged_base_reports_no_issues(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    generator = DocumentGenerator(AgentConfig())
+    # The model hands back the base's own summary and skills
+    reply = "SUMMARY\nBackend engineer with 6 years building Python services.\n\nSKILLS\nPython, PostgreSQL, Kubernetes\n"
+    monkeypatch.setattr(generator, "_generate_checked", lambda *args: reply)
+
+    assert generator.tailor_resume(BASE, JOB) == BASE
+    assert generator.fact_stats["clean"] == 1
+    assert not check_facts(BASE, DocumentGenerator._base_sources(BASE), JOB).issues
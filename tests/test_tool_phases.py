@@ -0,0 +1,47 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from drafter_agentV2 import AgentConfig, create_tools
+from helper.document_helper import DocumentStore, DocumentType
+from helper.tool_phases import Phase, detect_phase, tools_for_phase
+
+
+@pytest.fixture
+def store():
+    store = DocumentStore()
+    store.create(DocumentType.RESUME, "JANE DOE\n\nSUMMARY\nBackend engineer")
+    return store
+
+
+@pytest.mark.parametrize("user_input", [
+    "save it",
+    "Export the resume as docx",
+    "Can you download both files?",
+    "please save the resume and cover letter",
+    "Great, save them to my desktop now.",
+])
+def test_export_commands_select_exporting(store, user_input):
+    assert detect_phase([HumanMessage(user_input)], store, user_input) is Phase.EXPORTING
+
+
+@pytest.mark.parametrize("user_input", [
+    "update the file with my new job",
+    "save my changes to the summary",
+    "add docx experience to my skills",
+    "what file format do you use?",
+    "write a cover letter for Acme and save it",
+])
+def test_edits_that_mention_files_keep_the_editing_tools(store, user_input):
+    phase = detect_phase([HumanMessage(user_input)], store, user_input)
+    assert phase is Phase.EDITING
+    names = {tool.name for tool in tools_for_phase(create_tools(store, None, AgentConfig()), phase)}
+    assert {"update_document", "create_cover_letter", "import_resume", "save_documents"} <= names
+
+
+def test_gathering_until_a_document_exists():
+    assert detect_phase([HumanMessage("save it")], DocumentStore(), "save it") is Phase.GATHERING
+
+
+def test_drafting_right_after_a_tool_result(store):
+    messages = [HumanMessage("make me a resume"), AIMessage(""), ToolMessage("✓ Resume created", tool_call_id="1")]
+    assert detect_phase(messages, store) is Phase.DRAFTING
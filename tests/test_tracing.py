@@ -0,0 +1,59 @@
+import json
+import pstats
+import threading
+import time
+
+from helper.tracing import NULL_TRACER, Tracer, profile_session
+
+
+def test_nested_spans_record_their_stack():
+    tracer = Tracer()
+    with tracer.span("agent", turn=1):
+        with tracer.span("llm.invoke"):
+            time.sleep(0.002)
+    spans = {span.name: span for span in tracer.spans}
+    assert spans["llm.invoke"].stack == ("agent", "llm.invoke")
+    assert spans["agent"].duration_ns >= spans["llm.invoke"].duration_ns > 0
+    assert spans["agent"].args == {"turn": 1}
+
+
+def test_threads_keep_separate_stacks():
+    tracer = Tracer()
+    worker = threading.Thread(target=tracer.wrap("speculative", lambda: None))
+    with tracer.span("agent"):
+        worker.start()
+        worker.join()
+    assert {span.name: span.stack for span in tracer.spans} == {"speculative": ("speculative",), "agent": ("agent",)}
+
+
+def test_exports_and_summary(tmp_path):
+    tracer = Tracer()
+    traced = tracer.traced("tool:save")(lambda: time.sleep(0.002))
+    with tracer.span("tools"):
+        traced()
+        traced()
+    assert tracer.summary()["tool:save"]["count"] == 2
+
+    tracer.export(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert {event["name"] for event in events} == {"tools", "tool:save"} and all(e["ph"] == "X" for e in events)
+
+    tracer.export(tmp_path / "trace.folded")
+    lines = (tmp_path / "trace.folded").read_text().splitlines()
+    assert any(line.startswith("tools;tool:save ") for line in lines)
+
+
+def test_disabled_tracer_records_nothing():
+    fn = lambda: 1
+    assert NULL_TRACER.wrap("x", fn) is fn
+    with NULL_TRACER.span("x"):
+        pass
+    assert NULL_TRACER.spans == []
+
+
+def test_profile_session_writes_stats(tmp_path):
+    with profile_session(tmp_path / "session.prof"):
+        sum(range(1000))
+    assert pstats.Stats(str(tmp_path / "session.prof")).total_calls > 0
+    with profile_session(None):
+        pass
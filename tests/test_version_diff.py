@@ -0,0 +1,73 @@
+import io
+
+from docx import Document
+
+from helper.document_helper import DocumentStore, DocumentType
+from helper.version_diff import (
+    DELETE, EQUAL, INSERT, DiffCache, compare, previous_version, render_redline_docx, summarize, word_segments
+)
+
+OLD = "JANE DOE\nEngineer\n\nSUMMARY\nBuilds reliable services.\n\nSKILLS\nPython, Docker\n"
+NEW = "JANE DOE\nEngineer\n\nSUMMARY\nBuilds fast, reliable services.\n\nEXPERIENCE\nAcme | Engineer\n- Cut latency in half\n\nSKILLS\nPython, Docker\n"
+
+
+def _versions():
+    store = DocumentStore()
+    store.create(DocumentType.RESUME, OLD)
+    store.create(DocumentType.RESUME, NEW)
+    return store, store.get_versions(DocumentType.RESUME)
+
+
+def test_word_segments_merge_adjacent_words():
+    assert word_segments("built the API", "designed and built the API") == [
+        (INSERT, "designed and"), (EQUAL, "built the API")
+    ]
+    assert word_segments("led a team", "managed a team") == [(DELETE, "led"), (INSERT, "managed"), (EQUAL, "a team")]
+
+
+def test_changes_are_reported_per_section():
+    _, (old, new) = _versions()
+    diff = compare(old, new, DocumentType.RESUME)
+    assert [(change.section, change.status) for change in diff.sections] == [("SUMMARY", "changed"), ("EXPERIENCE", "added")]
+    assert diff.sections[0].added == ["fast,"]
+    assert "Cut latency in half" in diff.sections[1].added
+    assert (diff.words_added, diff.words_removed) == (9, 0)
+    assert summarize(diff).startswith("Resume v1 → v2: +9 / -0 words in 2 section(s)")
+
+
+def test_identical_versions_have_no_changes():
+    _, (old, _) = _versions()
+    assert summarize(compare(old, old, DocumentType.RESUME)) == "Resume v1 → v1: no changes"
+
+
+def test_cover_letters_are_compared_as_one_body():
+    store = DocumentStore()
+    store.create(DocumentType.COVER_LETTER, "Dear team,\n\nI build APIs.\n")
+    store.create(DocumentType.COVER_LETTER, "Dear team,\n\nI build fast APIs.\n")
+    old, new = store.get_versions(DocumentType.COVER_LETTER)
+    assert "• Letter (changed, +1/-0)" in summarize(compare(old, new, DocumentType.COVER_LETTER))
+
+
+def test_cache_returns_the_same_diff_until_content_changes():
+    _, (old, new) = _versions()
+    cache = DiffCache(max_entries=1)
+    first = cache.compare(old, new, DocumentType.RESUME)
+    assert cache.compare(old, new, DocumentType.RESUME) is first
+    cache.compare(new, old, DocumentType.RESUME)
+    assert cache.compare(old, new, DocumentType.RESUME) is not first
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_redline_marks_insertions():
+    _, (old, new) = _versions()
+    document = Document(io.BytesIO(render_redline_docx(compare(old, new, DocumentType.RESUME))))
+    inserted = [run.text.strip() for paragraph in document.paragraphs for run in paragraph.runs if run.font.underline]
+    assert "fast," in inserted and "- Cut latency in half" in inserted
+    assert not any(run.font.strike for paragraph in document.paragraphs for run in paragraph.runs)
+
+
+def test_previous_version_follows_the_stored_order():
+    _, (old, new) = _versions()
+    assert previous_version([old, new], new) is old
+    assert previous_version([old, new], old) is None
+    assert previous_version([new], new) is None
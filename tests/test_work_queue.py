@@ -0,0 +1,42 @@
+import time
+
+from helper.work_queue import JobStatus, WorkQueue, run_worker
+
+
+def test_job_whose_lease_keeps_expiring_is_failed(tmp_path):
+    queue = WorkQueue(tmp_path / "jobs.db", visibility_timeout=0.01, max_attempts=2)
+    job, _ = queue.enqueue({"n": 1})
+    for _ in range(2):  # Worker crashes without nack
+        assert queue.claim() is not None
+        time.sleep(0.02)
+    assert queue.claim() is None
+    assert queue.get(job.idempotency_key).status is JobStatus.FAILED
+
+
+def test_heartbeat_keeps_a_slow_job_leased(tmp_path):
+    queue = WorkQueue(tmp_path / "jobs.db", visibility_timeout=0.2)
+    queue.enqueue({"n": 1})
+    other = WorkQueue(tmp_path / "jobs.db", visibility_timeout=0.2)
+    stolen = []
+
+    def slow(payload):
+        time.sleep(0.5)
+        stolen.append(other.claim())
+        return {"ok": True}
+
+    summary = run_worker(queue, slow, stop_when_empty=True)
+    assert stolen == [None]
+    assert (summary["processed"], summary["lost"]) == (1, 0)
+
+
+def test_lost_lease_is_not_counted_as_processed(tmp_path):
+    queue = WorkQueue(tmp_path / "jobs.db", visibility_timeout=0.2)
+    queue.enqueue({"n": 1})
+    other = WorkQueue(tmp_path / "jobs.db")
+
+    def hijacked(payload):
+        other._conn.execute("UPDATE jobs SET lease = 'other'")
+        return {"ok": True}
+
+    summary = run_worker(queue, hijacked, max_jobs=1)
+    assert (summary["processed"], summary["lost"]) == (0, 1)